@@ -152,6 +152,31 @@ CREATE TABLE exam_seats (
   CONSTRAINT chk_seat_pos CHECK (seat_row > 0 AND seat_col > 0)
 ) ENGINE=InnoDB;
 
+/* ——— Kalıcı Oturma Planı (migrations/002) ——— */
+CREATE TABLE seat_assignments (
+  id           INT AUTO_INCREMENT PRIMARY KEY,
+  exam_id      INT NOT NULL,
+  student_id   INT NOT NULL,
+  classroom_id INT NOT NULL,
+  row_no       SMALLINT UNSIGNED NOT NULL,
+  col_no       SMALLINT UNSIGNED NOT NULL,
+  seat_no      SMALLINT UNSIGNED NOT NULL,
+  UNIQUE KEY uq_sa_exam_student (exam_id, student_id),
+  UNIQUE KEY uq_sa_seat (exam_id, classroom_id, row_no, col_no, seat_no),
+  KEY idx_sa_classroom (classroom_id),
+  KEY idx_sa_student (student_id),
+  CONSTRAINT fk_sa_exam    FOREIGN KEY (exam_id)      REFERENCES exams(id)      ON DELETE CASCADE,
+  CONSTRAINT fk_sa_student FOREIGN KEY (student_id)   REFERENCES students(id)   ON DELETE CASCADE,
+  CONSTRAINT fk_sa_room    FOREIGN KEY (classroom_id) REFERENCES classrooms(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE seating_hashes (
+  exam_id      INT PRIMARY KEY,
+  content_hash CHAR(64) NOT NULL,
+  generated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT fk_sh_exam FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
 /* ——— Süre İstisnaları ——— */
 CREATE TABLE exam_exceptions (
   id           INT AUTO_INCREMENT PRIMARY KEY,
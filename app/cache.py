@@ -0,0 +1,106 @@
+# app/cache.py
+"""
+Süreç içi referans verisi önbelleği (bölümler, derslikler, ders listeleri).
+
+Anahtar (varlık, department_id) ikilisidir; department_id = None "tüm bölümler"
+anlamına gelir. Kayıtlar TTL süresi dolunca yeniden yüklenir, kapasite aşılınca en
+uzun süredir kullanılmayan (LRU) kayıt atılır. Yazma yapan servisler ilgili varlığı
+`invalidate()` ile boşaltır; böylece sayfa geçişleri veritabanına gitmez.
+
+    rows = reference_cache.get_or_load("classrooms", dept_id, lambda: _query(dept_id))
+    reference_cache.invalidate("classrooms")
+"""
+import threading
+import time
+from collections import OrderedDict
+from app.config import settings
+
+_ALL = object()  # invalidate(): "bütün bölümler" işareti
+
+
+class ReferenceCache:
+    def __init__(self, max_entries: int = 256, ttl_sec: float = 300):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._entries = OrderedDict()  # (varlık, bölüm) → (yüklenme zamanı, değer)
+        # invalidate() sayaçları: yükleme sürerken boşaltılan anahtarın eski sonucu saklanmaz
+        self._global_gen = 0
+        self._entity_gen = {}           # varlık → sayaç
+        self._key_gen = {}              # (varlık, bölüm) → sayaç
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "invalidated": 0}
+
+    # --------------------------------------------------------
+    def get_or_load(self, entity: str, department_id, loader):
+        """Önbellekteki değeri döner; yoksa / süresi dolmuşsa `loader()` ile yükler."""
+        key = (entity, department_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                loaded_at, value = entry
+                if now - loaded_at <= self.ttl_sec:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return _copy(value)
+                del self._entries[key]
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            generation = self._generation(key)
+
+        # Sorgu kilit dışında çalışır; aynı anda iki yükleme olursa sonuncusu kalır
+        value = loader()
+        with self._lock:
+            if self._generation(key) != generation:
+                # Yükleme sürerken invalidate() çağrıldı: sonuç eski olabilir, saklanmaz
+                return _copy(value)
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evicted"] += 1
+        return _copy(value)
+
+    # --------------------------------------------------------
+    def invalidate(self, entity: str = None, department_id=_ALL):
+        """
+        entity verilmezse tüm önbellek, yalnız entity verilirse o varlığın bütün bölümleri,
+        ikisi de verilirse o bölüm ile "tüm bölümler" (None) kaydı silinir.
+        """
+        with self._lock:
+            if entity is None:
+                self._global_gen += 1
+                keys = list(self._entries)
+            elif department_id is _ALL:
+                self._entity_gen[entity] = self._entity_gen.get(entity, 0) + 1
+                keys = [k for k in self._entries if k[0] == entity]
+            else:
+                targets = ((entity, department_id), (entity, None))
+                for k in targets:
+                    self._key_gen[k] = self._key_gen.get(k, 0) + 1
+                keys = [k for k in targets if k in self._entries]
+            for k in keys:
+                del self._entries[k]
+            self._stats["invalidated"] += len(keys)
+
+    def _generation(self, key) -> tuple:
+        # Kilit altında çağrılır
+        return self._global_gen, self._entity_gen.get(key[0], 0), self._key_gen.get(key, 0)
+
+    # --------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+def _copy(value):
+    # Liste ve satır sözlükleri kopyalanır: çağıran sıralama yapsa / satırı değiştirse de önbellek bozulmaz
+    if isinstance(value, list):
+        return [dict(r) if isinstance(r, dict) else r for r in value]
+    return value
+
+
+reference_cache = ReferenceCache(settings.ref_cache_max_entries, settings.ref_cache_ttl_sec)
@@ -12,5 +12,9 @@ class Settings:
     db_pass: str = os.getenv("DB_PASS", "")
     db_name: str = os.getenv("DB_NAME", "exam_scheduler")
     db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_batch_size: int = int(os.getenv("DB_BATCH_SIZE", "1000"))
+    ref_cache_ttl_sec: float = float(os.getenv("REF_CACHE_TTL_SEC", "300"))
+    ref_cache_max_entries: int = int(os.getenv("REF_CACHE_MAX_ENTRIES", "256"))
+    seating_workers: int = int(os.getenv("SEATING_WORKERS", "0"))  # 0 → CPU sayısı
 
 settings = Settings()
@@ -3,8 +3,12 @@ from dotenv import load_dotenv
 load_dotenv()
 from contextlib import contextmanager
 from typing import Tuple, Any, Iterable, List, Dict, Optional
+import queue
+import threading
+import time
 import mysql.connector
 import os
+from app.config import settings
 
 DB_HOST = os.getenv("DB_HOST", "127.0.0.1")
 DB_PORT = int(os.getenv("DB_PORT", "3306"))
@@ -12,28 +16,201 @@ DB_USER = os.getenv("DB_USER", "root")
 DB_PASS = os.getenv("DB_PASS", "")
 DB_NAME = os.getenv("DB_NAME", "exam_scheduler")
 
+# Bu süreden uzun boşta kalan bağlantı, havuzdan çıkarken ping ile doğrulanır.
+POOL_STALE_AFTER_SEC = int(os.getenv("DB_POOL_STALE_SEC", "60"))
+POOL_CHECKOUT_TIMEOUT_SEC = float(os.getenv("DB_POOL_TIMEOUT_SEC", "30"))
+# Sunucu erişilemezse bağlantı denemesi bu kadar saniyede vazgeçer (sürücü varsayılanı çok uzun)
+DB_CONNECT_TIMEOUT_SEC = int(os.getenv("DB_CONNECT_TIMEOUT_SEC", "5"))
+
+
 def _connect():
-    return mysql.connector.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        user=DB_USER,
-        password=DB_PASS,
-        database=DB_NAME,
-        charset="utf8mb4",
-        autocommit=False,
-    )
+    try:
+        return mysql.connector.connect(
+            host=DB_HOST,
+            port=DB_PORT,
+            user=DB_USER,
+            password=DB_PASS,
+            database=DB_NAME,
+            charset="utf8mb4",
+            autocommit=False,
+            connection_timeout=DB_CONNECT_TIMEOUT_SEC,
+        )
+    except mysql.connector.Error as e:
+        raise RuntimeError(f"Veritabanına bağlanılamadı: {e}")
+
+
+# --------------------------------------------------------
+# BAĞLANTI HAVUZU
+# --------------------------------------------------------
+class ConnectionPool:
+    """
+    Süreç genelinde paylaşılan MySQL bağlantı havuzu.
+    En fazla `size` bağlantı açılır; boşta olanlar kuyrukta bekletilir,
+    uzun süre boşta kalanlar geri verilmeden önce ping ile kontrol edilir.
+    """
+
+    def __init__(self, size: int, connect=_connect):
+        self.size = max(1, int(size))
+        self._connect = connect
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self.stats = {
+            "created": 0,
+            "checkouts": 0,
+            "returns": 0,
+            "waits": 0,
+            "reconnects": 0,
+            "discarded": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+        }
+
+    # -------------------- checkout / return --------------------
+    def acquire(self, timeout: float | None = POOL_CHECKOUT_TIMEOUT_SEC):
+        conn, idle_since = self._take_idle_or_open(timeout)
+        if idle_since is not None and time.monotonic() - idle_since > POOL_STALE_AFTER_SEC:
+            conn = self._ensure_alive(conn)
+        with self._lock:
+            self.stats["checkouts"] += 1
+            self.stats["in_use"] += 1
+            self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self.stats["in_use"])
+        return conn
+
+    def release(self, conn) -> None:
+        with self._lock:
+            self.stats["returns"] += 1
+            self.stats["in_use"] -= 1
+        try:
+            if conn.unread_result:
+                conn.consume_results()
+            # Yarım kalan işlem bir sonraki kullanıcıya taşınmasın
+            conn.rollback()
+        except mysql.connector.Error:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    # -------------------- iç yardımcılar --------------------
+    def _take_idle_or_open(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+            with self._lock:
+                self.stats["created"] += 1
+            return conn, None
+
+        with self._lock:
+            self.stats["waits"] += 1
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError(
+                f"Veritabanı bağlantı havuzu dolu ({self.size} bağlantı kullanımda)."
+            )
+
+    def _ensure_alive(self, conn):
+        """Bayatlamış bağlantıyı ping ile doğrular, gerekirse yeniden bağlanır."""
+        try:
+            conn.ping(reconnect=False)
+            return conn
+        except mysql.connector.Error:
+            pass
+        with self._lock:
+            self.stats["reconnects"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self._opened -= 1
+            self.stats["discarded"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def usage(self) -> Dict[str, int]:
+        with self._lock:
+            snap = dict(self.stats)
+            snap["opened"] = self._opened
+            snap["idle"] = self._idle.qsize()
+            snap["size"] = self.size
+        return snap
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Süreç başına tek havuz; fork sonrası alt süreç kendi havuzunu açar."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = ConnectionPool(settings.db_pool_size)
+                _pool_pid = pid
+    return _pool
+
+
+def pool_stats() -> Dict[str, int]:
+    return get_pool().usage()
+
 
 @contextmanager
-def tx():
-    conn = _connect()
+def get_conn(autocommit: bool = False):
+    """Havuzdan bağlantı ödünç alır, blok bitince havuza iade eder."""
+    pool = get_pool()
+    conn = pool.acquire()
     try:
+        if conn.autocommit != autocommit:
+            conn.autocommit = autocommit
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
     finally:
-        conn.close()
+        pool.release(conn)
+
+
+@contextmanager
+def tx():
+    with get_conn() as conn:
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
 def fetchone(sql: str, params: Tuple[Any, ...] = ()) -> Optional[Dict]:
     with tx() as conn:
@@ -58,3 +235,9 @@ def executemany(sql: str, param_list: Iterable[Tuple[Any, ...]]) -> int:
         with conn.cursor() as cur:
             cur.executemany(sql, list(param_list))
             return cur.rowcount
+
+def iter_chunks(items: List[Any], size: Optional[int] = None) -> Iterable[List[Any]]:
+    """Toplu INSERT / IN (...) sorguları için listeyi sabit boyutlu parçalara böler."""
+    size = size or settings.db_batch_size
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt5 import QtWidgets
 from app.ui.main_window import MainWindow
 
@@ -11,4 +12,5 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # paketlenmiş sürümde oturma planı süreç havuzu için
     main()
@@ -1,5 +1,11 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from app.db import fetchall
+from app.cache import reference_cache
 
 def list_all() -> List[Dict]:
-    return fetchall("SELECT id, name FROM departments ORDER BY name")
+    return reference_cache.get_or_load(
+        "departments", None, lambda: fetchall("SELECT id, name FROM departments ORDER BY name")
+    )
+
+def get_name(dept_id: int) -> Optional[str]:
+    return next((d["name"] for d in list_all() if d["id"] == dept_id), None)
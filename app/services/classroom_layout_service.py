@@ -1,15 +1,11 @@
 # app/services/classroom_layout_service.py
 from typing import List, Dict
-import os, mysql.connector
+from app.db import get_conn
+from app.cache import reference_cache
+from app.services.seat_template import invalidate_template
 
 def _get_conn():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST","localhost"),
-        user=os.getenv("DB_USER","root"),
-        password=os.getenv("DB_PASS",""),
-        database=os.getenv("DB_NAME","exam_scheduler"),
-        autocommit=True,
-    )
+    return get_conn(autocommit=True)
 
 class ClassroomLayoutService:
     @staticmethod
@@ -43,3 +39,5 @@ class ClassroomLayoutService:
                 [(classroom_id, i+1, sg) for i, sg in enumerate(seat_groups)]
             )
             # capacity trigger ile otomatik güncellendi
+        reference_cache.invalidate("classrooms")
+        invalidate_template(classroom_id)
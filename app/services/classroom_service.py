@@ -1,24 +1,15 @@
 from typing import Optional, List, Dict
-import os
 import mysql.connector
-from app.db import fetchall, execute
+from app.db import fetchall, execute, get_conn
+from app.cache import reference_cache
+from app.services.seat_template import invalidate_template
 
 
 # --------------------------------------------------------
-# VERİTABANI BAĞLANTISI
+# VERİTABANI BAĞLANTISI (ortak havuzdan)
 # --------------------------------------------------------
 def _get_conn():
-    try:
-        return mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "root"),
-            password=os.getenv("DB_PASS", ""),
-            database=os.getenv("DB_NAME", "exam_scheduler"),
-            autocommit=True,
-            connection_timeout=5,
-        )
-    except mysql.connector.Error as e:
-        raise RuntimeError(f"Veritabanına bağlanılamadı: {e}")
+    return get_conn(autocommit=True)
 
 
 # --------------------------------------------------------
@@ -56,6 +47,12 @@ class ClassroomService:
     # --------------------------------------------------------
     @staticmethod
     def list_by_department(department_id: int) -> List[Dict]:
+        return reference_cache.get_or_load(
+            "classrooms", department_id, lambda: ClassroomService._query_by_department(department_id)
+        )
+
+    @staticmethod
+    def _query_by_department(department_id: int) -> List[Dict]:
         sql = """
             SELECT
                 c.id,
@@ -193,9 +190,11 @@ class ClassroomService:
                 cur = c.cursor()
                 cur.execute(sql, (department_id, code.strip(), name.strip(),
                                  seat_group, rows, cols, capacity))
-                return cur.lastrowid
+                new_id = cur.lastrowid
         except mysql.connector.Error as e:
             raise RuntimeError(f"Derslik eklenemedi: {e}")
+        reference_cache.invalidate("classrooms", department_id)
+        return new_id
 
     # --------------------------------------------------------
     # DERSLİK GÜNCELLEME (ID bazlı)
@@ -220,6 +219,8 @@ class ClassroomService:
                 cur.execute(sql, (name.strip(), seat_group, rows, cols, capacity, classroom_id))
         except mysql.connector.Error as e:
             raise RuntimeError(f"Derslik güncellenemedi: {e}")
+        reference_cache.invalidate("classrooms")
+        invalidate_template(classroom_id)
 
     # --------------------------------------------------------
     # DERSLİK SİLME
@@ -233,15 +234,17 @@ class ClassroomService:
                 cur.execute(sql, (classroom_id,))
         except mysql.connector.Error as e:
             raise RuntimeError(f"Derslik silinemedi: {e}")
+        reference_cache.invalidate("classrooms")
+        invalidate_template(classroom_id)
 
     # --------------------------------------------------------
     # TÜM BÖLÜMLERİN DERSLİKLERİNİ LİSTELE (Admin için)
     # --------------------------------------------------------
     def list_all(self):
-        return fetchall("""
+        return reference_cache.get_or_load("classrooms", None, lambda: fetchall("""
         SELECT c.id, c.code, c.name, c.num_rows, c.num_cols, 
                c.seat_group, c.capacity, d.name AS department_name
         FROM classrooms c
         LEFT JOIN departments d ON c.department_id = d.id
         ORDER BY d.name, c.code
-    """)
+    """))
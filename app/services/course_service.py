@@ -1,28 +1,50 @@
-import mysql.connector
-import os
+from dataclasses import dataclass, field
+from app.db import fetchall, tx, iter_chunks
+from app.cache import reference_cache
+
+
+@dataclass
+class CourseImportResult:
+    """Toplu ders yüklemesinin özeti."""
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    rejections: list = field(default_factory=list)  # (tablo satır no, ders kodu, sebep)
+
+    @property
+    def processed(self) -> int:
+        return self.inserted + self.updated
 
 
 class CourseService:
+    # courses tablosundaki sütun sınırları (VARCHAR)
+    MAX_CODE_LEN = 32
+    MAX_NAME_LEN = 200
+
+    # -------------------------------------------------------------------
+    # Bölümün ders listesi (kod, ad) — önbellekli
+    # -------------------------------------------------------------------
     @staticmethod
-    def _get_conn():
-        """MySQL bağlantısı oluşturur"""
-        return mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "root"),
-            password=os.getenv("DB_PASS", ""),
-            database=os.getenv("DB_NAME", "exam_scheduler"),
-            autocommit=True
-        )
+    def list_by_department(department_id: int):
+        return reference_cache.get_or_load("courses", department_id, lambda: fetchall("""
+            SELECT code, name FROM courses
+            WHERE department_id = %s
+            ORDER BY code
+        """, (department_id,)))
 
     # -------------------------------------------------------------------
     # Excel'den gelen ders listesini toplu ekleme / güncelleme
     # -------------------------------------------------------------------
     @staticmethod
-    def bulk_insert_from_excel(department_id: int, df):
+    def bulk_insert_from_excel(department_id: int, df, chunk_size: int = None) -> CourseImportResult:
         """
         Excel'den alınan ders verilerini `courses` tablosuna kaydeder veya günceller.
+        Parametreler DataFrame sütunlarından tek geçişte üretilir ve tek işlem içinde
+        `chunk_size`'lık parçalar halinde executemany ile yazılır.
         """
-        added = 0
+        import pandas as pd  # ağır bağımlılık: yalnızca yükleme sırasında
+
+        result = CourseImportResult()
 
         # ✅ department_id’yi her durumda integer’a çevir
         try:
@@ -31,38 +53,85 @@ class CourseService:
             print("[UYARI] Department ID geçersiz, varsayılan 0 kullanılıyor.")
             department_id = 0
 
-        with CourseService._get_conn() as conn:
+        def col(*names, default=""):
+            for n in names:
+                if n in df.columns:
+                    s = df[n].fillna("").astype(str).str.strip()
+                    return s.mask(s == "", default)
+            return pd.Series(default, index=df.index)
+
+        frame = pd.DataFrame({
+            "code": col("DERS KODU"),
+            "name": col("DERSİN ADI", "DERSIN ADI"),
+            "instructor": col("DERSİ VEREN ÖĞR. ELEMANI", "DERSI VEREN OGR. ELEMANI"),
+            "class_name": col("SINIF", default="Belirtilmemiş"),
+            "course_type": col("DERS TÜRÜ", default="Zorunlu"),
+        })
+        frame["row_no"] = range(1, len(frame) + 1)
+
+        # ❌ Satır bazlı red sebepleri (ilk uyan sebep geçerli)
+        reasons = pd.Series("", index=frame.index)
+        checks = [
+            (frame["code"] == "", "ders kodu boş"),
+            (frame["name"] == "", "ders adı boş"),
+            (frame["code"].str.len() > CourseService.MAX_CODE_LEN,
+             f"ders kodu {CourseService.MAX_CODE_LEN} karakterden uzun"),
+            (frame["name"].str.len() > CourseService.MAX_NAME_LEN,
+             f"ders adı {CourseService.MAX_NAME_LEN} karakterden uzun"),
+            (frame["code"].duplicated(keep="last") & (frame["code"] != ""),
+             "aynı ders kodu sonraki bir satırda tekrar ediyor"),
+        ]
+        for mask, reason in checks:
+            reasons = reasons.mask(mask & (reasons == ""), reason)
+
+        rejected = reasons != ""
+        result.rejections = list(zip(
+            frame.loc[rejected, "row_no"], frame.loc[rejected, "code"], reasons[rejected]
+        ))
+        result.rejected = len(result.rejections)
+        frame = frame[~rejected]
+
+        rows = list(zip(
+            [department_id] * len(frame),
+            frame["code"], frame["name"], frame["instructor"], frame["class_name"], frame["course_type"],
+        ))
+        codes = frame["code"].tolist()
+
+        with tx() as conn:
             cur = conn.cursor()
-            for _, row in df.iterrows():
-                try:
-                    code = str(row.get("DERS KODU", "")).strip()
-                    name = str(row.get("DERSİN ADI", row.get("DERSIN ADI", ""))).strip()
-                    instructor = str(
-                        row.get("DERSİ VEREN ÖĞR. ELEMANI", row.get("DERSI VEREN OGR. ELEMANI", ""))
-                    ).strip()
-                    class_name = str(row.get("SINIF", "Belirtilmemiş")).strip()
-                    course_type = str(row.get("DERS TÜRÜ", "Zorunlu")).strip()
-
-                    if not code or not name:
-                        continue
-
-                    # ✅ Kursu ekle veya güncelle
-                    cur.execute("""
-                        INSERT INTO courses 
-                            (department_id, code, name, instructor_name, class_name, course_type)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON DUPLICATE KEY UPDATE 
-                            name = VALUES(name),
-                            instructor_name = VALUES(instructor_name),
-                            class_name = VALUES(class_name),
-                            course_type = VALUES(course_type),
-                            department_id = VALUES(department_id)
-                    """, (department_id, code, name, instructor, class_name, course_type))
-                    added += 1
-
-                except Exception as e:
-                    print(f"[HATA] Ders satırı işlenemedi ({row.to_dict()}): {e}")
-                    continue
-
-        print(f"[✅] {added} ders başarıyla işlendi (department_id={department_id})")
-        return added
+
+            # Eklenen / güncellenen ayrımı için bölümde zaten olan kodlar
+            existing = set()
+            for chunk in iter_chunks(codes, chunk_size):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cur.execute(
+                    f"SELECT code FROM courses WHERE department_id = %s AND code IN ({placeholders})",
+                    (department_id, *chunk),
+                )
+                existing.update(code for (code,) in cur.fetchall())
+
+            # ✅ Dersleri ekle veya güncelle
+            for chunk in iter_chunks(rows, chunk_size):
+                cur.executemany("""
+                    INSERT INTO courses
+                        (department_id, code, name, instructor_name, class_name, course_type)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                        name = VALUES(name),
+                        instructor_name = VALUES(instructor_name),
+                        class_name = VALUES(class_name),
+                        course_type = VALUES(course_type),
+                        department_id = VALUES(department_id)
+                """, chunk)
+
+        reference_cache.invalidate("courses", department_id)
+        reference_cache.invalidate("summary_courses", department_id)  # ders adları özet listede de görünür
+        result.updated = sum(1 for c in codes if c in existing)
+        result.inserted = len(codes) - result.updated
+
+        for row_no, code, reason in result.rejections:
+            print(f"[HATA] {row_no}. satır reddedildi ({code or '-'}): {reason}")
+        print(f"[✅] {result.processed} ders başarıyla işlendi "
+              f"({result.inserted} yeni, {result.updated} güncellendi, {result.rejected} reddedildi, "
+              f"department_id={department_id})")
+        return result
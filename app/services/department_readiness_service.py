@@ -0,0 +1,84 @@
+# app/services/department_readiness_service.py
+"""
+Dashboard'un "bölüm hazır mı?" kontrolleri için tek sorguluk özet.
+
+Derslik, ders, özet tablo satırı ve sınav sayıları tek bir SELECT ile okunur ve bölüm
+başına önbelleğe alınır. Önbellek yalnızca veri değiştiren sayfaların sinyalleriyle
+(derslik / ders / öğrenci yükleme) `invalidate()` çağrılarak boşaltılır.
+"""
+import threading
+from dataclasses import dataclass
+from app.db import fetchone
+
+MIN_CLASSROOMS = 5
+
+# department_id = NULL → tüm bölümler (admin görünümü)
+_READINESS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM classrooms
+          WHERE %(dept)s IS NULL OR department_id = %(dept)s)            AS classrooms,
+        (SELECT COUNT(*) FROM courses
+          WHERE %(dept)s IS NULL OR department_id = %(dept)s)            AS courses,
+        (SELECT COUNT(*) FROM student_course_summary
+          WHERE %(dept)s IS NULL OR department_id = %(dept)s)            AS summary_rows,
+        (SELECT COUNT(*) FROM exams e JOIN courses c ON c.id = e.course_id
+          WHERE %(dept)s IS NULL OR c.department_id = %(dept)s)          AS exams
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class DepartmentReadiness:
+    classrooms: int = 0
+    courses: int = 0
+    summary_rows: int = 0
+    exams: int = 0
+
+    @property
+    def enough_classrooms(self) -> bool:
+        return self.classrooms >= MIN_CLASSROOMS
+
+    @property
+    def courses_loaded(self) -> bool:
+        return self.courses > 0
+
+    @property
+    def students_loaded(self) -> bool:
+        return self.summary_rows > 0
+
+
+class DepartmentReadinessService:
+    _cache = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def snapshot(department_id=None) -> DepartmentReadiness:
+        """Bölümün sayılarını döner; önbellekte yoksa tek sorguyla okur."""
+        key = int(department_id) if department_id is not None else None
+        with DepartmentReadinessService._lock:
+            cached = DepartmentReadinessService._cache.get(key)
+        if cached is not None:
+            return cached
+
+        row = fetchone(_READINESS_SQL, {"dept": key}) or {}
+        snap = DepartmentReadiness(
+            classrooms=int(row.get("classrooms") or 0),
+            courses=int(row.get("courses") or 0),
+            summary_rows=int(row.get("summary_rows") or 0),
+            exams=int(row.get("exams") or 0),
+        )
+        with DepartmentReadinessService._lock:
+            DepartmentReadinessService._cache[key] = snap
+        return snap
+
+    @staticmethod
+    def invalidate(department_id=None):
+        """
+        Önbelleği boşaltır. Bölüm verilmezse hepsi silinir (admin başka bölüm adına
+        yükleme yapmış olabilir); verilirse o bölüm ve tüm bölümler toplamı silinir.
+        """
+        with DepartmentReadinessService._lock:
+            if department_id is None:
+                DepartmentReadinessService._cache.clear()
+            else:
+                DepartmentReadinessService._cache.pop(int(department_id), None)
+                DepartmentReadinessService._cache.pop(None, None)
@@ -0,0 +1,262 @@
+# app/services/exam_plan_optimizer.py
+import math
+import random
+import time
+from dataclasses import dataclass, replace
+from app.services.room_allocator import RoomAllocator
+
+
+@dataclass
+class ObjectiveWeights:
+    """Yumuşak kısıt ağırlıkları (ceza puanı)."""
+    same_day: float = 10.0             # aynı gün sınav çifti başına (öğrenci bazlı)
+    back_to_back: float = 4.0          # arka arkaya sınav çifti başına
+    room_waste: float = 0.05           # boş kalan koltuk başına
+    back_to_back_window_min: int = 60  # bitiş → başlangıç arası bu süreden kısaysa "arka arkaya"
+
+
+class _Exam:
+    __slots__ = ("course_id", "needed", "day", "start", "end", "rooms", "source")
+
+    def __init__(self, course_id, needed, day, start, end, rooms, source):
+        self.course_id = course_id
+        self.needed = needed
+        self.day = day
+        self.start = start
+        self.end = end
+        self.rooms = rooms
+        self.source = source
+
+
+class ExamPlanOptimizer:
+    """
+    Oluşturulmuş sınav planını yerel arama (benzetimli tavlama) ile iyileştirir.
+
+    Sert kısıtlar korunur: öğrenci çakışması, derslik çakışması (+ bekleme süresi)
+    ve no_overlap. Hamle = bir sınavı başka bir (gün, slot)'a taşıyıp dersliklerini
+    yeniden seçmek. Hamlenin maliyet farkı sadece o sınavın öğrencileri üzerinden
+    (eski ve yeni gün) hesaplanır; tüm plan yeniden puanlanmaz.
+    """
+
+    def __init__(self, conflict_graph, rooms, workdays, slot_starts, gap_min: int,
+                 no_overlap: bool, weights: ObjectiveWeights | None = None, seed=None):
+        self.graph = conflict_graph
+        self.rooms = sorted(rooms, key=lambda r: r["capacity"], reverse=True)
+        self.workdays = workdays
+        self.slot_starts = list(slot_starts)
+        self.gap = gap_min
+        self.no_overlap = no_overlap
+        self.w = weights or ObjectiveWeights()
+        self.rng = random.Random(seed)
+        self.allocator = RoomAllocator()
+        self.stats = {}
+
+    # ============================================================
+    # 🔹 ANA METOD
+    # ============================================================
+    def optimize(self, placed_courses: list, time_budget_sec: float = 2.0,
+                 max_moves: int | None = None, deadline: float | None = None) -> list:
+        """
+        max_moves verilirse süre yerine hamle bütçesiyle çalışır: aynı tohum ve bütçe her
+        makinede aynı planı verir (sıcaklık da hamle sayısına göre düşer). `deadline`
+        (time.time() değeri) yalnız güvenlik sınırıdır; aşılırsa stats["truncated"] işaretlenir.
+        """
+        budget = max_moves if max_moves is not None else time_budget_sec
+        if len(placed_courses) < 2 or budget <= 0:
+            return placed_courses
+
+        self._load_state(placed_courses)
+        current = self.total_cost()
+        best = current
+        best_snapshot = self._snapshot()
+        initial = current
+
+        positions = [(d, s) for d in range(len(self.workdays)) for s in self.slot_starts]
+        t_start = 1.0 * self.w.same_day
+        t_end = 0.01
+        started = time.perf_counter()
+        stop_at = started + time_budget_sec  # yalnız süre bütçesi modunda
+        moves = accepted = 0
+        temp = t_start
+        truncated = False
+
+        while True:
+            if moves & 63 == 0:
+                if max_moves is not None:
+                    if deadline is not None and time.time() >= deadline:
+                        truncated = True
+                        break
+                    frac = moves / max_moves
+                else:
+                    now = time.perf_counter()
+                    if now >= stop_at:
+                        break
+                    frac = (now - started) / time_budget_sec
+                temp = t_start * (t_end / t_start) ** frac
+            if max_moves is not None and moves >= max_moves:
+                break
+            moves += 1
+
+            ex = self.rng.choice(self.exams)
+            day, start = self.rng.choice(positions)
+            delta = self._try_move(ex, day, start)
+            if delta is None:
+                continue
+            if delta <= 0 or self.rng.random() < math.exp(-delta / temp):
+                accepted += 1
+                current += delta
+                if current < best - 1e-9:
+                    best = current
+                    best_snapshot = self._snapshot()
+            else:
+                self._undo()
+
+        elapsed = time.perf_counter() - started
+        self._restore(best_snapshot)
+        self.stats = {
+            "initial_cost": round(initial, 3),
+            "best_cost": round(best, 3),
+            "moves": moves,
+            "accepted": accepted,
+            "moves_per_sec": int(moves / elapsed) if elapsed > 0 else moves,
+            "truncated": truncated,
+        }
+        print(f"🔧 Plan iyileştirme: maliyet {initial:.1f} → {best:.1f} "
+              f"({moves} hamle, {self.stats['moves_per_sec']} hamle/sn)")
+        return self._to_plan()
+
+    def score(self, placed_courses: list) -> float:
+        """Planın yumuşak kısıt maliyeti (iyileştirme yapmadan)."""
+        if not placed_courses:
+            return 0.0
+        self._load_state(placed_courses)
+        return self.total_cost()
+
+    # ============================================================
+    # 🧩 DURUM
+    # ============================================================
+    def _load_state(self, placed_courses):
+        self.exams = []
+        self.day_exams = [set() for _ in self.workdays]
+        self.room_busy = {}
+        self.student_days = {}
+
+        for p in placed_courses:
+            ex = _Exam(
+                course_id=p.course["id"],
+                needed=p.course["student_count"],
+                day=p.day,
+                start=p.start,
+                end=p.end,
+                rooms=tuple(p.rooms),
+                source=p,
+            )
+            self.exams.append(ex)
+            self._attach(ex)
+
+    def _students(self, ex):
+        return self.graph.students_by_course.get(ex.course_id, ())
+
+    def _attach(self, ex):
+        self.day_exams[ex.day].add(ex)
+        for r in ex.rooms:
+            self.room_busy.setdefault((ex.day, r["id"]), set()).add(ex)
+        for sid in self._students(ex):
+            self.student_days.setdefault(sid, {}).setdefault(ex.day, []).append(ex)
+
+    def _detach(self, ex):
+        self.day_exams[ex.day].discard(ex)
+        for r in ex.rooms:
+            self.room_busy[(ex.day, r["id"])].discard(ex)
+        for sid in self._students(ex):
+            self.student_days[sid][ex.day].remove(ex)
+
+    def _snapshot(self):
+        return [(ex.day, ex.start, ex.end, ex.rooms) for ex in self.exams]
+
+    def _restore(self, snapshot):
+        for ex, (day, start, end, rooms) in zip(self.exams, snapshot):
+            self._detach(ex)
+            ex.day, ex.start, ex.end, ex.rooms = day, start, end, rooms
+            self._attach(ex)
+
+    def _to_plan(self):
+        return [
+            replace(ex.source, day=ex.day, start=ex.start, end=ex.end, rooms=list(ex.rooms))
+            for ex in self.exams
+        ]
+
+    # ============================================================
+    # 💯 AMAÇ FONKSİYONU
+    # ============================================================
+    def _student_day_cost(self, exams_that_day) -> float:
+        n = len(exams_that_day)
+        if n < 2:
+            return 0.0
+        cost = self.w.same_day * n * (n - 1) / 2
+        ordered = sorted(exams_that_day, key=lambda e: e.start)
+        for a, b in zip(ordered, ordered[1:]):
+            if b.start - a.end < self.w.back_to_back_window_min:
+                cost += self.w.back_to_back
+        return cost
+
+    def _room_cost(self, rooms, needed) -> float:
+        return self.w.room_waste * max(0, sum(r["capacity"] for r in rooms) - needed)
+
+    def total_cost(self) -> float:
+        cost = sum(self._room_cost(ex.rooms, ex.needed) for ex in self.exams)
+        for days in self.student_days.values():
+            for exams_that_day in days.values():
+                cost += self._student_day_cost(exams_that_day)
+        return cost
+
+    def _affected_cost(self, ex, days) -> float:
+        cost = self._room_cost(ex.rooms, ex.needed)
+        for sid in self._students(ex):
+            per_day = self.student_days[sid]
+            for d in days:
+                cost += self._student_day_cost(per_day.get(d, ()))
+        return cost
+
+    # ============================================================
+    # 🔁 HAMLE
+    # ============================================================
+    def _try_move(self, ex, day, start):
+        """Hamle uygulanabilirse uygular ve maliyet farkını döner, değilse None."""
+        end = start + (ex.end - ex.start)
+
+        for other in self.day_exams[day]:
+            if other is ex or not (other.start < end and start < other.end):
+                continue
+            if self.no_overlap or other.course_id in self.graph.neighbors(ex.course_id):
+                return None
+
+        rooms = self._pick_rooms(ex, day, start, end)
+        if not rooms:
+            return None
+
+        days = {ex.day, day}
+        before = self._affected_cost(ex, days)
+        self._last = (ex, ex.day, ex.start, ex.end, ex.rooms)
+        self._detach(ex)
+        ex.day, ex.start, ex.end, ex.rooms = day, start, end, rooms
+        self._attach(ex)
+        return self._affected_cost(ex, days) - before
+
+    def _undo(self):
+        ex, day, start, end, rooms = self._last
+        self._detach(ex)
+        ex.day, ex.start, ex.end, ex.rooms = day, start, end, rooms
+        self._attach(ex)
+
+    def _room_free(self, ex, day, room_id, start, end) -> bool:
+        for other in self.room_busy.get((day, room_id), ()):
+            if other is ex:
+                continue
+            if not (end + self.gap <= other.start or start >= other.end + self.gap):
+                return False
+        return True
+
+    def _pick_rooms(self, ex, day, start, end):
+        free = [r for r in self.rooms if self._room_free(ex, day, r["id"], start, end)]
+        return tuple(self.allocator.allocate(free, ex.needed)) or None
@@ -1,9 +1,122 @@
 # app/services/exam_scheduler_service.py
+import os
 import random
 import datetime
-import openpyxl
-from openpyxl.styles import Alignment, Font, PatternFill
-from app.db import fetchall, execute
+import time
+import multiprocessing
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from app.db import fetchall, tx
+from app.services.exam_plan_optimizer import ExamPlanOptimizer
+from app.services.room_allocator import RoomAllocator
+
+
+DAY_START_MIN = 10 * 60   # 10:00
+DAY_END_MIN = 17 * 60     # 17:00
+
+
+@dataclass(slots=True)
+class Placement:
+    """
+    Planlanmış tek sınav. Zaman, çalışma günü indeksi + gün içi dakika olarak tutulur;
+    tarih/saat metinleri sadece _format_plan ve kayıt sırasında üretilir.
+    """
+    course: dict
+    day: int            # workdays listesindeki indeks
+    start: int          # gün başından itibaren dakika (ör. 600 = 10:00)
+    end: int
+    rooms: list
+    duration: int
+    type: str
+
+
+def _fmt_minute(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+class ConflictGraph:
+    """
+    Ders → ders öğrenci çakışma grafı.
+    Kayıtlar bir kez yüklenir; her kenar iki dersin ortak öğrenci sayısını tutar,
+    böylece çakışma kontrolleri veritabanına gitmeden bellekte yapılır.
+    """
+
+    def __init__(self, students_by_course: dict[int, set[int]]):
+        self.students_by_course = students_by_course
+        self.adj: dict[int, dict[int, int]] = {cid: {} for cid in students_by_course}
+
+        courses_by_student: dict[int, list[int]] = {}
+        for cid, students in students_by_course.items():
+            for sid in students:
+                courses_by_student.setdefault(sid, []).append(cid)
+
+        for cids in courses_by_student.values():
+            for i, a in enumerate(cids):
+                row_a = self.adj[a]
+                for b in cids[i + 1:]:
+                    row_a[b] = row_a.get(b, 0) + 1
+                    row_b = self.adj[b]
+                    row_b[a] = row_b.get(a, 0) + 1
+
+    @classmethod
+    def from_rows(cls, rows, course_ids):
+        """(course_id, student_id) satırlarından grafı kurar; sadece verilen dersler dahil edilir."""
+        students_by_course = {cid: set() for cid in course_ids}
+        for r in rows:
+            bucket = students_by_course.get(r["course_id"])
+            if bucket is not None:
+                bucket.add(r["student_id"])
+        return cls(students_by_course)
+
+    def shared(self, a: int, b: int) -> int:
+        return self.adj.get(a, {}).get(b, 0)
+
+    def neighbors(self, course_id: int) -> dict[int, int]:
+        return self.adj.get(course_id, {})
+
+    def degree(self, course_id: int) -> int:
+        return len(self.adj.get(course_id, {}))
+
+    def conflicts_with_any(self, course_id: int, others) -> bool:
+        row = self.adj.get(course_id, {})
+        return any(o in row for o in others)
+
+
+class OccupancyIndex:
+    """
+    Yerleştirilmiş sınavların gün/derslik doluluk indeksi.
+    (gün, derslik_id) başına başlangıca göre sıralı aralık listesi tutulur; bir aralık
+    eklenirken boş olduğu zaten doğrulandığından liste ayrık kalır ve "derslik t1–t2
+    (+ bekleme) arası boş mu?" sorusu ikili aramayla, komşu iki aralığa bakarak cevaplanır.
+    """
+
+    def __init__(self):
+        self.room_intervals: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        self.day_intervals: dict[int, list[tuple[int, int]]] = {}
+        self.by_course: dict[int, Placement] = {}
+
+    def add(self, p: Placement) -> None:
+        for r in p.rooms:
+            insort(self.room_intervals.setdefault((p.day, r["id"]), []), (p.start, p.end))
+        insort(self.day_intervals.setdefault(p.day, []), (p.start, p.end))
+        self.by_course[p.course["id"]] = p
+
+    @staticmethod
+    def _is_free(intervals, start: int, end: int, gap: int) -> bool:
+        i = bisect_left(intervals, (start,))
+        if i > 0 and intervals[i - 1][1] + gap > start:
+            return False
+        if i < len(intervals) and end + gap > intervals[i][0]:
+            return False
+        return True
+
+    def room_free(self, day: int, room_id: int, start: int, end: int, gap: int) -> bool:
+        return self._is_free(self.room_intervals.get((day, room_id), ()), start, end, gap)
+
+    def day_free(self, day: int, start: int, end: int) -> bool:
+        """Gün içinde hiçbir sınavla kesişmiyor mu? (sadece no_overlap modunda ayrık liste garantilidir)"""
+        return self._is_free(self.day_intervals.get(day, ()), start, end, 0)
 
 
 class ExamSchedulerService:
@@ -12,6 +125,15 @@ class ExamSchedulerService:
     def __init__(self):
         self.errors = []
         self.generated_plan = []
+        self.conflict_graph = None
+        self.occupancy = OccupancyIndex()
+        self.room_allocator = RoomAllocator()
+        self.seat_utilization = None
+        self.persist_stats = {}
+        self.optimizer_stats = {}
+        self.rng = random.Random()
+        self.last_seed = None
+        self.multi_start_stats = {}
 
     # ============================================================
     # 🔹 ANA METOD
@@ -27,16 +149,29 @@ class ExamSchedulerService:
         default_duration: int,
         gap_duration: int,
         no_overlap: bool,
-        custom_durations: dict[str, int] | None = None
+        custom_durations: dict[str, int] | None = None,
+        strategy: str = "random",
+        optimize_seconds: float = 0.0,
+        attempts: int = 1,
+        time_limit_sec: float = 60.0,
+        seed: int | None = None
     ):
         self.errors.clear()
         self.generated_plan.clear()
+        self.optimizer_stats = {}
+        self.multi_start_stats = {}
+        self.seat_utilization = None
+        self.persist_stats = {}
 
         # 🔹 Admin bölüm seçmeden başlatırsa uyarı
         if not department_id:
             self.errors.append("⚠️ Lütfen geçerli bir bölüm seçiniz.")
             return []
 
+        if strategy not in self.STRATEGIES:
+            self.errors.append(f"❌ Bilinmeyen planlama stratejisi: {strategy}")
+            return []
+
         # 1️⃣ Tarih aralığı oluştur
         workdays = self._build_workdays(start_date, end_date, holidays)
         if not workdays:
@@ -55,6 +190,9 @@ class ExamSchedulerService:
             self.errors.append("❌ Derslik bulunamadı — lütfen önce bölümünüze ait derslik ekleyin.")
             return []
 
+        # 🔗 Öğrenci çakışma grafı (tek sorgu, sonrası bellekte)
+        self.conflict_graph = self._build_conflict_graph(department_id, courses)
+
         # ------------------------------------------------------------
         # ⚙️ Fizibilite Kontrolü
         # ------------------------------------------------------------
@@ -72,90 +210,246 @@ class ExamSchedulerService:
             )
             return []
 
-        # 4️⃣ Sınıfa göre grupla
-        grouped_by_class = self._group_by_class(courses)
+        # 4️⃣ Slotları oluştur
+        slots_per_day = self._build_slots(default_duration, gap_duration)
+        durations = {
+            c["id"]: (custom_durations.get(c["code"], default_duration) if custom_durations else default_duration)
+            for c in courses
+        }
+
+        # 5️⃣ Yerleştirme (+ isteğe bağlı iyileştirme), tek veya çoklu başlangıçlı
+        problem = {
+            "courses": courses,
+            "rooms": rooms,
+            "workdays": workdays,
+            "slots": slots_per_day,
+            "durations": durations,
+            "exam_type": exam_type,
+            "gap": gap_duration,
+            "no_overlap": no_overlap,
+            "graph": self.conflict_graph,
+            "strategy": strategy,
+            "optimize_seconds": optimize_seconds,
+        }
+        if attempts > 1:
+            result = self._solve_multi_start(problem, attempts, time_limit_sec, seed)
+        else:
+            result = _solve(problem, seed if seed is not None else _new_seed())
+
+        self.last_seed = result["seed"]
+        self.errors.extend(result["errors"])
+        self.optimizer_stats = result["optimizer_stats"]
+        placed_courses = result["placed"]
+        self.seat_utilization = _seat_utilization(placed_courses)
+
+        # 6️⃣ DB'ye kaydet (tek işlem; hata olursa dönem hiç yazılmaz)
+        if not self.errors and placed_courses:
+            try:
+                self._persist_to_database(
+                    placed_courses, workdays, exam_type, start_date, end_date, default_duration, gap_duration
+                )
+            except Exception as e:
+                self.errors.append(f"❌ Sınav programı veritabanına kaydedilemedi: {e}")
 
-        # 5️⃣ Her sınıfa gün ata
-        class_day_map = self._assign_days_to_classes(grouped_by_class, workdays)
+        if self.errors:
+            return []
 
-        # 6️⃣ Slotları oluştur
-        slots_per_day = self._build_slots(default_duration, gap_duration)
+        self.generated_plan = self._format_plan(placed_courses, workdays)
+        return self.generated_plan
 
-        # 7️⃣ Yerleştirme
+    # ============================================================
+    # 🎲 ÇOKLU BAŞLANGIÇ (süreç havuzu)
+    # ============================================================
+    def _solve_multi_start(self, problem, attempts, time_limit_sec, seed):
+        """
+        Aynı önyüklenmiş problemi farklı tohumlarla paralel çözer, en iyi planı seçer.
+        Veriler her işçiye başlangıçta bir kez gönderilir; işçiler MySQL'e bağlanmaz.
+        """
+        base_seed = seed if seed is not None else _new_seed()
+        seeds = [base_seed + i for i in range(attempts)]
+        workers = min(attempts, os.cpu_count() or 1)
+        started = time.perf_counter()
+        # İşçiler bu andan sonra iyileştirmeyi keser; süre dolunca havuz beklemeden kapatılsa da
+        # çalışan işçi boşuna meşgul kalmaz. Kesilen denemeler tohumla tekrarlanamaz → elenir
+        deadline = time.time() + time_limit_sec
+
+        results = []
+        # Qt thread'leri çalışırken fork güvenli değil; süreçler "spawn" ile başlatılır
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(problem,),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        try:
+            futures = [executor.submit(_solve_in_worker, s, deadline) for s in seeds]
+            done, _ = wait(futures, timeout=time_limit_sec)
+            for f in done:
+                try:
+                    result = f.result()
+                except Exception as e:
+                    print(f"⚠️ Deneme başarısız: {e}")
+                    continue
+                if result["optimizer_stats"].get("truncated"):
+                    print(f"⚠️ Tohum {result['seed']} süre sınırında kesildi, değerlendirilmedi.")
+                    continue
+                results.append(result)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not results:
+            # Süre hiçbir denemeye yetmedi → kalan süre içinde ilk tohumla yerelde bir kez dene
+            result = _solve(problem, base_seed, deadline) if time.time() < deadline else None
+            if result is None or result["optimizer_stats"].get("truncated"):
+                return _time_limit_failure(base_seed, time_limit_sec)
+            results.append(result)
+
+        best = min(results, key=_rank)
+        elapsed = time.perf_counter() - started
+        self.multi_start_stats = {
+            "attempts": attempts,
+            "completed": len(results),
+            "workers": workers,
+            "best_seed": best["seed"],
+            "best_score": best["score"],
+            "elapsed_sec": round(elapsed, 2),
+        }
+        print(f"🎲 Çoklu başlangıç: {len(results)}/{attempts} deneme, {workers} işçi, "
+              f"en iyi tohum={best['seed']} (skor {best['score']:.1f}, {elapsed:.1f} sn)")
+        return best
+
+    # ============================================================
+    # 🧠 PLANLAMA STRATEJİLERİ
+    # ============================================================
+    def _place_random(self, courses, rooms, workdays, slots, durations, exam_type, gap, no_overlap):
+        """Sınıf bazlı rastgele gün ataması + ilk uygun slot (varsayılan, eski davranış)."""
+        grouped_by_class = self._group_by_class(courses)
+        class_day_map = self._assign_days_to_classes(grouped_by_class, workdays)
+
+        self.occupancy = OccupancyIndex()
         placed_courses = []
         for cls_name, cls_courses in grouped_by_class.items():
             for i, course in enumerate(cls_courses):
                 target_day = class_day_map[cls_name][i % len(class_day_map[cls_name])]
-                placed = False
                 last_error = None
-
-                for slot_start in slots_per_day:
-                    duration = (
-                        custom_durations.get(course["code"], default_duration)
-                        if custom_durations else default_duration
+                for slot_start in slots:
+                    placement, err = self._try_place(
+                        course, target_day, slot_start, durations[course["id"]],
+                        rooms, exam_type, gap, no_overlap
                     )
-                    slot_end = (datetime.datetime.combine(target_day, slot_start)
-                                + datetime.timedelta(minutes=duration)).time()
-
-                    try:
-                        # 1️⃣ Aynı slot dolu mu (no_overlap aktifse)
-                        if no_overlap and self._overlaps_with_existing(
-                            placed_courses, target_day, slot_start, slot_end
-                        ):
-                            raise Exception(f"Ders {course['code']} zaman çakışması (slot dolu).")
-
-                        # 2️⃣ Öğrenci çakışması kontrolü
-                        if self._has_student_conflict(
-                            course["id"], placed_courses, target_day, slot_start, slot_end
-                        ):
-                            raise Exception(f"Öğrenci çakışması: {course['code']} sınavı başka bir sınavla aynı anda olamaz.")
-
-                        # 3️⃣ Derslik ataması (kapasite ve slot uygunluğu)
-                        assigned_rooms = self._assign_rooms(
-                            needed=course["student_count"],
-                            rooms=rooms,
-                            placed=placed_courses,
-                            target_day=target_day,
-                            slot=f"{slot_start.strftime('%H:%M')} - {slot_end.strftime('%H:%M')}",
-                            gap_min=gap_duration
-                        )
-
-                        if not assigned_rooms:
-                            total_capacity = sum(r["capacity"] for r in rooms)
-                            raise Exception(
-                                f"Derslik kapasitesi yetersiz (ihtiyaç: {course['student_count']}, mevcut toplam: {total_capacity})"
-                            )
-
-                        # ✅ Başarılı yerleştirme
-                        placed_courses.append({
-                            "date": target_day.strftime("%d.%m.%Y"),
-                            "slot": f"{slot_start.strftime('%H:%M')} - {slot_end.strftime('%H:%M')}",
-                            "course": course,
-                            "rooms": assigned_rooms,
-                            "duration": duration,
-                            "type": exam_type
-                        })
-                        placed = True
+                    if placement:
+                        placed_courses.append(placement)
+                        self.occupancy.add(placement)
+                        last_error = None
                         break
-
-                    except Exception as e:
-                        last_error = f"Ders {course['code']} ({course['name']}) yerleştirilemedi: {e}"
-                        continue
-
-                if not placed and last_error:
+                    last_error = err
+                if last_error:
                     self.errors.append(last_error)
+        return placed_courses
 
-        # 8️⃣ DB'ye kaydet
-        if not self.errors and placed_courses:
-            self._persist_to_database(
-                placed_courses, exam_type, start_date, end_date, default_duration, gap_duration
+    def _place_dsatur(self, courses, rooms, workdays, slots, durations, exam_type, gap, no_overlap):
+        """
+        DSatur graf boyama: her adımda komşularında en çok farklı zaman dilimi
+        görülen (doygunluğu en yüksek) ders seçilir, eşitlikte derece ve öğrenci sayısı.
+        Renkler (gün, slot) çiftleridir; her renk sınıfı için derslikler ayrıca paketlenir.
+        Rastgelelik yoktur, aynı girdi her zaman aynı planı üretir.
+        """
+        graph = self.conflict_graph
+        by_id = {c["id"]: c for c in courses}
+        code_rank = {c["id"]: i for i, c in enumerate(sorted(courses, key=lambda c: c["code"]))}
+        saturation = {cid: set() for cid in by_id}
+        day_of = {}          # course_id -> yerleştiği gün indeksi
+        day_load = [0] * len(workdays)
+        unplaced = set(by_id)
+
+        self.occupancy = OccupancyIndex()
+        placed_courses = []
+        while unplaced:
+            cid = max(unplaced, key=lambda x: (
+                len(saturation[x]),
+                graph.degree(x),
+                by_id[x]["student_count"],
+                -code_rank[x],
+            ))
+            unplaced.discard(cid)
+            course = by_id[cid]
+
+            # Komşu sınavların yoğun olduğu günler sona kalsın → öğrenci başına aynı gün sınavı azalır
+            neighbor_days = [0] * len(workdays)
+            for nb, shared in graph.neighbors(cid).items():
+                d = day_of.get(nb)
+                if d is not None:
+                    neighbor_days[d] += shared
+            day_order = sorted(range(len(workdays)), key=lambda d: (neighbor_days[d], day_load[d], d))
+
+            last_error = None
+            for d in day_order:
+                for slot_start in slots:
+                    placement, err = self._try_place(
+                        course, d, slot_start, durations[cid],
+                        rooms, exam_type, gap, no_overlap
+                    )
+                    if placement:
+                        placed_courses.append(placement)
+                        self.occupancy.add(placement)
+                        day_of[cid] = d
+                        day_load[d] += 1
+                        color = (d, slot_start)
+                        for nb in graph.neighbors(cid):
+                            if nb in unplaced:
+                                saturation[nb].add(color)
+                        last_error = None
+                        break
+                    last_error = err
+                if cid in day_of:
+                    break
+            if last_error:
+                self.errors.append(last_error)
+        return placed_courses
+
+    STRATEGIES = {
+        "random": _place_random,
+        "dsatur": _place_dsatur,
+    }
+
+    def _try_place(self, course, day, slot_start, duration, rooms, exam_type, gap, no_overlap):
+        """Dersi verilen gün/slot'a yerleştirmeyi dener → (Placement, None) veya (None, hata)."""
+        slot_end = slot_start + duration
+        try:
+            # 1️⃣ Aynı slot dolu mu (no_overlap aktifse)
+            if no_overlap and self._overlaps_with_existing(day, slot_start, slot_end):
+                raise Exception(f"Ders {course['code']} zaman çakışması (slot dolu).")
+
+            # 2️⃣ Öğrenci çakışması kontrolü
+            if self._has_student_conflict(course["id"], day, slot_start, slot_end):
+                raise Exception(f"Öğrenci çakışması: {course['code']} sınavı başka bir sınavla aynı anda olamaz.")
+
+            # 3️⃣ Derslik ataması (kapasite ve slot uygunluğu)
+            assigned_rooms = self._assign_rooms(
+                needed=course["student_count"],
+                rooms=rooms,
+                day=day,
+                start=slot_start,
+                end=slot_end,
+                gap_min=gap
             )
 
-        if self.errors:
-            return []
-
-        self.generated_plan = self._format_plan(placed_courses)
-        return self.generated_plan
+            if not assigned_rooms:
+                total_capacity = sum(r["capacity"] for r in rooms)
+                raise Exception(
+                    f"Derslik kapasitesi yetersiz (ihtiyaç: {course['student_count']}, mevcut toplam: {total_capacity})"
+                )
+        except Exception as e:
+            return None, f"Ders {course['code']} ({course['name']}) yerleştirilemedi: {e}"
+
+        # ✅ Başarılı yerleştirme
+        return Placement(
+            course=course,
+            day=day,
+            start=slot_start,
+            end=slot_end,
+            rooms=assigned_rooms,
+            duration=duration,
+            type=exam_type,
+        ), None
 
     # ============================================================
     # 🧩 Yardımcı Metodlar
@@ -172,14 +466,8 @@ class ExamSchedulerService:
         return days
 
     def _build_slots(self, duration_min, gap_min):
-        start_time = datetime.time(10, 0)
-        slots = []
-        current = datetime.datetime.combine(datetime.date.today(), start_time)
-        end_limit = datetime.time(17, 0)
-        while current.time() < end_limit:
-            slots.append(current.time())
-            current += datetime.timedelta(minutes=duration_min + gap_min)
-        return slots
+        """Slot başlangıçları, gün içi dakika olarak (10:00 → 600)."""
+        return list(range(DAY_START_MIN, DAY_END_MIN, duration_min + gap_min))
 
     def _load_courses_and_students(self, dept_id, included_codes):
         q = """
@@ -196,6 +484,15 @@ class ExamSchedulerService:
         q += " GROUP BY c.id ORDER BY c.class_name, c.code"
         return fetchall(q, tuple(params))
 
+    def _build_conflict_graph(self, dept_id, courses):
+        rows = fetchall("""
+            SELECT e.course_id, e.student_id
+            FROM enrollments e
+            JOIN courses c ON c.id = e.course_id
+            WHERE c.department_id = %s
+        """, (dept_id,))
+        return ConflictGraph.from_rows(rows, [c["id"] for c in courses])
+
     def _load_classrooms(self, dept_id):
         return fetchall("""
             SELECT id, code, capacity
@@ -214,141 +511,108 @@ class ExamSchedulerService:
     def _assign_days_to_classes(self, grouped, workdays):
         day_map = {}
         for cls_name, courses in grouped.items():
-            shuffled_days = workdays.copy()
-            random.shuffle(shuffled_days)
+            shuffled_days = list(range(len(workdays)))
+            self.rng.shuffle(shuffled_days)
             day_map[cls_name] = shuffled_days[:len(courses)]
         return day_map
 
-    def _overlaps_with_existing(self, placed, date, new_start, new_end):
-        new_start_dt = datetime.datetime.combine(date, new_start)
-        new_end_dt = datetime.datetime.combine(date, new_end)
-        for p in placed:
-            if p["date"] != date.strftime("%d.%m.%Y"):
-                continue
-            start_str, end_str = [x.strip() for x in p["slot"].split("-")]
-            existing_start = datetime.datetime.strptime(start_str, "%H:%M")
-            existing_end = datetime.datetime.strptime(end_str, "%H:%M")
-            if existing_start < new_end_dt and new_start_dt < existing_end:
+    def _overlaps_with_existing(self, day, new_start, new_end):
+        return not self.occupancy.day_free(day, new_start, new_end)
+
+    def _has_student_conflict(self, course_id, day, slot_start, slot_end):
+        # Sadece ortak öğrencisi olan (graf komşusu) derslerin yerleşimine bakılır
+        for nb in self.conflict_graph.neighbors(course_id):
+            p = self.occupancy.by_course.get(nb)
+            if p and p.day == day and p.start < slot_end and slot_start < p.end:
                 return True
         return False
 
-    def _has_student_conflict(self, course_id, placed, date, slot_start, slot_end):
-        overlapping = []
-        for p in placed:
-            if p["date"] != date.strftime("%d.%m.%Y"):
-                continue
-            start_str, end_str = [x.strip() for x in p["slot"].split("-")]
-            existing_start = datetime.datetime.strptime(start_str, "%H:%M")
-            existing_end = datetime.datetime.strptime(end_str, "%H:%M")
-            if existing_start.time() < slot_end and slot_start < existing_end.time():
-                overlapping.append(p["course"]["id"])
-        if not overlapping:
-            return False
-        q = f"""
-        SELECT COUNT(*) AS c FROM enrollments e1
-        JOIN enrollments e2 ON e1.student_id = e2.student_id
-        WHERE e1.course_id = %s AND e2.course_id IN ({','.join(['%s']*len(overlapping))})
-        """
-        res = fetchall(q, tuple([course_id] + overlapping))
-        return res[0]["c"] > 0 if res else False
-
     # ============================================================
     # 🧮 DERSLİK ATAMASI
     # ============================================================
-    def _assign_rooms(self, needed, rooms, placed, target_day, slot, gap_min=15):
-        assigned = []
-        total_capacity = 0
-        sorted_rooms = sorted(rooms, key=lambda r: r["capacity"], reverse=True)
-
-        start_str, end_str = [x.strip() for x in slot.split("-")]
-        slot_start = datetime.datetime.strptime(start_str, "%H:%M")
-        slot_end = datetime.datetime.strptime(end_str, "%H:%M")
-        slot_end_with_gap = slot_end + datetime.timedelta(minutes=gap_min)
-
-        for room in sorted_rooms:
-            conflict = False
-            for p in placed:
-                if p["date"] != target_day.strftime("%d.%m.%Y"):
-                    continue
-                for used in p["rooms"]:
-                    if used["code"] != room["code"]:
-                        continue
-                    p_start, p_end = [datetime.datetime.strptime(x.strip(), "%H:%M") for x in p["slot"].split("-")]
-                    p_end_with_gap = p_end + datetime.timedelta(minutes=gap_min)
-                    if not (slot_end_with_gap <= p_start or slot_start >= p_end_with_gap):
-                        conflict = True
-                        break
-                if conflict:
-                    break
-            if conflict:
-                continue
-
-            assigned.append(room)
-            total_capacity += room["capacity"]
-            if total_capacity >= needed:
-                return assigned
-        return []
+    def _assign_rooms(self, needed, rooms, day, start, end, gap_min=15):
+        # rooms, _load_classrooms'tan kapasiteye göre azalan sırada gelir
+        free = [r for r in rooms if self.occupancy.room_free(day, r["id"], start, end, gap_min)]
+        return self.room_allocator.allocate(free, needed)
 
     # ============================================================
     # 💾 VERİTABANI KAYDI
     # ============================================================
-    def _persist_to_database(self, placed_courses, exam_type, start_date, end_date, duration, gap):
-        """Oluşturulan sınav programını veritabanına güvenli şekilde kaydeder."""
+    def _persist_to_database(self, placed_courses, workdays, exam_type, start_date, end_date, duration, gap):
+        """
+        Oluşturulan sınav programını tek işlemde (transaction) veritabanına kaydeder.
+        timeslots / exams / exam_rooms toplu INSERT ile yazılır, üretilen id'ler dönem
+        bazında tek sorguyla geri okunur. Hata olursa hiçbir satır kalmaz.
+        """
+        started = time.perf_counter()
         start_dt = datetime.datetime.strptime(start_date, "%d.%m.%Y").date()
         end_dt = datetime.datetime.strptime(end_date, "%d.%m.%Y").date()
+        midnights = [datetime.datetime.combine(d, datetime.time()) for d in workdays]
 
-        term_id = execute("""
-            INSERT INTO exam_terms (name, date_start, date_end, default_duration_min, min_gap_min)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (exam_type, start_dt, end_dt, duration, gap))
-
-        slot_map = {}
-        for p in placed_courses:
-            date_str = p["date"]
-            start_str, end_str = [x.strip() for x in p["slot"].split("-")]
-            start_dt_full = datetime.datetime.strptime(f"{date_str} {start_str}", "%d.%m.%Y %H:%M")
-            end_dt_full = datetime.datetime.strptime(f"{date_str} {end_str}", "%d.%m.%Y %H:%M")
-            key = (start_dt_full, end_dt_full)
-
-            if key not in slot_map:
-                slot_id = execute("""
-                    INSERT INTO timeslots (exam_term_id, starts_at, ends_at)
-                    VALUES (%s, %s, %s)
-                """, (term_id, start_dt_full, end_dt_full))
-                slot_map[key] = slot_id
-
-        for p in placed_courses:
-            course_id = p["course"]["id"]
-            date_str = p["date"]
-            start_str, end_str = [x.strip() for x in p["slot"].split("-")]
-            start_dt_full = datetime.datetime.strptime(f"{date_str} {start_str}", "%d.%m.%Y %H:%M")
-            end_dt_full = datetime.datetime.strptime(f"{date_str} {end_str}", "%d.%m.%Y %H:%M")
-            key = (start_dt_full, end_dt_full)
-            slot_id = slot_map.get(key)
-            if not slot_id:
-                continue
+        def slot_times(p):
+            return (
+                midnights[p.day] + datetime.timedelta(minutes=p.start),
+                midnights[p.day] + datetime.timedelta(minutes=p.end),
+            )
 
-            exam_id = execute("""
-                INSERT INTO exams (course_id, exam_term_id, timeslot_id, status)
-                VALUES (%s, %s, %s, 'PLANNED')
-            """, (course_id, term_id, slot_id))
+        slot_rows = list(dict.fromkeys(slot_times(p) for p in placed_courses))
 
-            for r in p["rooms"]:
-                execute("""
+        with tx() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO exam_terms (name, date_start, date_end, default_duration_min, min_gap_min)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (exam_type, start_dt, end_dt, duration, gap))
+                term_id = cur.lastrowid
+
+                # 1️⃣ Zaman dilimleri
+                cur.executemany("""
+                    INSERT INTO timeslots (exam_term_id, starts_at, ends_at)
+                    VALUES (%s, %s, %s)
+                """, [(term_id, s, e) for s, e in slot_rows])
+                cur.execute(
+                    "SELECT id, starts_at, ends_at FROM timeslots WHERE exam_term_id=%s", (term_id,)
+                )
+                slot_map = {(s, e): slot_id for slot_id, s, e in cur.fetchall()}
+
+                # 2️⃣ Sınavlar
+                cur.executemany("""
+                    INSERT INTO exams (course_id, exam_term_id, timeslot_id, status)
+                    VALUES (%s, %s, %s, 'PLANNED')
+                """, [(p.course["id"], term_id, slot_map[slot_times(p)]) for p in placed_courses])
+                cur.execute("SELECT id, course_id FROM exams WHERE exam_term_id=%s", (term_id,))
+                exam_map = {course_id: exam_id for exam_id, course_id in cur.fetchall()}
+
+                # 3️⃣ Derslik atamaları
+                room_rows = [(exam_map[p.course["id"]], r["id"]) for p in placed_courses for r in p.rooms]
+                cur.executemany("""
                     INSERT INTO exam_rooms (exam_id, classroom_id)
                     VALUES (%s, %s)
-                """, (exam_id, r["id"]))
+                """, room_rows)
+
+        elapsed = time.perf_counter() - started
+        total_rows = 1 + len(slot_rows) + len(placed_courses) + len(room_rows)
+        self.persist_stats = {
+            "term_id": term_id,
+            "rows": total_rows,
+            "elapsed_sec": round(elapsed, 3),
+            "rows_per_sec": int(total_rows / elapsed) if elapsed > 0 else total_rows,
+        }
+        print(f"💾 Program kaydedildi: {total_rows} satır, {elapsed:.2f} sn "
+              f"({self.persist_stats['rows_per_sec']} satır/sn)")
+        return term_id
 
     # ============================================================
-    def _format_plan(self, placed_courses):
+    def _format_plan(self, placed_courses, workdays):
+        """İç (gün indeksi, dakika) gösterimini ekranda/Excel'de kullanılan metinlere çevirir."""
         return [{
-            "Tarih": p["date"],
-            "Saat": p["slot"],
-            "Ders": f"{p['course']['code']} — {p['course']['name']}",
-            "Öğretim Elemanı": p["course"]["instructor_name"],
-            "Derslikler": ", ".join([r["code"] for r in p["rooms"]]),
-            "Tür": p["type"],
-            "Süre (dk)": p["duration"]
+            "Tarih": workdays[p.day].strftime("%d.%m.%Y"),
+            "Saat": f"{_fmt_minute(p.start)} - {_fmt_minute(p.end)}",
+            "Ders": f"{p.course['code']} — {p.course['name']}",
+            "Öğretim Elemanı": p.course["instructor_name"],
+            "Derslikler": ", ".join([r["code"] for r in p.rooms]),
+            "Tür": p.type,
+            "Süre (dk)": p.duration
         } for p in placed_courses]
 
     # ============================================================
@@ -362,6 +626,9 @@ class ExamSchedulerService:
             )
         )
 
+        import openpyxl  # ağır bağımlılık: yalnızca dışa aktarımda
+        from openpyxl.styles import Alignment, Font, PatternFill
+
         wb = openpyxl.Workbook()
         ws = wb.active
         ws.title = "Sınav Programı"
@@ -395,3 +662,88 @@ class ExamSchedulerService:
 
         wb.save(filename)
         return True
+
+
+# ============================================================
+# 🧵 ÇÖZÜCÜ (süreç havuzu işçileri de bunu kullanır)
+# ============================================================
+_WORKER_PROBLEM = None
+# "İyileştirme süresi" ayarının hamle karşılığı (200 ders / 6000 öğrencilik planda ~5000 hamle/sn ölçüldü)
+OPTIMIZER_MOVES_PER_SEC = 5000
+
+
+def _new_seed() -> int:
+    return random.SystemRandom().randrange(2 ** 31)
+
+
+def _move_budget(optimize_seconds: float) -> int:
+    """İyileştirme süresini sabit hamle sayısına çevirir: aynı tohum + ayar her makinede aynı planı verir."""
+    return int(round(optimize_seconds * OPTIMIZER_MOVES_PER_SEC))
+
+
+def _solve(problem, seed, deadline: float | None = None):
+    """
+    Önyüklenmiş problemi verilen tohumla çözer; veritabanına dokunmaz.
+    Sonuç yalnızca (problem, tohum) ikilisine bağlıdır; `deadline` yalnız çoklu başlangıçta
+    süre aşımı güvenliği içindir.
+    """
+    svc = ExamSchedulerService()
+    svc.conflict_graph = problem["graph"]
+    svc.rng = random.Random(seed)
+    engine = ExamSchedulerService.STRATEGIES[problem["strategy"]]
+    placed = engine(
+        svc, problem["courses"], problem["rooms"], problem["workdays"], problem["slots"],
+        problem["durations"], problem["exam_type"], problem["gap"], problem["no_overlap"]
+    )
+
+    optimizer = ExamPlanOptimizer(
+        problem["graph"], problem["rooms"], problem["workdays"], problem["slots"],
+        problem["gap"], problem["no_overlap"], seed=seed
+    )
+    stats = {}
+    if not svc.errors and problem["optimize_seconds"] > 0:
+        placed = optimizer.optimize(placed, max_moves=_move_budget(problem["optimize_seconds"]),
+                                    deadline=deadline)
+        stats = optimizer.stats
+
+    return {
+        "seed": seed,
+        "placed": placed,
+        "errors": list(svc.errors),
+        "optimizer_stats": stats,
+        "score": optimizer.score(placed),
+    }
+
+
+def _time_limit_failure(seed, time_limit_sec):
+    """Süre sınırında hiçbir deneme tamamlanamadığında dönen boş sonuç."""
+    return {
+        "seed": seed,
+        "placed": [],
+        "errors": [f"⏱️ {time_limit_sec:g} sn süre sınırında hiçbir deneme tamamlanamadı. "
+                   f"Süre sınırını artırın veya deneme sayısını azaltın."],
+        "optimizer_stats": {},
+        "score": float("inf"),
+    }
+
+
+def _seat_utilization(placed) -> float | None:
+    """Atanan derslik koltuklarının sınava giren öğrencilerce doldurulma oranı."""
+    seats = sum(r["capacity"] for p in placed for r in p.rooms)
+    if not seats:
+        return None
+    return sum(p.course["student_count"] for p in placed) / seats
+
+
+def _rank(result):
+    """Önce yerleşemeyen ders sayısı, sonra yumuşak kısıt maliyeti; eşitlikte küçük tohum."""
+    return (len(result["errors"]), result["score"], result["seed"])
+
+
+def _init_worker(problem):
+    global _WORKER_PROBLEM
+    _WORKER_PROBLEM = problem
+
+
+def _solve_in_worker(seed, deadline=None):
+    return _solve(_WORKER_PROBLEM, seed, deadline)
@@ -1,21 +1,35 @@
 import datetime
+import functools
+import hashlib
 from dataclasses import dataclass
 from typing import List, Dict
-from app.db import fetchall, fetchone
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
-from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from app.config import settings
+from app.db import fetchall, fetchone, iter_chunks, tx
+from app.services.seat_template import template_for
 import os
 import platform
+import threading
+
+# Yerleştirme kuralları (sıralama, koltuk desenleri) değişince artırılır; kayıtlı planlar geçersizleşir
+SEATING_HASH_VERSION = 1
+# PDF sayfaları en az bu kadarsa süreçlere bölünür. Tek süreç saniyede
+# birkaç yüz derslik sayfası çizer; süreç açılışı + birleştirme ise ~1 sn sürer
+PDF_POOL_MIN_PAGES = 400
+PDF_MIN_CHUNK = 25  # süreç başına en az sayfa
 
 
 # ---------------------------------------
 #  FONT TANIMI (Windows / Linux Otomatik)
 # ---------------------------------------
+@functools.lru_cache(maxsize=None)
 def register_turkish_font():
+    """
+    Türkçe karakterli fontu reportlab'e kaydeder ve adını döner.
+    İlk PDF çıktısında çağrılır; dosya araması ve TTF okuma süreç başına bir kez yapılır.
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
     system = platform.system().lower()
     font_name = "DejaVu"
     font_paths = []
@@ -40,12 +54,9 @@ def register_turkish_font():
             except Exception as e:
                 print(f"⚠️ Font yüklenemedi: {path} ({e})")
 
+    # Helvetica reportlab'in yerleşik fontudur, kayıt gerektirmez
     print("⚠️ Türkçe font bulunamadı, Helvetica kullanılacak.")
-    pdfmetrics.registerFont(TTFont(font_name, "Helvetica"))
-    return font_name
-
-
-FONT_NAME = register_turkish_font()
+    return "Helvetica"
 
 
 @dataclass
@@ -58,6 +69,11 @@ class Room:
     capacity: int
     col_groups: List[int]
 
+    @property
+    def template(self):
+        """Dersliğin koltuk şablonu (derslik başına önbellekli)."""
+        return template_for(self.id, self.num_rows, self.col_groups)
+
 
 class ExamSeatingService:
     """
@@ -68,6 +84,31 @@ class ExamSeatingService:
 
     def __init__(self):
         self.warnings = []  # 🔹 Uyarı mesajları burada toplanacak
+        # Sınav bazlı önbellek: generate_seating ve export_pdf aynı sınav için tekrar sorgulamaz
+        self._exam_rows: Dict[int, Dict] = {}
+        self._rooms_by_exam: Dict[int, List[Room]] = {}
+        # Önbellek GUI thread'inden boşaltılırken arka plandaki iş aynı nesneyi kullanıyor olabilir:
+        # erişim kilitli, boşaltma sayacı artırır; boşaltmadan önce başlamış yükleme önbelleğe yazılmaz
+        self._cache_lock = threading.Lock()
+        self._cache_gen = 0
+        self.query_count = 0
+
+    def clear_cache(self):
+        """Sınav / derslik düzeni önbelleğini boşaltır (sınav listesi yenilenirken çağrılır)."""
+        with self._cache_lock:
+            self._exam_rows.clear()
+            self._rooms_by_exam.clear()
+            self._cache_gen += 1
+
+    def _cache_lookup(self, cache: Dict, keys):
+        """(önbellekte bulunanlar, boşaltma sayacı) — sonuç çağıranın kendi sözlüğüdür."""
+        with self._cache_lock:
+            return {k: cache[k] for k in keys if k in cache}, self._cache_gen
+
+    def _cache_store(self, cache: Dict, loaded: Dict, generation: int):
+        with self._cache_lock:
+            if generation == self._cache_gen:
+                cache.update(loaded)
 
     # -------------------- PUBLIC API --------------------
     def list_exams(self, department_id: int) -> List[Dict]:
@@ -93,12 +134,7 @@ class ExamSeatingService:
             print("⚠️ Bölüm ID boş, sınav listesi yüklenmedi (admin henüz seçim yapmadı).")
             return []
 
-        latest_term = fetchone("""
-            SELECT id, date_start, date_end
-            FROM exam_terms
-            ORDER BY id DESC
-            LIMIT 1
-        """)
+        latest_term = self._latest_term()
 
         if not latest_term:
             print("⚠️ Hiç sınav dönemi bulunamadı.")
@@ -137,172 +173,322 @@ class ExamSeatingService:
         return exams
 
     def get_exam_overview(self, exam_id: int) -> Dict:
-        exam = fetchone("""
-            SELECT ex.id, c.code, c.name, t.starts_at, t.ends_at
-            FROM exams ex
-            JOIN courses c ON c.id = ex.course_id
-            JOIN timeslots t ON t.id = ex.timeslot_id
-            WHERE ex.id = %s
-        """, (exam_id,))
+        found, generation = self._cache_lookup(self._exam_rows, [exam_id])
+        exam = found.get(exam_id)
+        if exam is None:
+            self.query_count += 1
+            exam = fetchone("""
+                SELECT ex.id, c.code, c.name, t.starts_at, t.ends_at
+                FROM exams ex
+                JOIN courses c ON c.id = ex.course_id
+                JOIN timeslots t ON t.id = ex.timeslot_id
+                WHERE ex.id = %s
+            """, (exam_id,))
+            if exam:
+                self._cache_store(self._exam_rows, {exam_id: exam}, generation)
         rooms = self._load_rooms_for_exam(exam_id)
         return {"exam": exam, "rooms": rooms}
 
     def generate_seating(self, exam_id: int) -> List[Dict]:
         """Öğrencileri derslik kapasitesine göre sırayla yerleştirir."""
         self.warnings.clear()
+        try:
+            placements, warnings = self._generate(exam_id)
+        except ValueError as e:
+            self.warnings.append(str(e))
+            raise
+        self.warnings.extend(warnings)
+        return placements
+
+    def _generate(self, exam_id: int):
+        """
+        (yerleşimler, uyarılar) döner; paylaşılan self.warnings'e dokunmaz. Kapasite yetersizse
+        ValueError, öğrenci / derslik yoksa boş plan ve uyarı döner.
+        """
         students = self._load_students_for_exam(exam_id)
         rooms = self._load_rooms_for_exam(exam_id)
-        if not students or not rooms:
-            msg = "⚠️ Oturma planı oluşturulamadı: Öğrenci veya derslik bulunamadı."
-            print(msg)
-            self.warnings.append(msg)
-            return []
+        if students and rooms:
+            total_cap = sum(_effective_capacity(r) for r in rooms)
+            print(f"🧮 Toplam {len(rooms)} derslik kapasitesi: {total_cap} — Öğrenci sayısı: {len(students)}")
 
-        total_cap = sum(r.capacity for r in rooms)
-        print(f"🧮 Toplam {len(rooms)} derslik kapasitesi: {total_cap} — Öğrenci sayısı: {len(students)}")
+        placements, warnings, error = _place_students(students, rooms)
+        if error:
+            print(error)
+            if students and rooms:
+                raise ValueError(error)
+            return [], warnings + [error]
 
-        if total_cap < len(students):
-            msg = f"Derslik kapasitesi yetersiz! (Toplam kapasite: {total_cap}, Öğrenci: {len(students)})"
-            self.warnings.append(msg)
-            raise ValueError(msg)
+        print(f"✅ Oturma planı tamamlandı, toplam {len(placements)} öğrenci yerleştirildi.\n")
+        return placements, warnings
 
-        placements = []
-        idx = 0
-        for r in sorted(rooms, key=lambda x: x.capacity, reverse=True):
-            room_capacity = r.capacity
-            available_students = students[idx: idx + room_capacity]
+    def generate_term_seating(self, term_id: int = None, department_id: int = None,
+                              progress_cb=None, force: bool = False) -> Dict:
+        """
+        Dönemdeki tüm sınavların oturma planını tek seferde üretir.
 
-            if not available_students:
-                continue
+        Girdileri (öğrenci listesi / derslik düzeni) kayıtlı plandan bu yana değişmemiş
+        sınavların planı seat_assignments tablosundan okunur; yalnız değişenler (force=True
+        ise hepsi) yeniden hesaplanır ve tek transaction'da kaydedilir. Öğrenciler ve derslik
+        düzenleri birkaç toplu sorguyla okunur; yerleştirme aynı süreçte sırayla yapılır
+        (öğrenci başına ~1 µs; süreç havuzunun açılışı ve sonuçların taşınması bundan pahalı).
+        term_id verilmezse en son dönem, department_id verilirse yalnız o bölümün sınavları alınır.
 
-            # 🔹 Eğer kapasite dolduysa uyarı
-            if len(available_students) < room_capacity and idx + len(available_students) < len(students):
-                remaining = len(students) - (idx + len(available_students))
-                self.warnings.append(
-                    f"{remaining} öğrenci {r.code} dersliğine sığmadı (kapasite dolu)."
+        Dönüş: {"seatings": {exam_id: [yerleşim, ...]}, "warnings": {exam_id: [mesaj, ...]}}
+        (warnings yalnız uyarısı / hatası olan sınavları içerir).
+        """
+        if term_id is None:
+            term = self._latest_term()
+            if not term:
+                print("⚠️ Hiç sınav dönemi bulunamadı.")
+                return {"seatings": {}, "warnings": {}}
+            term_id = term["id"]
+
+        self.query_count += 1
+        exams = fetchall("""
+            SELECT ex.id
+            FROM exams ex
+            JOIN courses c ON c.id = ex.course_id
+            WHERE ex.exam_term_id = %s
+              AND (%s IS NULL OR c.department_id = %s)
+            ORDER BY ex.id
+        """, (term_id, department_id, department_id))
+        exam_ids = [e["id"] for e in exams]
+        if not exam_ids:
+            print(f"⚠️ {term_id} numaralı dönemde sınav bulunamadı.")
+            return {"seatings": {}, "warnings": {}}
+
+        if progress_cb:
+            progress_cb("Veriler okunuyor", 0, len(exam_ids))
+        hashes, stored = self._current_plans(exam_ids, force)
+        seatings, warnings = {}, {}
+        for exam_id, placements in stored.items():
+            seatings[exam_id] = placements
+            exam_warnings = _neighbour_warnings(placements)
+            if exam_warnings:
+                warnings[exam_id] = exam_warnings
+
+        stale = [e for e in exam_ids if e not in stored]
+        if stale:
+            students_by_exam = self._load_students_for_exams(stale)
+            rooms_by_exam = self._load_rooms_for_exams(stale)
+
+            generated = {}
+            for done, exam_id in enumerate(stale, start=1):
+                placements, exam_warnings, error = _place_students(
+                    students_by_exam.get(exam_id, []), rooms_by_exam[exam_id]
                 )
-
-            for i, s in enumerate(available_students):
-                row_no = (i // r.num_cols) + 1
-                col_no = (i % r.num_cols) + 1
-                placements.append({
-                    "student_number": s["number"],
-                    "student_name": s["name"],
-                    "room_code": r.code,
-                    "row_no": row_no,
-                    "col_no": col_no
-                })
-            idx += len(available_students)
-
-            if idx >= len(students):
-                break
-
-        # 🔹 Yan yana oturma kontrolü
-        for i in range(1, len(placements)):
-            prev = placements[i - 1]
-            curr = placements[i]
-            if prev["room_code"] == curr["room_code"] and prev["row_no"] == curr["row_no"]:
-                if prev["student_name"].split()[-1] == curr["student_name"].split()[-1]:
-                    self.warnings.append(
-                        f"{prev['student_name']} ve {curr['student_name']} aynı soyadlı öğrenciler yan yana oturdu ({prev['room_code']})."
-                    )
-
-        print(f"✅ Oturma planı tamamlandı, toplam {len(placements)} öğrenci yerleştirildi.\n")
-        return placements
-
-    def export_pdf(self, exam_id: int, seating: List[Dict], filename: str):
-        """PDF çıktısı üretir (seat_group + ölçeklendirilmiş çizim)."""
+                if error:
+                    exam_warnings.append(error)
+                seatings[exam_id] = placements
+                if placements:
+                    generated[exam_id] = placements
+                if exam_warnings:
+                    warnings[exam_id] = exam_warnings
+                if progress_cb:
+                    progress_cb("Oturma planları", done, len(stale))
+            if progress_cb:
+                progress_cb("Kaydediliyor", 0, 1)
+            self.save_seatings(generated, hashes)
+
+        placed = sum(len(p) for p in seatings.values())
+        print(f"✅ Dönem oturma planı: {len(seatings)} sınav ({len(stored)} kayıtlı, {len(stale)} yeniden), "
+              f"{placed} öğrenci, {len(warnings)} sınavda uyarı ({self.query_count} sorgu).")
+        return {"seatings": seatings, "warnings": warnings}
+
+    # -------------------- KALICI PLAN --------------------
+    def ensure_seating(self, exam_id: int, force: bool = False) -> Dict:
+        """
+        Sınavın girdileri kayıtlı plandan bu yana değişmediyse kayıtlı planı döner;
+        değiştiyse (veya force=True) planı üretir ve kaydeder.
+        Dönüş: {"exam_id", "seating": [...], "warnings": [...]} — uyarılar paylaşılan
+        self.warnings yerine sonuçla birlikte döner (aynı nesnede başka iş çalışıyor olabilir).
+        """
+        hashes, stored = self._current_plans([exam_id], force)
+        if exam_id in stored:
+            print(f"📂 Kayıtlı oturma planı kullanıldı ({len(stored[exam_id])} öğrenci).")
+            placements = stored[exam_id]
+            return {"exam_id": exam_id, "seating": placements, "warnings": _neighbour_warnings(placements)}
+
+        placements, warnings = self._generate(exam_id)
+        if placements:
+            self.save_seatings({exam_id: placements}, hashes)
+        return {"exam_id": exam_id, "seating": placements, "warnings": warnings}
+
+    def load_current_seating(self, exam_id: int) -> Dict:
+        """Kayıtlı plan güncelse onu, değilse (veya hiç yoksa) boş plan döner; plan üretmez."""
+        _, stored = self._current_plans([exam_id])
+        placements = stored.get(exam_id, [])
+        return {"exam_id": exam_id, "seating": placements, "warnings": _neighbour_warnings(placements)}
+
+    def save_seatings(self, seatings: Dict[int, List[Dict]], hashes: Dict[int, str]):
+        """Sınavların planlarını ve girdi özetlerini tek transaction'da yazar (eski plan silinir)."""
+        exam_ids = sorted(seatings)
+        if not exam_ids:
+            return
+        rows = [
+            (e, p["student_id"], p["classroom_id"], p["row_no"], p["col_no"], p["seat_no"])
+            for e in exam_ids for p in seatings[e]
+        ]
+        with tx() as conn:
+            cur = conn.cursor()
+            for chunk in iter_chunks(exam_ids):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cur.execute(f"DELETE FROM seat_assignments WHERE exam_id IN ({placeholders})", tuple(chunk))
+            # Satırlar yerleşim sırasıyla eklenir; okuma `ORDER BY id` ile aynı sırayı verir
+            for chunk in iter_chunks(rows):
+                cur.executemany("""
+                    INSERT INTO seat_assignments
+                        (exam_id, student_id, classroom_id, row_no, col_no, seat_no)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, chunk)
+            cur.executemany("""
+                INSERT INTO seating_hashes (exam_id, content_hash)
+                VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE
+                    content_hash = VALUES(content_hash),
+                    generated_at = CURRENT_TIMESTAMP
+            """, [(e, hashes[e]) for e in exam_ids])
+        print(f"💾 {len(exam_ids)} sınavın oturma planı kaydedildi ({len(rows)} koltuk).")
+
+    def _current_plans(self, exam_ids, force: bool = False):
+        """
+        (güncel girdi özetleri, {exam_id: kayıtlı plan}) döner. Kayıtlı özeti güncel özetle
+        eşleşmeyen sınavlar ikinci sözlükte yer almaz.
+        """
+        hashes = self._content_hashes(exam_ids)
+        if force:
+            return hashes, {}
+        stored_hashes = {}
+        for chunk in iter_chunks(list(exam_ids)):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            self.query_count += 1
+            for r in fetchall(f"""
+                SELECT exam_id, content_hash FROM seating_hashes WHERE exam_id IN ({placeholders})
+            """, tuple(chunk)):
+                stored_hashes[r["exam_id"]] = r["content_hash"]
+        fresh = [e for e in exam_ids if stored_hashes.get(e) == hashes[e]]
+        return hashes, self._load_stored_seatings(fresh)
+
+    def _content_hashes(self, exam_ids) -> Dict[int, str]:
+        """
+        Planın bağlı olduğu girdilerin özeti: sınava kayıtlı öğrenciler (id, numara; sunucuda
+        sayı + CRC32 toplamı / XOR'u olarak, satırlar aktarılmadan) ve atanmış dersliklerin düzeni.
+        """
+        fingerprints = {}
+        for chunk in iter_chunks(list(exam_ids)):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            self.query_count += 1
+            for r in fetchall(f"""
+                SELECT ex.id AS exam_id,
+                       COUNT(s.id) AS n,
+                       COALESCE(SUM(CRC32(CONCAT_WS('|', s.id, s.number))), 0) AS crc_sum,
+                       COALESCE(BIT_XOR(CRC32(CONCAT_WS('|', s.number, s.id))), 0) AS crc_xor
+                FROM exams ex
+                LEFT JOIN enrollments e ON e.course_id = ex.course_id
+                LEFT JOIN students s ON s.id = e.student_id
+                WHERE ex.id IN ({placeholders})
+                GROUP BY ex.id
+            """, tuple(chunk)):
+                fingerprints[r["exam_id"]] = f"{r['n']}:{r['crc_sum']}:{r['crc_xor']}"
+
+        # Düzen önbellekten değil veritabanından okunur: sayfa açıkken derslik düzeni değiştiyse
+        # özet değişmeli. Okunan taze düzen önbelleğe de yazılır; ardından gelen üretim onu kullanır
+        _, generation = self._cache_lookup(self._rooms_by_exam, ())
+        rooms_by_exam = self._query_rooms_for_exams(exam_ids)
+        self._cache_store(self._rooms_by_exam, rooms_by_exam, generation)
+        hashes = {}
+        for e in exam_ids:
+            layout = ";".join(
+                f"{r.id},{r.num_rows},{r.capacity},{'.'.join(map(str, r.col_groups))}"
+                for r in sorted(rooms_by_exam[e], key=lambda r: r.id)
+            )
+            text = f"v{SEATING_HASH_VERSION}|{fingerprints.get(e, '0:0:0')}|{layout}"
+            hashes[e] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return hashes
+
+    def _load_stored_seatings(self, exam_ids) -> Dict[int, List[Dict]]:
+        """Kayıtlı planlar: parça başına tek sorgu (uq_sa_exam_student indeksi üzerinden)."""
+        by_exam = {e: [] for e in exam_ids}
+        for chunk in iter_chunks(list(exam_ids)):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            self.query_count += 1
+            for r in fetchall(f"""
+                SELECT sa.exam_id, sa.student_id, s.number AS student_number, s.name AS student_name,
+                       sa.classroom_id, r.code AS room_code, sa.row_no, sa.col_no, sa.seat_no
+                FROM seat_assignments sa
+                JOIN students s ON s.id = sa.student_id
+                JOIN classrooms r ON r.id = sa.classroom_id
+                WHERE sa.exam_id IN ({placeholders})
+                ORDER BY sa.exam_id, sa.id
+            """, tuple(chunk)):
+                by_exam[r.pop("exam_id")].append(r)
+        return by_exam
+
+    def export_pdf(self, exam_id: int, seating: List[Dict], filename: str,
+                   progress_cb=None, max_workers: int = None) -> Dict:
+        """
+        Sınavın PDF çıktısını üretir (kapak + derslik başına bir sayfa).
+        Dönüş: sayfa sayısı / süre / sayfa-saniye istatistiği.
+        """
         ov = self.get_exam_overview(exam_id)
-        ex, rooms = ov["exam"], ov["rooms"]
+        pages = _exam_pages(ov["exam"], ov["rooms"], seating)
+        return _render_document(pages, filename, progress_cb, max_workers)
 
-        c = canvas.Canvas(filename, pagesize=landscape(A4))
-        w, h = landscape(A4)
+    def export_term_booklet(self, filename: str, term_id: int = None, department_id: int = None,
+                            progress_cb=None, max_workers: int = None) -> Dict:
+        """
+        Dönemdeki tüm sınavların oturma planlarını sınav saatine göre sıralı tek PDF'te toplar.
+        Planlar generate_term_seating ile alınır (girdisi değişmeyenler kayıttan okunur).
+        """
+        result = self.generate_term_seating(term_id, department_id, progress_cb=progress_cb)
+        seatings = {e: p for e, p in result["seatings"].items() if p}
+        if not seatings:
+            raise ValueError("Kitapçığa eklenecek oturma planı bulunamadı.")
+
+        exams = self._load_exam_rows(seatings)
+        rooms_by_exam = self._load_rooms_for_exams(list(seatings))
+        order = sorted(seatings, key=lambda e: (exams[e]["starts_at"], exams[e]["code"]))
+        pages = []
+        for e in order:
+            pages.extend(_exam_pages(exams[e], rooms_by_exam[e], seatings[e]))
+
+        stats = _render_document(pages, filename, progress_cb, max_workers)
+        skipped = len(result["seatings"]) - len(seatings)
+        if skipped:
+            print(f"⚠️ Planı oluşmayan {skipped} sınav kitapçığa eklenmedi.")
+        return dict(stats, exams=len(order), skipped=skipped, warnings=result["warnings"])
 
-        # Başlık
-        c.setFont(FONT_NAME, 16)
-        c.drawString(2 * cm, h - 2 * cm, "Sınav Oturma Planı (Ders Bazlı)")
-        c.setFont(FONT_NAME, 12)
-        c.drawString(
-            2 * cm, h - 2.8 * cm,
-            f"{ex['code']} — {ex['name']} | {ex['starts_at'].strftime('%d.%m.%Y %H:%M')}"
-        )
+    # -------------------- DATA HELPERS --------------------
+    def _latest_term(self) -> Dict:
+        return fetchone("""
+            SELECT id, date_start, date_end
+            FROM exam_terms
+            ORDER BY id DESC
+            LIMIT 1
+        """)
 
-        # Her derslik için sayfa
-        for room in rooms:
-            c.showPage()
-            w, h = landscape(A4)
-            c.setFont(FONT_NAME, 14)
-            c.drawString(2 * cm, h - 2 * cm, f"Derslik: {room.code}")
-            c.setFont(FONT_NAME, 10)
-            c.drawString(2 * cm, h - 2.7 * cm,
-                         f"Sıra: {room.num_rows}   Sütun: {room.num_cols}   Kapasite: {room.capacity}")
-
-            room_students = [p for p in seating if p["room_code"] == room.code]
-            if not room_students:
-                c.drawString(2 * cm, h - 3.5 * cm, "⚠️ Bu dersliğe öğrenci atanmadı.")
-                continue
-
-            scale = 0.75
-            box_w, box_h = 2.0 * cm * scale, 1.0 * cm * scale
-            spacing = 0.3 * cm * scale
-            group_gap = 2.5 * cm * scale
-            start_x, start_y = 3 * cm, h - 4 * cm
-            idx = 0
-
-            def get_pattern(group_size):
-                if group_size == 2:
-                    return [1, 0]
-                elif group_size == 3:
-                    return [1, 0, 1]
-                elif group_size == 4:
-                    return [1, 0, 0, 1]
-                else:
-                    return [1] * group_size
-
-            for r_i in range(room.num_rows):
-                x = start_x
-                for g_idx, group in enumerate(room.col_groups):
-                    if g_idx > 0:
-                        x += group_gap
-                    pattern = get_pattern(group)
-                    for col_idx, val in enumerate(pattern):
-                        if val == 1:
-                            if idx < len(room_students):
-                                student = room_students[idx]
-                                idx += 1
-                                c.setFillColor(colors.lightblue)
-                                c.rect(x, start_y - r_i * (box_h + spacing), box_w, box_h, fill=True, stroke=1)
-                                name = student["student_name"]
-                                number = student["student_number"]
-                                text = f"{name} - {number}"
-                                font_size = 7 * scale
-                                if len(text) > 22:
-                                    font_size = 6 * scale
-                                if len(text) > 30:
-                                    font_size = 5 * scale
-                                c.setFont(FONT_NAME, font_size)
-                                c.setFillColor(colors.black)
-                                c.drawCentredString(
-                                    x + box_w / 2,
-                                    start_y - r_i * (box_h + spacing) + box_h / 2 - 0.15 * cm * scale,
-                                    text
-                                )
-                            else:
-                                c.setFillColor(colors.lightgrey)
-                                c.rect(x, start_y - r_i * (box_h + spacing), box_w, box_h, fill=True, stroke=1)
-                        else:
-                            c.setFillColor(colors.lightgrey)
-                            c.rect(x, start_y - r_i * (box_h + spacing), box_w, box_h, fill=True, stroke=1)
-                        x += box_w + spacing
-
-            c.setFont(FONT_NAME, 9)
-            c.setFillColor(colors.black)
-            c.drawString(2 * cm, 2 * cm, f"Toplam Yerleşen: {len(room_students)} öğrenci")
-
-        c.save()
+    def _load_exam_rows(self, exam_ids) -> Dict[int, Dict]:
+        """Sınav başlık bilgileri (ders kodu / adı, saat); önbellekte olmayanlar parça başına tek sorgu."""
+        found, generation = self._cache_lookup(self._exam_rows, exam_ids)
+        missing = sorted(e for e in exam_ids if e not in found)
+        loaded = {}
+        for chunk in iter_chunks(missing):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            self.query_count += 1
+            for r in fetchall(f"""
+                SELECT ex.id, c.code, c.name, t.starts_at, t.ends_at
+                FROM exams ex
+                JOIN courses c ON c.id = ex.course_id
+                JOIN timeslots t ON t.id = ex.timeslot_id
+                WHERE ex.id IN ({placeholders})
+            """, tuple(chunk)):
+                loaded[r["id"]] = r
+        self._cache_store(self._exam_rows, loaded, generation)
+        found.update(loaded)
+        return {e: found[e] for e in exam_ids}
 
-    # -------------------- DATA HELPERS --------------------
     def _load_students_for_exam(self, exam_id: int):
+        self.query_count += 1
         return fetchall("""
             SELECT s.id, s.number, s.name
             FROM students s
@@ -312,30 +498,336 @@ class ExamSeatingService:
             ORDER BY s.number
         """, (exam_id,))
 
+    def _load_students_for_exams(self, exam_ids) -> Dict[int, List[Dict]]:
+        """Birden çok sınavın öğrencileri: parça başına tek IN (...) sorgusu."""
+        by_exam = {e: [] for e in exam_ids}
+        for chunk in iter_chunks(list(exam_ids)):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            self.query_count += 1
+            for r in fetchall(f"""
+                SELECT ex.id AS exam_id, s.id, s.number, s.name
+                FROM exams ex
+                JOIN enrollments e ON e.course_id = ex.course_id
+                JOIN students s ON s.id = e.student_id
+                WHERE ex.id IN ({placeholders})
+                ORDER BY ex.id, s.number
+            """, tuple(chunk)):
+                by_exam[r.pop("exam_id")].append(r)
+        return by_exam
+
     def _load_rooms_for_exam(self, exam_id: int) -> List[Room]:
-        rows = fetchall("""
-            SELECT r.id, r.code, r.num_rows, r.num_cols, r.seat_group, r.capacity
-            FROM exam_rooms er
-            JOIN classrooms r ON r.id = er.classroom_id
-            WHERE er.exam_id = %s
-            ORDER BY r.capacity DESC
-        """, (exam_id,))
-        rooms = []
-        for rr in rows:
-            cols = fetchall("""
-                SELECT col_index, seat_group
-                FROM classroom_columns
-                WHERE classroom_id = %s
-                ORDER BY col_index
-            """, (rr["id"],))
-            col_groups = [c["seat_group"] for c in cols] if cols else [rr["seat_group"]] * rr["num_cols"]
-            rooms.append(Room(
-                id=rr["id"],
-                code=rr["code"],
-                num_rows=rr["num_rows"],
-                num_cols=rr["num_cols"],
-                seat_group=rr["seat_group"],
-                capacity=rr["capacity"],
-                col_groups=col_groups
-            ))
-        return rooms
+        return self._load_rooms_for_exams([exam_id])[exam_id]
+
+    def _load_rooms_for_exams(self, exam_ids) -> Dict[int, List[Room]]:
+        """
+        Sınavların derslik bilgisi ve sütun düzenleri: önbellekte olmayan sınavlar için
+        tek JOIN + tek IN (...) sorgusu (parça başına), derslik sayısından bağımsız.
+        """
+        found, generation = self._cache_lookup(self._rooms_by_exam, exam_ids)
+        missing = sorted({e for e in exam_ids if e not in found})
+        if missing:
+            loaded = self._query_rooms_for_exams(missing)
+            self._cache_store(self._rooms_by_exam, loaded, generation)
+            found.update(loaded)
+        return {e: found[e] for e in exam_ids}
+
+    def _query_rooms_for_exams(self, exam_ids) -> Dict[int, List[Room]]:
+        """Derslik bilgisi ve sütun düzenlerini önbelleğe bakmadan veritabanından okur."""
+        ids = sorted(set(exam_ids))
+        loaded = {e: [] for e in ids}
+        if ids:
+            rows = []
+            for chunk in iter_chunks(ids):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                self.query_count += 1
+                rows.extend(fetchall(f"""
+                    SELECT er.exam_id, r.id, r.code, r.num_rows, r.num_cols, r.seat_group, r.capacity
+                    FROM exam_rooms er
+                    JOIN classrooms r ON r.id = er.classroom_id
+                    WHERE er.exam_id IN ({placeholders})
+                    ORDER BY er.exam_id, r.capacity DESC
+                """, tuple(chunk)))
+
+            col_groups = {}
+            for chunk in iter_chunks(sorted({rr["id"] for rr in rows})):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                self.query_count += 1
+                for c in fetchall(f"""
+                    SELECT classroom_id, col_index, seat_group
+                    FROM classroom_columns
+                    WHERE classroom_id IN ({placeholders})
+                    ORDER BY classroom_id, col_index
+                """, tuple(chunk)):
+                    col_groups.setdefault(c["classroom_id"], []).append(c["seat_group"])
+
+            rooms_by_id = {}  # aynı derslik birden çok sınavda tek Room nesnesi
+            for rr in rows:
+                room = rooms_by_id.get(rr["id"])
+                if room is None:
+                    room = rooms_by_id[rr["id"]] = Room(
+                        id=rr["id"],
+                        code=rr["code"],
+                        num_rows=rr["num_rows"],
+                        num_cols=rr["num_cols"],
+                        seat_group=rr["seat_group"],
+                        capacity=rr["capacity"],
+                        col_groups=col_groups.get(rr["id"]) or [rr["seat_group"]] * rr["num_cols"],
+                    )
+                loaded[rr["exam_id"]].append(room)
+        return loaded
+
+
+# --------------------------------------------------------
+# YERLEŞTİRME (saf hesap; süreç havuzunda da çalışır)
+# --------------------------------------------------------
+def _effective_capacity(room: Room) -> int:
+    # Kayıtlı kapasite şablondaki oturulabilir koltuk sayısını aşamaz
+    return min(room.capacity, room.template.capacity)
+
+
+def _place_students(students: List[Dict], rooms: List[Room]):
+    """
+    Öğrencileri büyükten küçüğe dersliklerin şablon koltuklarına sırayla oturtur.
+    Dönüş: (yerleşimler, uyarılar, hata mesajı veya None). Veritabanına dokunmaz.
+    """
+    warnings = []
+    if not students or not rooms:
+        return [], warnings, "⚠️ Oturma planı oluşturulamadı: Öğrenci veya derslik bulunamadı."
+
+    seats_of = {r.id: _effective_capacity(r) for r in rooms}
+    total_cap = sum(seats_of.values())
+    if total_cap < len(students):
+        return [], warnings, (
+            f"Derslik kapasitesi yetersiz! (Toplam kapasite: {total_cap}, Öğrenci: {len(students)})"
+        )
+
+    placements = []
+    idx = 0
+    for r in sorted(rooms, key=lambda x: seats_of[x.id], reverse=True):
+        room_capacity = seats_of[r.id]
+        available_students = students[idx: idx + room_capacity]
+
+        if not available_students:
+            continue
+
+        # 🔹 Eğer kapasite dolduysa uyarı
+        if len(available_students) < room_capacity and idx + len(available_students) < len(students):
+            remaining = len(students) - (idx + len(available_students))
+            warnings.append(f"{remaining} öğrenci {r.code} dersliğine sığmadı (kapasite dolu).")
+
+        # Öğrenciler şablonun ilk koltuklarına sırayla oturur
+        for s, (row_no, col_no, seat_no) in zip(available_students, r.template.take(len(available_students))):
+            placements.append({
+                "student_id": s["id"],
+                "student_number": s["number"],
+                "student_name": s["name"],
+                "classroom_id": r.id,
+                "room_code": r.code,
+                "row_no": row_no,
+                "col_no": col_no,
+                "seat_no": seat_no,
+            })
+        idx += len(available_students)
+
+        if idx >= len(students):
+            break
+
+    warnings.extend(_neighbour_warnings(placements))
+    return placements, warnings, None
+
+
+def _neighbour_warnings(placements: List[Dict]) -> List[str]:
+    """🔹 Yan yana oturma kontrolü (kayıtlı plan okunurken de uygulanır)."""
+    warnings = []
+    for i in range(1, len(placements)):
+        prev = placements[i - 1]
+        curr = placements[i]
+        if prev["room_code"] == curr["room_code"] and prev["row_no"] == curr["row_no"]:
+            if prev["student_name"].split()[-1] == curr["student_name"].split()[-1]:
+                warnings.append(
+                    f"{prev['student_name']} ve {curr['student_name']} aynı soyadlı öğrenciler yan yana oturdu ({prev['room_code']})."
+                )
+    return warnings
+
+
+def _spawn_pool(workers: int):
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    # Qt thread'leri çalışırken fork güvenli değil; süreçler "spawn" ile başlatılır
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+# --------------------------------------------------------
+# PDF ÇİZİMİ (sayfa işleri süreç havuzunda da çalışır)
+# --------------------------------------------------------
+def _exam_pages(exam: Dict, rooms: List[Room], seating: List[Dict]) -> List[tuple]:
+    """
+    Sınavın sayfa işleri: ("cover", başlık satırı) + derslik başına ("room", Room, koltuklar).
+    Koltuklar {(sıra, sütun, koltuk): "Ad - No"} olarak hazırlanır; süreçlere yalnız metin gider.
+    """
+    pages = [("cover", f"{exam['code']} — {exam['name']} | {exam['starts_at'].strftime('%d.%m.%Y %H:%M')}")]
+    by_room = {}
+    for p in seating:
+        by_room.setdefault(p["room_code"], {})[(p["row_no"], p["col_no"], p["seat_no"])] = \
+            f"{p['student_name']} - {p['student_number']}"
+    for room in rooms:
+        pages.append(("room", room, by_room.get(room.code, {})))
+    return pages
+
+
+def _draw_page(c, font_name: str, page: tuple):
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.units import cm
+    from reportlab.lib import colors
+
+    w, h = landscape(A4)
+    if page[0] == "cover":
+        c.setFont(font_name, 16)
+        c.drawString(2 * cm, h - 2 * cm, "Sınav Oturma Planı (Ders Bazlı)")
+        c.setFont(font_name, 12)
+        c.drawString(2 * cm, h - 2.8 * cm, page[1])
+        return
+
+    _, room, seats = page
+    c.setFont(font_name, 14)
+    c.drawString(2 * cm, h - 2 * cm, f"Derslik: {room.code}")
+    c.setFont(font_name, 10)
+    c.drawString(2 * cm, h - 2.7 * cm,
+                 f"Sıra: {room.num_rows}   Sütun: {room.num_cols}   Kapasite: {room.capacity}")
+    if not seats:
+        c.drawString(2 * cm, h - 3.5 * cm, "⚠️ Bu dersliğe öğrenci atanmadı.")
+        return
+
+    scale = 0.75
+    box_w, box_h = 2.0 * cm * scale, 1.0 * cm * scale
+    spacing = 0.3 * cm * scale
+    group_gap = 2.5 * cm * scale
+    start_x, start_y = 3 * cm, h - 4 * cm
+
+    # Koltuklar plan tablosundaki (sıra, sütun, koltuk) konumlarına çizilir. Kutular renge göre
+    # iki yolda toplanır, metinler yazı boyutuna göre gruplanır: sayfa başına birkaç durum değişikliği
+    empty, filled = c.beginPath(), c.beginPath()
+    texts = {}  # yazı boyutu → [(x, y, metin)]
+    patterns = room.template.patterns
+    for r_i in range(room.num_rows):
+        y = start_y - r_i * (box_h + spacing)
+        x = start_x
+        for g_idx, pattern in enumerate(patterns):
+            if g_idx > 0:
+                x += group_gap
+            for col_idx, val in enumerate(pattern):
+                text = seats.get((r_i + 1, g_idx + 1, col_idx + 1)) if val == 1 else None
+                if text:
+                    filled.rect(x, y, box_w, box_h)
+                    font_size = 7 * scale
+                    if len(text) > 22:
+                        font_size = 6 * scale
+                    if len(text) > 30:
+                        font_size = 5 * scale
+                    texts.setdefault(font_size, []).append(
+                        (x + box_w / 2, y + box_h / 2 - 0.15 * cm * scale, text)
+                    )
+                else:
+                    empty.rect(x, y, box_w, box_h)
+                x += box_w + spacing
+
+    c.setFillColor(colors.lightgrey)
+    c.drawPath(empty, fill=1, stroke=1)
+    c.setFillColor(colors.lightblue)
+    c.drawPath(filled, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    for font_size, items in texts.items():
+        c.setFont(font_name, font_size)
+        for cx, cy, text in items:
+            c.drawCentredString(cx, cy, text)
+
+    c.setFont(font_name, 9)
+    c.drawString(2 * cm, 2 * cm, f"Toplam Yerleşen: {len(seats)} öğrenci")
+
+
+def _render_pages(pages: List[tuple], filename: str, progress_cb=None) -> int:
+    """Sayfa işlerini tek canvas'a çizer; süreç havuzu işi olarak da kullanılır."""
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.pdfgen import canvas
+
+    font_name = register_turkish_font()  # süreç başına bir kez kaydedilir
+    c = canvas.Canvas(filename, pagesize=landscape(A4))
+    for i, page in enumerate(pages):
+        if i:
+            c.showPage()
+        _draw_page(c, font_name, page)
+        if progress_cb:
+            progress_cb("PDF sayfaları", i + 1, len(pages))
+    c.save()
+    return len(pages)
+
+
+def _render_document(pages: List[tuple], filename: str, progress_cb=None, max_workers: int = None) -> Dict:
+    """
+    Sayfaları üretir ve `filename`e yazar. Sayfa çoksa ardışık sayfa grupları ayrı
+    süreçlerde geçici PDF'lere çizilip pypdf ile sırayla birleştirilir; aksi halde
+    (veya havuz başlatılamazsa) aynı süreçte tek canvas'a çizilir.
+    """
+    import time
+
+    started = time.perf_counter()
+    total = len(pages)
+    workers = max_workers or settings.seating_workers or os.cpu_count() or 1
+    workers = min(workers, total // PDF_MIN_CHUNK)
+
+    used = 1
+    if workers > 1 and total >= PDF_POOL_MIN_PAGES:
+        used = _render_parallel(pages, filename, workers, progress_cb)
+    if used == 1:
+        _render_pages(pages, filename, progress_cb)
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "pages": total,
+        "seconds": round(elapsed, 2),
+        "pages_per_sec": round(total / elapsed, 1) if elapsed > 0 else float(total),
+        "workers": used,
+    }
+    print(f"📄 {total} sayfa {elapsed:.2f} sn'de yazıldı "
+          f"({stats['pages_per_sec']} sayfa/sn, {used} süreç): {filename}")
+    return stats
+
+
+def _render_parallel(pages, filename, workers, progress_cb=None) -> int:
+    """Sayfa gruplarını süreçlerde çizip birleştirir; kullanılan süreç sayısını (başarısızsa 1) döner."""
+    import tempfile
+    from pypdf import PdfWriter
+    from concurrent.futures import as_completed
+    from concurrent.futures.process import BrokenProcessPool
+
+    total = len(pages)
+    size = max(PDF_MIN_CHUNK, -(-total // (workers * 2)))
+    chunks = [pages[i:i + size] for i in range(0, total, size)]
+    with tempfile.TemporaryDirectory(prefix="oturma_pdf_") as tmp:
+        parts = [os.path.join(tmp, f"part_{i:04d}.pdf") for i in range(len(chunks))]
+        executor = None
+        try:
+            executor = _spawn_pool(workers)
+            futures = [executor.submit(_render_pages, ch, path) for ch, path in zip(chunks, parts)]
+            done = 0
+            for fut in as_completed(futures):
+                done += fut.result()
+                if progress_cb:
+                    progress_cb("PDF sayfaları", done, total)
+        except (OSError, BrokenProcessPool) as e:
+            print(f"⚠️ PDF süreç havuzu kullanılamadı, sırayla çizilecek: {e}")
+            return 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        if progress_cb:
+            progress_cb("PDF birleştiriliyor", 0, 1)
+        writer = PdfWriter()
+        for path in parts:
+            writer.append(path)
+        with open(filename, "wb") as f:
+            writer.write(f)
+        writer.close()
+    return min(workers, len(chunks))
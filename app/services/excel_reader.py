@@ -0,0 +1,160 @@
+# app/services/excel_reader.py
+"""
+Ders ve öğrenci listesi Excel dosyalarını openpyxl `read_only` modunda satır satır okur.
+Sayfa belleğe tamamen alınmaz; her satır tek geçişte sınıflandırılıp tipli kayıt olarak
+üretilir. Sayfalar DataFrame'e ancak kayıtlar toplandıktan sonra (tek seferde) çevrilir.
+Eski .xls dosyaları openpyxl ile açılamadığından pandas (xlrd) ile okunur.
+"""
+from dataclasses import dataclass
+from typing import Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+COURSE_COLUMNS = ["DERS KODU", "DERSİN ADI", "DERSİ VEREN ÖĞR. ELEMANI", "SINIF", "DERS TÜRÜ"]
+STUDENT_COLUMNS = ["Öğrenci No", "Ad Soyad", "Sınıf", "Ders"]
+
+
+@dataclass(slots=True)
+class CourseRecord:
+    code: str
+    name: str
+    instructor: str
+    class_name: str
+    course_type: str
+
+
+@dataclass(slots=True)
+class StudentRecord:
+    number: str
+    name: str
+    grade: str
+    course_code: str
+
+
+# --------------------------------------------------------
+# HÜCRE / SATIR YARDIMCILARI
+# --------------------------------------------------------
+def _cell_text(value) -> str:
+    """Hücreyi metne çevirir; 2021001.0 gibi tam sayı float'lar '2021001' olur."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _iter_sheet_rows(path: str):
+    """(sayfa adı, Excel satır no, [hücre metinleri]) üretir; tamamen boş satırlar atlanır."""
+    if path.lower().endswith(".xls"):
+        yield from _iter_legacy_sheet_rows(path)
+        return
+
+    import openpyxl  # ağır bağımlılık: ilk dosya okunurken yüklenir
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            # Bazı dışa aktarımlarda boyut bilgisi hatalı → satır sayısını okurken belirle
+            ws.reset_dimensions()
+            for row_no, row in enumerate(ws.iter_rows(values_only=True), start=1):
+                values = [_cell_text(v) for v in row]
+                if any(values):
+                    yield ws.title, row_no, values
+    finally:
+        wb.close()
+
+
+def _iter_legacy_sheet_rows(path: str):
+    """Eski .xls biçimi: sayfalar pandas ile (xlrd motoru) tek seferde okunur."""
+    import pandas as pd
+
+    try:
+        sheets = pd.read_excel(path, sheet_name=None, header=None, dtype=object)
+    except ImportError:
+        raise ValueError(
+            ".xls dosyalarını okumak için 'xlrd' paketi gerekli. "
+            "Paketi kurun veya dosyayı .xlsx olarak kaydedip tekrar deneyin."
+        ) from None
+
+    for title, frame in sheets.items():
+        for row_no, row in enumerate(frame.itertuples(index=False, name=None), start=1):
+            values = [_cell_text(None if pd.isna(v) else v) for v in row]
+            if any(values):
+                yield title, row_no, values
+
+
+# --------------------------------------------------------
+# DERS LİSTESİ
+# --------------------------------------------------------
+def iter_course_records(path: str) -> Iterator[CourseRecord]:
+    """
+    Ders listesi: "N. SINIF" satırı sınıfı, "SEÇMELİ" satırı ders türünü değiştirir,
+    "DERS KODU" başlık satırları atlanır, kodu ve adı olan satırlar ders kaydıdır.
+    """
+    current_class = None
+    current_type = "Zorunlu"
+
+    for sheet, row_no, values in _iter_sheet_rows(path):
+        first_col = values[0].upper()
+
+        # 🔹 Sınıf tespiti
+        if any(f"{n}. SINIF" in first_col for n in ["1", "2", "3", "4"]):
+            current_class = values[0]
+            current_type = "Zorunlu"
+            continue
+
+        # 🔹 Seçmeli tespiti
+        if "SEÇMEL" in first_col or "SEÇİML" in first_col:
+            current_type = "Seçmeli"
+            continue
+
+        # 🔹 "DERS KODU" başlık satırlarını atla
+        if "DERS KODU" in first_col:
+            continue
+
+        # 🔹 Gerçek ders satırları
+        if len(values) >= 3 and values[0] and values[1]:
+            yield CourseRecord(
+                code=values[0],
+                name=values[1],
+                instructor=values[2],
+                class_name=current_class if current_class else "Belirtilmemiş",
+                course_type=current_type,
+            )
+
+
+# --------------------------------------------------------
+# ÖĞRENCİ LİSTESİ
+# --------------------------------------------------------
+def iter_student_records(path: str) -> Iterator[StudentRecord]:
+    """
+    Öğrenci listesi: her sayfanın ilk dolu satırı başlıktır ve STUDENT_COLUMNS'u içermelidir.
+    Eksik sütun veya boş hücre, sayfa ve satır numarasıyla ValueError fırlatır.
+    """
+    header_sheet = None
+    positions = None
+
+    for sheet, row_no, values in _iter_sheet_rows(path):
+        if sheet != header_sheet:
+            header_sheet = sheet
+            missing = [c for c in STUDENT_COLUMNS if c not in values]
+            if missing:
+                raise ValueError(f"{sheet} sayfasında eksik sütun(lar): {', '.join(missing)}")
+            positions = [values.index(c) for c in STUDENT_COLUMNS]
+            continue
+
+        fields = [values[i] if i < len(values) else "" for i in positions]
+        if not all(fields):
+            raise ValueError(f"{sheet} sayfasındaki {row_no}. satırda boş hücre var.")
+        yield StudentRecord(*fields)
+
+
+# --------------------------------------------------------
+# KAYIT → DataFrame (servislerin beklediği sütun adlarıyla)
+# --------------------------------------------------------
+def records_to_frame(records, columns) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.DataFrame([tuple(getattr(r, f) for f in r.__slots__) for r in records], columns=columns)
@@ -0,0 +1,71 @@
+# app/services/room_allocator.py
+
+
+class RoomAllocator:
+    """
+    Bir sınav için boş derslikler arasından en az boş koltuk, eşitlikte en az
+    derslik sayısı bırakan kombinasyonu seçer (sınırlı alt küme toplamı DP).
+
+    Aynı kapasitedeki derslikler birbirinin yerine geçebildiğinden DP derslikler
+    yerine (kapasite, adet) grupları üzerinde kurulur; sonuç da "hangi kapasiteden
+    kaç tane" olarak (grup imzası, ihtiyaç) anahtarıyla önbelleğe alınır. Böylece
+    aynı büyüklükteki sınavlar, boş derslik profili aynıysa DP'yi tekrar çalıştırmaz.
+    """
+
+    def __init__(self):
+        self._memo: dict[tuple, tuple] = {}
+        self.stats = {"calls": 0, "memo_hits": 0}
+
+    def allocate(self, free_rooms: list, needed: int) -> list:
+        """
+        free_rooms: {"id", "code", "capacity"} sözlükleri (kapasiteye göre azalan sırada).
+        Kapasite yetmiyorsa boş liste döner.
+        """
+        self.stats["calls"] += 1
+        needed = max(1, int(needed))  # öğrencisi olmayan sınav da bir derslik ister
+
+        groups: dict[int, list] = {}
+        for r in free_rooms:
+            groups.setdefault(r["capacity"], []).append(r)
+        signature = tuple(sorted(((cap, len(rs)) for cap, rs in groups.items()), reverse=True))
+
+        key = (signature, needed)
+        counts = self._memo.get(key)
+        if counts is None:
+            counts = self._solve(signature, needed)
+            self._memo[key] = counts
+        else:
+            self.stats["memo_hits"] += 1
+
+        assigned = []
+        for cap, k in counts:
+            assigned.extend(groups[cap][:k])
+        return assigned
+
+    @staticmethod
+    def _solve(signature, needed: int) -> tuple:
+        """(kapasite, adet) gruplarından toplamı >= needed olan en küçük toplamı bulur."""
+        if not signature or sum(cap * k for cap, k in signature) < needed:
+            return ()
+
+        # En iyi kombinasyonda her derslik gereklidir → toplam < needed + en büyük kapasite
+        limit = needed + signature[0][0] - 1
+
+        # best[toplam] = (derslik sayısı, ((kapasite, adet), ...))
+        best = {0: (0, ())}
+        for cap, k in signature:
+            nxt = dict(best)
+            for total, (n, picks) in best.items():
+                for j in range(1, k + 1):
+                    t = total + j * cap
+                    if t > limit:
+                        break
+                    cand = n + j
+                    if t not in nxt or cand < nxt[t][0]:
+                        nxt[t] = (cand, picks + ((cap, j),))
+            best = nxt
+
+        for total in range(needed, limit + 1):
+            if total in best:
+                return best[total][1]
+        return ()
@@ -0,0 +1,100 @@
+# app/services/seat_template.py
+"""
+Derslik koltuk şablonu: hangi (sıra, sütun, koltuk) konumlarına öğrenci oturabileceği.
+
+Her sütun bir sıra grubudur (2'li / 3'lü / 4'lü); gruptaki oturulabilir koltuklar
+SEAT_PATTERNS ile belirlenir (ör. 3'lü sırada 1. ve 3. koltuk). Şablon sıra sıra,
+soldan sağa dolaşma sırasında kompakt dizilerde tutulur; oturma planı bu dizilerin
+baştan bir dilimi, PDF çizimi ise aynı desenlerin kendisidir.
+"""
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+# sıra grubu büyüklüğü → koltuk başına oturulabilir mi (1) / boş bırakılır mı (0)
+SEAT_PATTERNS: Dict[int, Tuple[int, ...]] = {
+    2: (1, 0),
+    3: (1, 0, 1),
+    4: (1, 0, 0, 1),
+}
+
+
+def seat_pattern(group_size: int) -> Tuple[int, ...]:
+    return SEAT_PATTERNS.get(group_size, (1,) * group_size)
+
+
+@dataclass(frozen=True, slots=True)
+class SeatTemplate:
+    num_rows: int
+    col_groups: Tuple[int, ...]
+    rows: array    # oturulabilir koltukların sıra numarası (1'den)
+    cols: array    # sütun (sıra grubu) numarası (1'den)
+    seats: array   # grup içindeki koltuk numarası (1'den)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.rows)
+
+    @property
+    def patterns(self) -> Tuple[Tuple[int, ...], ...]:
+        """Sütun başına koltuk deseni (PDF / önizleme çizimi için)."""
+        return tuple(seat_pattern(g) for g in self.col_groups)
+
+    def take(self, count: int):
+        """İlk `count` oturulabilir koltuğun (sıra, sütun, koltuk) üçlüleri."""
+        return zip(self.rows[:count], self.cols[:count], self.seats[:count])
+
+
+def build_template(num_rows: int, col_groups: Sequence[int]) -> SeatTemplate:
+    """Bir sıranın koltuk konumlarını bir kez üretir, diğer sıralar için çoğaltır."""
+    col_groups = tuple(int(g) for g in col_groups)
+    row_cols, row_seats = [], []
+    for col_no, group in enumerate(col_groups, start=1):
+        for seat_no, usable in enumerate(seat_pattern(group), start=1):
+            if usable:
+                row_cols.append(col_no)
+                row_seats.append(seat_no)
+
+    per_row = len(row_cols)
+    rows = array("H", (r for r in range(1, num_rows + 1) for _ in range(per_row)))
+    return SeatTemplate(
+        num_rows=num_rows,
+        col_groups=col_groups,
+        rows=rows,
+        cols=array("H", row_cols * num_rows),
+        seats=array("H", row_seats * num_rows),
+    )
+
+
+# --------------------------------------------------------
+# DERSLİK BAŞINA ÖNBELLEK
+# --------------------------------------------------------
+_templates: Dict[int, SeatTemplate] = {}
+_lock = threading.Lock()
+
+
+def template_for(classroom_id: int, num_rows: int, col_groups: Sequence[int]) -> SeatTemplate:
+    """
+    Dersliğin şablonunu önbellekten döner. Düzen (sıra sayısı / sütun grupları)
+    önbellektekinden farklıysa şablon yeniden üretilir.
+    """
+    key_groups = tuple(int(g) for g in col_groups)
+    with _lock:
+        cached = _templates.get(classroom_id)
+    if cached is not None and cached.num_rows == num_rows and cached.col_groups == key_groups:
+        return cached
+
+    template = build_template(num_rows, key_groups)
+    with _lock:
+        _templates[classroom_id] = template
+    return template
+
+
+def invalidate_template(classroom_id: int = None):
+    """Derslik düzeni değişince çağrılır; id verilmezse tüm şablonlar silinir."""
+    with _lock:
+        if classroom_id is None:
+            _templates.clear()
+        else:
+            _templates.pop(classroom_id, None)
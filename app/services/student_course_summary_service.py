@@ -1,18 +1,29 @@
 # app/services/student_course_summary_service.py
-import mysql.connector
-import os
+import sys
+from app.db import get_conn, tx, iter_chunks
+from app.cache import reference_cache
+
+SUMMARY_COLUMNS = "`Öğrenci No`, `Ad Soyad`, `Sınıf`, `Dersin Kodu`, `Aldığı Ders`, department_id"
+
+# enrollments → özet satırı (öğrenci no, ad, sınıf, ders kodu, ders adı, bölüm)
+_SUMMARY_SELECT = """
+    SELECT DISTINCT
+        s.number,
+        s.name,
+        s.grade_level,
+        c.code,
+        c.name,
+        s.department_id
+    FROM enrollments e
+    JOIN students  s ON e.student_id = s.id
+    JOIN courses   c ON e.course_id  = c.id
+"""
 
 
 class StudentCourseSummaryService:
     @staticmethod
     def _get_conn():
-        return mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "root"),
-            password=os.getenv("DB_PASS", ""),
-            database=os.getenv("DB_NAME", "exam_scheduler"),
-            autocommit=True
-        )
+        return get_conn(autocommit=True)
 
     # --------------------------------------------------------
     # 1️⃣ Öğrenci numarasına göre getir
@@ -80,6 +91,10 @@ class StudentCourseSummaryService:
         """
         Admin tüm bölümlerdeki tüm dersleri görebilir.
         """
+        return reference_cache.get_or_load("summary_courses", None, StudentCourseSummaryService._query_all_courses)
+
+    @staticmethod
+    def _query_all_courses():
         sql = """
             SELECT DISTINCT `Dersin Kodu`, `Aldığı Ders`
             FROM student_course_summary
@@ -98,6 +113,13 @@ class StudentCourseSummaryService:
         """
         Sadece belirli bir departmana ait dersleri listeler.
         """
+        return reference_cache.get_or_load(
+            "summary_courses", department_id,
+            lambda: StudentCourseSummaryService._query_courses_by_department(department_id),
+        )
+
+    @staticmethod
+    def _query_courses_by_department(department_id: int):
         sql = """
             SELECT DISTINCT `Dersin Kodu`, `Aldığı Ders`
             FROM student_course_summary
@@ -108,3 +130,106 @@ class StudentCourseSummaryService:
             cur = conn.cursor(dictionary=True)
             cur.execute(sql, (department_id,))
             return cur.fetchall()
+
+    # --------------------------------------------------------
+    # 5️⃣ Artımlı güncelleme (yükleme ile aynı işlem içinde)
+    # --------------------------------------------------------
+    @staticmethod
+    def refresh_students(cur, student_numbers) -> dict:
+        """
+        Sadece verilen öğrencilerin özet satırlarını enrollments ile eşitler.
+        Eklenen / değişen / kaldırılan (öğrenci, ders) çiftleri için satır yazılır;
+        geri kalan satırlara ve diğer öğrencilere dokunulmaz.
+        `cur` çağıranın işlemine ait imleçtir; commit çağırana aittir.
+        """
+        stats = {"inserted": 0, "deleted": 0, "unchanged": 0}
+        numbers = sorted({str(n) for n in student_numbers})
+
+        for chunk in iter_chunks(numbers):
+            placeholders = ", ".join(["%s"] * len(chunk))
+
+            cur.execute(f"{_SUMMARY_SELECT} WHERE s.number IN ({placeholders})", tuple(chunk))
+            desired = {}
+            for row in cur.fetchall():
+                row = _summary_row(row)
+                desired[(row[0], row[3], row[5])] = row
+
+            cur.execute(f"""
+                SELECT {SUMMARY_COLUMNS}
+                FROM student_course_summary
+                WHERE `Öğrenci No` IN ({placeholders})
+            """, tuple(chunk))
+            current = {}
+            for row in cur.fetchall():
+                row = _summary_row(row)
+                current.setdefault((row[0], row[3], row[5]), []).append(row)
+
+            stale = [
+                key for key, rows in current.items()
+                if len(rows) > 1 or desired.get(key) != rows[0]
+            ]
+            fresh = [row for key, row in desired.items() if key in stale or key not in current]
+
+            if stale:
+                cur.executemany("""
+                    DELETE FROM student_course_summary
+                    WHERE `Öğrenci No` = %s AND `Dersin Kodu` = %s AND department_id = %s
+                """, stale)
+            if fresh:
+                cur.executemany(f"""
+                    INSERT INTO student_course_summary ({SUMMARY_COLUMNS})
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, fresh)
+
+            stats["deleted"] += sum(len(current[k]) for k in stale)
+            stats["inserted"] += len(fresh)
+            stats["unchanged"] += len(current) - len(stale)
+
+        return stats
+
+    # --------------------------------------------------------
+    # 6️⃣ Tam yeniden oluşturma (yedek yol)
+    # --------------------------------------------------------
+    @staticmethod
+    def rebuild(department_id: int = None) -> int:
+        """
+        Özet tabloyu enrollments'tan baştan üretir (bölüm verilirse sadece o bölüm).
+        Tek işlemde çalıştığı için okuyan ekranlar hiçbir zaman boş tablo görmez.
+        """
+        with tx() as conn:
+            cur = conn.cursor()
+            if department_id:
+                cur.execute("DELETE FROM student_course_summary WHERE department_id = %s", (department_id,))
+                cur.execute(f"""
+                    INSERT INTO student_course_summary ({SUMMARY_COLUMNS})
+                    {_SUMMARY_SELECT}
+                    WHERE s.department_id = %s
+                """, (department_id,))
+            else:
+                cur.execute("DELETE FROM student_course_summary")
+                cur.execute(f"INSERT INTO student_course_summary ({SUMMARY_COLUMNS}) {_SUMMARY_SELECT}")
+            count = cur.rowcount
+        reference_cache.invalidate("summary_courses")
+        return count
+
+
+def _summary_row(row) -> tuple:
+    number, name, grade, code, course_name, department_id = row
+    return (
+        str(number),
+        name,
+        int(grade) if grade is not None else None,
+        code,
+        course_name,
+        int(department_id),
+    )
+
+
+# --------------------------------------------------------
+# Komut satırı: python -m app.services.student_course_summary_service [bölüm_id]
+# --------------------------------------------------------
+if __name__ == "__main__":
+    dept = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    count = StudentCourseSummaryService.rebuild(dept)
+    scope = f"{dept} numaralı bölüm" if dept else "tüm bölümler"
+    print(f"[✅] student_course_summary yeniden oluşturuldu ({scope}): {count} satır.")
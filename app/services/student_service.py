@@ -1,126 +1,193 @@
-import mysql.connector
-import os
-import re
+from dataclasses import dataclass, field
+import time
+from typing import TYPE_CHECKING
+from app.db import tx, iter_chunks
+from app.cache import reference_cache
+from app.services.student_course_summary_service import StudentCourseSummaryService
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class StudentImportResult:
+    """Toplu öğrenci yüklemesinin özeti."""
+    students: int = 0                 # eklenen/güncellenen tekil öğrenci
+    enrollments: int = 0              # gönderilen tekil (öğrenci, ders) kaydı
+    skipped_rows: int = 0             # öğrenci no / ad / ders kodu eksik satırlar
+    unknown_courses: list = field(default_factory=list)  # bölümde bulunmayan ders kodları
+    summary: dict = field(default_factory=dict)          # özet tablo: eklenen/silinen/değişmeyen
+    timings: dict = field(default_factory=dict)          # aşama -> saniye
 
 
 class StudentService:
+    # -------------------------------------------------------------------
+    # Excel satırlarını tekilleştirilmiş, tipli tabloya çevirme
+    # -------------------------------------------------------------------
     @staticmethod
-    def _get_conn():
-        return mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "root"),
-            password=os.getenv("DB_PASS", ""),
-            database=os.getenv("DB_NAME", "exam_scheduler"),
-            autocommit=True
+    def _normalize(df) -> "pd.DataFrame":
+        import pandas as pd  # ağır bağımlılık: yalnızca yükleme sırasında
+
+        def col(*names):
+            for n in names:
+                if n in df.columns:
+                    s = df[n]
+                    # Boş hücre olan sayısal sütunlar float okunur → 2021001.0 yerine 2021001
+                    if pd.api.types.is_float_dtype(s):
+                        s = pd.Series(
+                            [v if pd.isna(v) or not v.is_integer() else int(v) for v in s],
+                            index=s.index, dtype=object,
+                        )
+                    return s.fillna("").astype(str).str.strip()
+            return pd.Series("", index=df.index)
+
+        frame = pd.DataFrame({
+            "number": col("Öğrenci No", "OGRENCI NO"),
+            "name":   col("Ad Soyad",   "AD SOYAD"),
+            "grade":  col("Sınıf",      "SINIF"),
+            "code":   col("Ders",       "DERS"),
+        })
+
+        grade = pd.to_numeric(frame["grade"].str.extract(r"(\d+)", expand=False), errors="coerce")
+        frame["grade"] = pd.Series(
+            [int(g) if pd.notna(g) else None for g in grade], index=frame.index, dtype=object
         )
+        return frame
 
     @staticmethod
-    def bulk_insert_from_excel(department_id: int, df):
-        added_students = 0
-        added_enrollments = 0
+    def _resolve_ids(cur, sql_prefix, keys, params=()):
+        """`... IN (...)` sorgusunu parça parça çalıştırıp {anahtar: id} döner."""
+        ids = {}
+        for chunk in iter_chunks(keys):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cur.execute(f"{sql_prefix} IN ({placeholders})", (*params, *chunk))
+            for row_id, key in cur.fetchall():
+                ids[key] = row_id
+        return ids
+
+    # -------------------------------------------------------------------
+    # Excel'den gelen öğrenci / ders kaydı listesini toplu yükleme
+    # -------------------------------------------------------------------
+    @staticmethod
+    def bulk_insert_from_excel(department_id: int, df, progress_cb=None) -> StudentImportResult:
+        """
+        Öğrenci listesini tek işlemde (transaction) yükler.
+        Öğrenciler ve ders kodları önce pandas ile tekilleştirilir, id'ler IN (...) ile
+        toplu çözülür, öğrenci ve ders kayıtları parça parça executemany ile yazılır.
+        progress_cb(aşama, yapılan, toplam) her parçadan sonra çağrılır.
+        """
+        import pandas as pd
+
+        result = StudentImportResult()
 
         try:
             department_id = int(department_id)
         except (ValueError, TypeError):
             department_id = 0
 
-        with StudentService._get_conn() as conn:
+        def report(phase, done, total):
+            if progress_cb:
+                progress_cb(phase, done, total)
+
+        started = phase_start = time.perf_counter()
+
+        def lap(phase):
+            nonlocal phase_start
+            now = time.perf_counter()
+            result.timings[phase] = round(now - phase_start, 3)
+            phase_start = now
+
+        # --- 1️⃣ Hazırlık: normalize + tekilleştir ---
+        frame = StudentService._normalize(df)
+        valid = (frame["number"] != "") & (frame["name"] != "") & (frame["code"] != "")
+        result.skipped_rows = int((~valid).sum())
+        frame = frame[valid]
+
+        # Aynı öğrenci birden fazla satırda → son satırdaki ad/sınıf geçerli (eski davranış)
+        students = frame.drop_duplicates("number", keep="last")
+        student_rows = list(zip(
+            students["number"], students["name"], students["grade"], [department_id] * len(students)
+        ))
+        codes = frame["code"].unique().tolist()
+        lap("hazırlık")
+
+        with tx() as conn:
             cur = conn.cursor()
 
-            for _, row in df.iterrows():
-                try:
-                    ogr_no    = str(row.get("Öğrenci No", row.get("OGRENCI NO", ""))).strip()
-                    ad_soyad  = str(row.get("Ad Soyad",   row.get("AD SOYAD",   ""))).strip()
-                    sinif_raw = str(row.get("Sınıf",      row.get("SINIF",      ""))).strip()
-                    ders_kodu = str(row.get("Ders",       row.get("DERS",       ""))).strip()
-
-                    if not ogr_no or not ad_soyad or not ders_kodu:
-                        continue
-
-                    m = re.search(r'\d+', sinif_raw or "")
-                    sinif = int(m.group()) if m else None
-
-                    # öğrenci ekle/güncelle
-                    cur.execute("""
-                        INSERT INTO students (number, name, grade_level, department_id)
-                        VALUES (%s, %s, %s, %s)
-                        ON DUPLICATE KEY UPDATE
-                            name = VALUES(name),
-                            grade_level = VALUES(grade_level),
-                            department_id = VALUES(department_id)
-                    """, (ogr_no, ad_soyad, sinif, department_id))
-                    added_students += 1
-
-                    # ders id
-                    cur.execute("""
-                        SELECT id FROM courses
-                        WHERE department_id = %s AND code = %s
-                    """, (department_id, ders_kodu))
-                    course = cur.fetchone()
-                    if not course:
-                        continue
-                    course_id = course[0]
-
-                    # öğrenci id
-                    cur.execute("SELECT id FROM students WHERE number = %s", (ogr_no,))
-                    student = cur.fetchone()
-                    if not student:
-                        continue
-                    student_id = student[0]
-
-                    # enrollments'a ekle (uniq index varsa kopya zaten düşer)
-                    cur.execute("""
-                        INSERT IGNORE INTO enrollments (student_id, course_id)
-                        VALUES (%s, %s)
-                    """, (student_id, course_id))
-                    added_enrollments += 1
-
-                except Exception as e:
-                    print(f"[HATA] Satır işlenemedi ({ogr_no}): {e}")
-                    continue
-
-            # --- özet tablo öncesi: enrollments'ta varsa kopyaları temizle ---
+            # --- 2️⃣ Ders id'leri (tek IN sorgusu) ---
+            # MySQL kodları büyük/küçük harf duyarsız eşler → sözlük anahtarları da büyük harfe çevrilir
+            course_ids = {
+                str(code).strip().upper(): course_id
+                for code, course_id in StudentService._resolve_ids(
+                    cur, "SELECT id, code FROM courses WHERE department_id = %s AND code",
+                    codes, (department_id,)
+                ).items()
+            }
+            result.unknown_courses = sorted(c for c in codes if c.upper() not in course_ids)
+            lap("ders eşleme")
+
+            # --- 3️⃣ Öğrenciler: toplu upsert ---
+            done = 0
+            for chunk in iter_chunks(student_rows):
+                cur.executemany("""
+                    INSERT INTO students (number, name, grade_level, department_id)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                        name = VALUES(name),
+                        grade_level = VALUES(grade_level),
+                        department_id = VALUES(department_id)
+                """, chunk)
+                done += len(chunk)
+                report("Öğrenciler", done, len(student_rows))
+            result.students = len(student_rows)
+
+            student_ids = StudentService._resolve_ids(
+                cur, "SELECT id, number FROM students WHERE number", students["number"].tolist()
+            )
+            lap("öğrenciler")
+
+            # --- 4️⃣ Ders kayıtları ---
+            pairs = pd.DataFrame({
+                "student_id": frame["number"].map(student_ids),
+                "course_id": frame["code"].str.upper().map(course_ids),
+            }).dropna().drop_duplicates()
+            enrollment_rows = [(int(s), int(c)) for s, c in zip(pairs["student_id"], pairs["course_id"])]
+
+            done = 0
+            for chunk in iter_chunks(enrollment_rows):
+                # uq_enrollment (migrations/001) kopyaları engeller → tablo genelinde temizlik gerekmez
+                cur.executemany("""
+                    INSERT IGNORE INTO enrollments (student_id, course_id)
+                    VALUES (%s, %s)
+                """, chunk)
+                done += len(chunk)
+                report("Ders kayıtları", done, len(enrollment_rows))
+            result.enrollments = len(enrollment_rows)
+            lap("ders kayıtları")
+
+            # --- 📘 Özet tablo: sadece bu yüklemedeki öğrencilerin satırları eşitlenir ---
+            report("Özet tablo", 0, 1)
+            # Özet yenileme kendi savepoint'inde: yarıda kalırsa (DELETE yapılmış, INSERT
+            # yapılmamış) yalnız özet değişiklikleri geri alınır, yükleme yine commit edilir
+            cur.execute("SAVEPOINT summary_refresh")
             try:
-                cur.execute("""
-                    DELETE e1
-                    FROM enrollments e1
-                    JOIN enrollments e2
-                      ON e1.student_id = e2.student_id
-                     AND e1.course_id  = e2.course_id
-                     AND e1.id > e2.id
-                """)
-            except Exception as e:
-                print(f"[UYARI] enrollments dedupe başarısız: {e}")
-
-            # --- 📘 ÖNEMLİ: Artık sadece o bölüme ait kayıtlar silinecek ---
-            try:
-                print(f"[INFO] {added_students} öğrenci işlendi, özet tablo güncelleniyor...")
-
-                # 🔥 TRUNCATE yerine sadece o departmanın verilerini temizle
-                cur.execute("DELETE FROM `student_course_summary` WHERE department_id = %s;", (department_id,))
-
-                # 🔥 Yeni kayıtlar department_id ile ekleniyor
-                cur.execute("""
-                    INSERT INTO `student_course_summary`
-                        (`Öğrenci No`, `Ad Soyad`, `Sınıf`, `Dersin Kodu`, `Aldığı Ders`, department_id)
-                    SELECT DISTINCT
-                        s.number,
-                        s.name,
-                        s.grade_level,
-                        c.code,
-                        c.name,
-                        s.department_id
-                    FROM enrollments e
-                    JOIN students  s ON e.student_id = s.id
-                    JOIN courses   c ON e.course_id  = c.id
-                    WHERE s.department_id = %s
-                    ORDER BY s.number, c.code;
-                """, (department_id,))
-
-                print("[✅] student_course_summary başarıyla güncellendi (bölüm bazlı).")
+                print(f"[INFO] {result.students} öğrenci işlendi, özet tablo güncelleniyor...")
+                result.summary = StudentCourseSummaryService.refresh_students(cur, student_ids.keys())
+                cur.execute("RELEASE SAVEPOINT summary_refresh")
+                print(f"[✅] student_course_summary güncellendi: {result.summary}")
 
             except Exception as e:
-                print(f"[UYARI] student_course_summary güncellenemedi: {e}")
-
-        print(f"[ÖZET] {added_students} öğrenci işlendi, {added_enrollments} ders kaydı eklendi.")
-        return added_students, added_enrollments
+                cur.execute("ROLLBACK TO SAVEPOINT summary_refresh")
+                print(f"[UYARI] student_course_summary güncellenemedi, özet değişiklikleri geri alındı: {e} "
+                      f"(tam yenileme: python -m app.services.student_course_summary_service {department_id})")
+            report("Özet tablo", 1, 1)
+            lap("özet tablo")
+
+        # Ders listesi ekranları özet tablodan okur
+        reference_cache.invalidate("summary_courses", department_id)
+        result.timings["toplam"] = round(time.perf_counter() - started, 3)
+        if result.unknown_courses:
+            print(f"[UYARI] Bölümde bulunmayan ders kodları atlandı: {', '.join(result.unknown_courses)}")
+        print(f"[ÖZET] {result.students} öğrenci işlendi, {result.enrollments} ders kaydı eklendi. "
+              f"Süreler: {result.timings}")
+        return result
@@ -0,0 +1,82 @@
+# app/startup_budget.py
+"""
+Giriş penceresinin import zinciri için açılış süresi bütçesi.
+
+    python -m app.startup_budget                 # varsayılan bütçe
+    python -m app.startup_budget --budget-ms 200
+
+`app.ui.main_window` ayrı bir süreçte `python -X importtime` ile içe aktarılır.
+Toplam süre bütçeyi aşarsa veya ağır bağımlılıklardan biri (pandas, openpyxl,
+reportlab...) zincire girerse çıkış kodu 1 olur; CI / pre-commit adımı olarak kullanılabilir.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+TARGET_MODULE = "app.ui.main_window"
+DEFAULT_BUDGET_MS = int(os.getenv("STARTUP_BUDGET_MS", "300"))
+
+# Giriş ekranı açılırken yüklenmemesi gereken paketler (ilk kullanımda yüklenirler)
+DEFERRED_PACKAGES = ("pandas", "numpy", "openpyxl", "reportlab")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_imports(module: str = TARGET_MODULE, runs: int = 3):
+    """
+    Modülü `-X importtime` ile `runs` kez içe aktarır; en hızlı çalıştırmanın
+    (modül adı, kendi süresi µs, kümülatif süre µs) satırlarını döner.
+    """
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True,
+            env={**os.environ, "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen")},
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{module} içe aktarılamadı:\n{proc.stderr[-2000:]}")
+
+        rows = []
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+
+        total = next((cum for name, _, cum in rows if name == module), 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    return best[1]
+
+
+def check(budget_ms: int = DEFAULT_BUDGET_MS, module: str = TARGET_MODULE) -> bool:
+    rows = measure_imports(module)
+    total_ms = next((cum for name, _, cum in rows if name == module), 0) / 1000
+    loaded = {name for name, _, _ in rows}
+    leaked = sorted(p for p in DEFERRED_PACKAGES if p in loaded)
+
+    print(f"📦 {module} import süresi: {total_ms:.1f} ms (bütçe {budget_ms} ms)")
+    print("🔹 En pahalı modüller (kendi süresi):")
+    for name, self_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:10]:
+        print(f"   {self_us / 1000:7.1f} ms  {name}")
+
+    ok = True
+    if total_ms > budget_ms:
+        print(f"❌ Bütçe aşıldı: {total_ms:.1f} ms > {budget_ms} ms")
+        ok = False
+    if leaked:
+        print(f"❌ Açılışta yüklenmemesi gereken paketler: {', '.join(leaked)}")
+        ok = False
+    if ok:
+        print("✅ Açılış bütçesi içinde.")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Giriş penceresi import süresi bütçesi")
+    parser.add_argument("--budget-ms", type=int, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--module", default=TARGET_MODULE)
+    args = parser.parse_args()
+    sys.exit(0 if check(args.budget_ms, args.module) else 1)
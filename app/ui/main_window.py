@@ -1,15 +1,6 @@
 from PyQt5 import QtWidgets, QtCore
 from app.ui.pages.login_page import LoginPage
 from app.ui.pages.dashboard_page import DashboardPage
-from app.ui.pages.classroom_page import ClassroomPage
-from app.ui.pages.course_upload_page import CourseUploadPage
-from app.ui.pages.student_upload_page import StudentUploadPage
-from app.ui.pages.student_list_page import StudentListPage
-from app.ui.pages.course_list_page import CourseListPage
-from app.ui.pages.exam_scheduler_page import ExamSchedulerPage
-from app.ui.pages.exam_seating_page import ExamSeatingPage  # ✅ Oturma planı sayfası
-from app.ui.pages.user_list_page import UserListPage         # ✅ Yeni kullanıcı listesi sayfası
-from app.ui.pages.coordinator_add_page import CoordinatorAddPage  # ✅ Yeni koordinatör ekleme sayfası
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -36,6 +27,19 @@ class MainWindow(QtWidgets.QMainWindow):
         self.user_list_page = None
         self.coord_add_page = None  # ✅ Koordinatör ekleme sayfası eklendi
 
+        # Sayfa adı → (öznitelik, kurucu). Alt sayfalar ilk açıldıklarında oluşturulur.
+        self._page_registry = {
+            "derslik": ("classroom_page", self._build_classroom_page),
+            "ders": ("course_upload_page", self._build_course_upload_page),
+            "ogrenci": ("student_upload_page", self._build_student_upload_page),
+            "ogrenci_listesi": ("student_list_page", self._build_student_list_page),
+            "ders_listesi": ("course_list_page", self._build_course_list_page),
+            "exam": ("exam_scheduler_page", self._build_exam_scheduler_page),
+            "seating": ("exam_seating_page", self._build_exam_seating_page),
+            "user_list": ("user_list_page", self._build_user_list_page),     # ✅ Kayıtlı kullanıcılar
+            "coord_add": ("coord_add_page", self._build_coord_add_page),     # ✅ Koordinatör ekleme
+        }
+
         # Login sayfasını stack'e ekle
         self.stack.addWidget(self.login_page)
         self.stack.setCurrentWidget(self.login_page)
@@ -44,7 +48,7 @@ class MainWindow(QtWidgets.QMainWindow):
     # GİRİŞ BAŞARILI OLUNCA
     # ========================================================
     def on_login_success(self, user):
-        """Giriş başarılı olduğunda kullanıcıya ait tüm sayfaları hazırla"""
+        """Giriş başarılı olduğunda yalnızca dashboard'u hazırla; alt sayfalar ilk açılışta kurulur"""
         self.user = user
 
         # === DASHBOARD ===
@@ -55,65 +59,87 @@ class MainWindow(QtWidgets.QMainWindow):
         self.dashboard_page.set_user(user)
         self.stack.addWidget(self.dashboard_page)
 
-        # === ALT SAYFALAR ===
-        self.classroom_page = ClassroomPage(user, self.go_back_to_dashboard)
-        self.classroom_page.classroom_added.connect(self.dashboard_page._update_accessibility)  # ✅ Derslik sinyali
-
-        self.course_upload_page = CourseUploadPage(user, self.go_back_to_dashboard)
-        self.course_upload_page.courses_uploaded.connect(self.dashboard_page._update_accessibility)   # ✅ Ders sinyali
-
-        self.student_upload_page = StudentUploadPage(user, self.go_back_to_dashboard)
-        self.student_upload_page.students_uploaded.connect(self.dashboard_page._update_accessibility) # ✅ Öğrenci sinyali
-
-        self.student_list_page = StudentListPage(user, self.go_back_to_dashboard)
-        self.course_list_page = CourseListPage(user, self.go_back_to_dashboard)
-        self.exam_scheduler_page = ExamSchedulerPage(user, self.go_back_to_dashboard)
-        self.exam_seating_page = ExamSeatingPage(user, self.go_back_to_dashboard)
-        self.user_list_page = UserListPage(self.go_back_to_dashboard)     # ✅ Kayıtlı kullanıcılar
-        self.coord_add_page = CoordinatorAddPage(self.go_back_to_dashboard, main_window=self)  # ✅ Ana pencere referansı
-
-        # Hepsini stack’e ekle
-        for page in [
-            self.classroom_page,
-            self.course_upload_page,
-            self.student_upload_page,
-            self.student_list_page,
-            self.course_list_page,
-            self.exam_scheduler_page,
-            self.exam_seating_page,
-            self.user_list_page,
-            self.coord_add_page
-        ]:
-            self.stack.addWidget(page)
-
         # Ana sayfaya yönlendir
         self.stack.setCurrentWidget(self.dashboard_page)
 
+    # ========================================================
+    # SAYFA KURUCULARI (ilk gezinmede çağrılır)
+    # ========================================================
+    def _build_classroom_page(self):
+        from app.ui.pages.classroom_page import ClassroomPage
+        page = ClassroomPage(self.user, self.go_back_to_dashboard)
+        page.classroom_added.connect(self.dashboard_page.invalidate_readiness)  # ✅ Derslik sinyali
+        return page
+
+    def _build_course_upload_page(self):
+        from app.ui.pages.course_upload_page import CourseUploadPage
+        page = CourseUploadPage(self.user, self.go_back_to_dashboard)
+        page.courses_uploaded.connect(self.dashboard_page.invalidate_readiness)   # ✅ Ders sinyali
+        return page
+
+    def _build_student_upload_page(self):
+        from app.ui.pages.student_upload_page import StudentUploadPage
+        page = StudentUploadPage(self.user, self.go_back_to_dashboard)
+        page.students_uploaded.connect(self.dashboard_page.invalidate_readiness)  # ✅ Öğrenci sinyali
+        return page
+
+    def _build_student_list_page(self):
+        from app.ui.pages.student_list_page import StudentListPage
+        return StudentListPage(self.user, self.go_back_to_dashboard)
+
+    def _build_course_list_page(self):
+        from app.ui.pages.course_list_page import CourseListPage
+        return CourseListPage(self.user, self.go_back_to_dashboard)
+
+    def _build_exam_scheduler_page(self):
+        from app.ui.pages.exam_scheduler_page import ExamSchedulerPage
+        page = ExamSchedulerPage(self.user, self.go_back_to_dashboard)
+        page.schedule_generated.connect(self.dashboard_page.invalidate_readiness)  # ✅ Sınav sayısı değişti
+        return page
+
+    def _build_exam_seating_page(self):
+        from app.ui.pages.exam_seating_page import ExamSeatingPage  # ✅ Oturma planı sayfası
+        return ExamSeatingPage(self.user, self.go_back_to_dashboard)
+
+    def _build_user_list_page(self):
+        from app.ui.pages.user_list_page import UserListPage
+        return UserListPage(self.go_back_to_dashboard)
+
+    def _build_coord_add_page(self):
+        from app.ui.pages.coordinator_add_page import CoordinatorAddPage
+        return CoordinatorAddPage(self.go_back_to_dashboard, main_window=self)  # ✅ Ana pencere referansı
+
     # ========================================================
     # SAYFA GEÇİŞLERİ
     # ========================================================
     def on_navigate(self, page_name: str):
-        """Dashboard'dan diğer sayfalara geçiş kontrolü"""
-        mapping = {
-            "derslik": self.classroom_page,
-            "ders": self.course_upload_page,
-            "ogrenci": self.student_upload_page,
-            "ogrenci_listesi": self.student_list_page,
-            "ders_listesi": self.course_list_page,
-            "exam": self.exam_scheduler_page,
-            "seating": self.exam_seating_page,
-            "user_list": self.user_list_page,     # ✅ Kayıtlı kullanıcılar
-            "coord_add": self.coord_add_page,     # ✅ Koordinatör ekleme
-        }
-
-        if page_name in mapping and mapping[page_name]:
-            self.stack.setCurrentWidget(mapping[page_name])
-        else:
+        """Dashboard'dan diğer sayfalara geçiş; sayfa yoksa ilk seferde oluşturulur"""
+        entry = self._page_registry.get(page_name)
+        if not entry:
             QtWidgets.QMessageBox.information(
                 self,
                 "Henüz Eklenmedi",
                 f"'{page_name}' sayfası yakında eklenecek."
             )
+            return
+
+        attr, build = entry
+        page = getattr(self, attr)
+        if page is None:
+            page = build()
+            setattr(self, attr, page)
+            self.stack.addWidget(page)
+        self.stack.setCurrentWidget(page)
+
+    def _destroy_session_pages(self):
+        """Oturuma ait tüm sayfaları stack'ten çıkarıp siler (arka plan işleri de kopar)."""
+        for attr in ["dashboard_page"] + [a for a, _ in self._page_registry.values()]:
+            page = getattr(self, attr)
+            if page is None:
+                continue
+            self.stack.removeWidget(page)
+            page.deleteLater()
+            setattr(self, attr, None)
 
     # ========================================================
     # GERİ DÖNÜŞ
@@ -138,3 +164,4 @@ class MainWindow(QtWidgets.QMainWindow):
         if confirm == QtWidgets.QMessageBox.Yes:
             self.user = None
             self.stack.setCurrentWidget(self.login_page)
+            self._destroy_session_pages()
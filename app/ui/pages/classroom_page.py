@@ -1,6 +1,8 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 from app.services.classroom_service import ClassroomService
 from app.repositories.departments import list_all as list_departments
+from app.ui.task_runner import run_task
+from app.ui.table_model import RowTableModel, bind_view
 
 
 class ClassroomPage(QtWidgets.QWidget):
@@ -11,6 +13,7 @@ class ClassroomPage(QtWidgets.QWidget):
         self.user = user
         self.go_back = go_back
         self.service = ClassroomService()
+        self._load_task = None
         self.setup_ui()
 
     # --------------------------------------------------------
@@ -125,17 +128,20 @@ class ClassroomPage(QtWidgets.QWidget):
         # TABLO
         table_box = QtWidgets.QGroupBox("📋 Kayıtlı Derslikler")
         table_layout = QtWidgets.QVBoxLayout(table_box)
-        self.table = QtWidgets.QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels(
-            ["ID", "Bölüm Adı", "Kod", "Ad", "Satır", "Sütun", "Sıra Yapısı", "Kapasite"]
+        self.table = QtWidgets.QTableView()
+        self.model = RowTableModel(
+            ["ID", "Bölüm Adı", "Kod", "Ad", "Satır", "Sütun", "Sıra Yapısı", "Kapasite"],
+            keys=["id", "department_name", "code", "name", "num_rows", "num_cols", "seat_group", "capacity"],
         )
+        self.proxy = bind_view(self.table, self.model)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
         self.table.setColumnHidden(0, True)
         self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         self.table.setAlternatingRowColors(True)
         self.table.setMinimumHeight(400)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 alternate-background-color: #f5f8fc;
                 border: 1px solid #d0d7de;
@@ -149,7 +155,7 @@ class ClassroomPage(QtWidgets.QWidget):
                 padding: 5px;
                 border: none;
             }
-            QTableWidget::item:selected { background-color: #d7ebff; }
+            QTableView::item:selected { background-color: #d7ebff; }
         """)
         table_layout.addWidget(self.table)
         layout.addWidget(table_box)
@@ -170,7 +176,7 @@ class ClassroomPage(QtWidgets.QWidget):
         self.btn_delete.clicked.connect(self.delete_classroom)
         self.btn_search.clicked.connect(self.search_classroom)
         self.btn_preview.clicked.connect(self.show_preview)
-        self.table.itemSelectionChanged.connect(self.auto_fill_fields)
+        self.table.selectionModel().selectionChanged.connect(self.auto_fill_fields)
 
         self.load_classrooms()
 
@@ -191,6 +197,29 @@ class ClassroomPage(QtWidgets.QWidget):
         """)
         return b
 
+    # --------------------------------------------------------
+    # ARKA PLAN İŞLERİ
+    # --------------------------------------------------------
+    def _set_busy(self, busy):
+        for b in [self.btn_add, self.btn_update, self.btn_delete, self.btn_search]:
+            b.setEnabled(not busy)
+
+    def _run_write(self, fn, *args, done_title, done_message):
+        """Ekle/güncelle/sil işini arka planda çalıştırır, bitince listeyi yeniler."""
+        self._set_busy(True)
+
+        def done(_):
+            QtWidgets.QMessageBox.information(self, done_title, done_message)
+            self.load_classrooms()
+            self.classroom_added.emit()
+
+        run_task(
+            fn, *args, owner=self,
+            on_result=done,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", e),
+            on_finished=lambda: self._set_busy(False),
+        )
+
     # --------------------------------------------------------
     # EKLE / GÜNCELLE / SİL
     # --------------------------------------------------------
@@ -225,20 +254,20 @@ class ClassroomPage(QtWidgets.QWidget):
                 else self.user["department_id"]
             )
 
-            self.service.create_with_department(department_id, dept_name, code, name, rows, cols, group)
-            QtWidgets.QMessageBox.information(self, "Başarılı", "Derslik eklendi (kapasite otomatik hesaplandı).")
-            self.load_classrooms()
-            self.classroom_added.emit()
+            self._run_write(
+                self.service.create_with_department, department_id, dept_name, code, name, rows, cols, group,
+                done_title="Başarılı", done_message="Derslik eklendi (kapasite otomatik hesaplandı).",
+            )
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Hata", str(e))
 
     def update_classroom(self):
-        row = self.table.currentRow()
-        if row < 0:
+        room = self._selected_room()
+        if room is None:
             QtWidgets.QMessageBox.warning(self, "Seçim", "Bir satır seçmelisin.")
             return
         try:
-            classroom_id = int(self.table.item(row, 0).text())
+            classroom_id = int(room["id"])
             name = self.name_input.text().strip()
             rows = self.rows_input.value()
             cols = self.cols_input.value()
@@ -263,10 +292,10 @@ class ClassroomPage(QtWidgets.QWidget):
             if confirm == QtWidgets.QMessageBox.No:
                 return
 
-            self.service.update_by_id(classroom_id, name, rows, cols, group)
-            QtWidgets.QMessageBox.information(self, "Başarılı", "Derslik güncellendi.")
-            self.load_classrooms()
-            self.classroom_added.emit()
+            self._run_write(
+                self.service.update_by_id, classroom_id, name, rows, cols, group,
+                done_title="Başarılı", done_message="Derslik güncellendi.",
+            )
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Hata", str(e))
 
@@ -274,12 +303,12 @@ class ClassroomPage(QtWidgets.QWidget):
     # DERSLİK SİLME, ARAMA, TABLO, ÖNİZLEME — (KISALTILMADAN AYNEN KORUNDU)
     # --------------------------------------------------------
     def delete_classroom(self):
-        row = self.table.currentRow()
-        if row < 0:
+        room = self._selected_room()
+        if room is None:
             QtWidgets.QMessageBox.warning(self, "Seçim", "Bir satır seçmelisin.")
             return
 
-        name = self.table.item(row, 3).text()
+        name = room["name"]
         confirm = QtWidgets.QMessageBox.question(
             self, "Silme Onayı", f"'{name}' adlı dersliği silmek istediğine emin misin?",
             QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
@@ -288,11 +317,11 @@ class ClassroomPage(QtWidgets.QWidget):
             return
 
         try:
-            classroom_id = int(self.table.item(row, 0).text())
-            self.service.delete_by_id(classroom_id)
-            QtWidgets.QMessageBox.information(self, "Silindi", f"{name} adlı derslik silindi.")
-            self.load_classrooms()
-            self.classroom_added.emit()
+            classroom_id = int(room["id"])
+            self._run_write(
+                self.service.delete_by_id, classroom_id,
+                done_title="Silindi", done_message=f"{name} adlı derslik silindi.",
+            )
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Hata", str(e))
 
@@ -300,68 +329,73 @@ class ClassroomPage(QtWidgets.QWidget):
         keyword, ok = QtWidgets.QInputDialog.getText(self, "Derslik Ara", "Derslik Kodu (ör: C101):")
         if not ok or not keyword.strip():
             return
-        try:
-            keyword = keyword.strip()
-            if self.user["role"].upper() == "ADMIN":
-                results = self.service.search_global(keyword)
-            else:
-                results = self.service.search(self.user["department_id"], keyword)
+        keyword = keyword.strip()
+        if self.user["role"].upper() == "ADMIN":
+            fn, args = self.service.search_global, (keyword,)
+        else:
+            fn, args = self.service.search, (self.user["department_id"], keyword)
+        run_task(
+            fn, *args, owner=self,
+            on_result=self._show_search_results,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", e),
+        )
 
-            if not results:
-                QtWidgets.QMessageBox.information(self, "Sonuç", "Eşleşen derslik bulunamadı.")
-                return
+    def _show_search_results(self, results):
+        if not results:
+            QtWidgets.QMessageBox.information(self, "Sonuç", "Eşleşen derslik bulunamadı.")
+            return
 
-            self.fill_table(results)
+        self.fill_table(results)
 
-            data = results[0]
-            self.dept_name.setText(data["department_name"])
-            self.code_input.setText(data["code"])
-            self.name_input.setText(data["name"])
-            self.rows_input.setValue(int(data["num_rows"]))
-            self.cols_input.setValue(int(data["num_cols"]))
-            self.group_combo.setCurrentText(str(data["seat_group"]))
-            self.show_preview()
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", str(e))
+        data = results[0]
+        self.dept_name.setText(data["department_name"])
+        self.code_input.setText(data["code"])
+        self.name_input.setText(data["name"])
+        self.rows_input.setValue(int(data["num_rows"]))
+        self.cols_input.setValue(int(data["num_cols"]))
+        self.group_combo.setCurrentText(str(data["seat_group"]))
+        self.show_preview()
 
     def load_classrooms(self):
-        try:
-            if self.user["role"].upper() == "ADMIN":
-                selected_dept = None
-                if hasattr(self, "filter_combo"):
-                    selected_dept = self.filter_combo.currentData()
-                rooms = (
-                    self.service.list_by_department(selected_dept)
-                    if selected_dept else self.service.list_all()
-                )
+        if self.user["role"].upper() == "ADMIN":
+            selected_dept = None
+            if hasattr(self, "filter_combo"):
+                selected_dept = self.filter_combo.currentData()
+            if selected_dept:
+                fn, args = self.service.list_by_department, (selected_dept,)
             else:
-                rooms = self.service.list_by_department(self.user["department_id"])
-            self.fill_table(rooms)
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", str(e))
+                fn, args = self.service.list_all, ()
+        else:
+            fn, args = self.service.list_by_department, (self.user["department_id"],)
+
+        if self._load_task:
+            self._load_task.cancel()
+        self._load_task = run_task(
+            fn, *args, owner=self,
+            on_result=self.fill_table,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", e),
+        )
 
     def fill_table(self, rooms):
-        self.table.setRowCount(len(rooms))
-        for r, room in enumerate(rooms):
-            self.table.setItem(r, 0, QtWidgets.QTableWidgetItem(str(room["id"])))
-            self.table.setItem(r, 1, QtWidgets.QTableWidgetItem(room["department_name"]))
-            self.table.setItem(r, 2, QtWidgets.QTableWidgetItem(room["code"]))
-            self.table.setItem(r, 3, QtWidgets.QTableWidgetItem(room["name"]))
-            self.table.setItem(r, 4, QtWidgets.QTableWidgetItem(str(room["num_rows"])))
-            self.table.setItem(r, 5, QtWidgets.QTableWidgetItem(str(room["num_cols"])))
-            self.table.setItem(r, 6, QtWidgets.QTableWidgetItem(str(room["seat_group"])))
-            self.table.setItem(r, 7, QtWidgets.QTableWidgetItem(str(room["capacity"])))
+        self.model.set_rows(rooms)
+
+    def _selected_room(self):
+        """Tabloda seçili dersliğin servis satırı (dict); seçim yoksa None."""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.proxy.row_data(rows[0].row())
 
     def auto_fill_fields(self):
-        row = self.table.currentRow()
-        if row < 0:
+        room = self._selected_room()
+        if room is None:
             return
-        self.dept_name.setText(self.table.item(row, 1).text())
-        self.code_input.setText(self.table.item(row, 2).text())
-        self.name_input.setText(self.table.item(row, 3).text())
-        self.rows_input.setValue(int(self.table.item(row, 4).text()))
-        self.cols_input.setValue(int(self.table.item(row, 5).text()))
-        self.group_combo.setCurrentText(self.table.item(row, 6).text())
+        self.dept_name.setText(room["department_name"])
+        self.code_input.setText(room["code"])
+        self.name_input.setText(room["name"])
+        self.rows_input.setValue(int(room["num_rows"]))
+        self.cols_input.setValue(int(room["num_cols"]))
+        self.group_combo.setCurrentText(str(room["seat_group"]))
 
     def show_preview(self):
         rows = self.rows_input.value()
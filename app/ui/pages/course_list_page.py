@@ -1,5 +1,7 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 from app.services.student_course_summary_service import StudentCourseSummaryService
+from app.ui.task_runner import run_task
+from app.ui.table_model import RowTableModel, bind_view
 
 
 class CourseListPage(QtWidgets.QWidget):
@@ -8,6 +10,8 @@ class CourseListPage(QtWidgets.QWidget):
         self.user = user  # ✅ Kullanıcı bilgisi eklendi (admin / koordinatör kontrolü)
         self.go_back = go_back
         self.service = StudentCourseSummaryService()
+        self._courses_task = None
+        self._students_task = None
         self.init_ui()
 
     # --------------------------------------------------------
@@ -66,13 +70,13 @@ class CourseListPage(QtWidgets.QWidget):
         self.course_list.itemClicked.connect(self.show_students)
 
         # Sağ panel (Öğrenciler)
-        self.table = QtWidgets.QTableWidget()
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["Öğrenci No", "Ad Soyad"])
+        self.table = QtWidgets.QTableView()
+        self.model = RowTableModel(["Öğrenci No", "Ad Soyad"], keys=["Öğrenci No", "Ad Soyad"])
+        self.proxy = bind_view(self.table, self.model)
         self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         self.table.setAlternatingRowColors(True)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #ffffff;
                 alternate-background-color: #f4f7fb;
                 border: 1px solid #d0d7de;
@@ -112,67 +116,80 @@ class CourseListPage(QtWidgets.QWidget):
     # DERSLERİ YÜKLEME
     # --------------------------------------------------------
     def load_courses(self):
-        """Tüm dersleri sol listeye yükler."""
-        try:
-            # ✅ Admin tüm dersleri görür, Koordinatör sadece kendi bölümünü
-            role = self.user.get("role", "").strip().upper()
-            if role == "ADMIN":
-                courses = self.service.list_all_courses()
-            else:
-                dept_id = self.user.get("department_id")
-                courses = self.service.list_courses_by_department(dept_id)
-
-            self.course_list.clear()
-
-            if not courses:
-                self.status_label.setText("⚠️ Hiç ders bulunamadı. Öğrenci listesini tekrar yükleyin.")
-                self.status_label.setStyleSheet("color: orange; font-weight: bold;")
-                return
-
-            for c in courses:
-                ders_kodu = c.get("Dersin Kodu", "")
-                ders_adi = c.get("Aldığı Ders", "")
-                item = QtWidgets.QListWidgetItem(f"{ders_kodu} — {ders_adi}")
-                item.setData(QtCore.Qt.UserRole, ders_kodu)
-                self.course_list.addItem(item)
-
-            self.status_label.setText(f"✅ {len(courses)} ders yüklendi.")
-            self.status_label.setStyleSheet("color: green; font-weight: bold;")
-
-        except Exception as e:
-            self.status_label.setText(f"❌ Dersler yüklenemedi: {e}")
-            self.status_label.setStyleSheet("color: red; font-weight: bold;")
-            print("🟥 Hata detay:", e)
+        """Tüm dersleri arka planda çekip sol listeye yükler."""
+        # ✅ Admin tüm dersleri görür, Koordinatör sadece kendi bölümünü
+        role = self.user.get("role", "").strip().upper()
+        if role == "ADMIN":
+            fn, args = self.service.list_all_courses, ()
+        else:
+            fn, args = self.service.list_courses_by_department, (self.user.get("department_id"),)
+
+        if self._courses_task:
+            self._courses_task.cancel()
+        self._courses_task = run_task(
+            fn, *args, owner=self,
+            on_result=self._fill_courses,
+            on_error=self._on_courses_failed,
+        )
+
+    def _fill_courses(self, courses):
+        self._courses_task = None
+        self.course_list.clear()
+
+        if not courses:
+            self.status_label.setText("⚠️ Hiç ders bulunamadı. Öğrenci listesini tekrar yükleyin.")
+            self.status_label.setStyleSheet("color: orange; font-weight: bold;")
+            return
+
+        for c in courses:
+            ders_kodu = c.get("Dersin Kodu", "")
+            ders_adi = c.get("Aldığı Ders", "")
+            item = QtWidgets.QListWidgetItem(f"{ders_kodu} — {ders_adi}")
+            item.setData(QtCore.Qt.UserRole, ders_kodu)
+            self.course_list.addItem(item)
+
+        self.status_label.setText(f"✅ {len(courses)} ders yüklendi.")
+        self.status_label.setStyleSheet("color: green; font-weight: bold;")
+
+    def _on_courses_failed(self, error):
+        self._courses_task = None
+        self.status_label.setText(f"❌ Dersler yüklenemedi: {error}")
+        self.status_label.setStyleSheet("color: red; font-weight: bold;")
+        print("🟥 Hata detay:", error)
 
     # --------------------------------------------------------
     # SEÇİLEN DERSİN ÖĞRENCİLERİNİ GÖSTER
     # --------------------------------------------------------
     def show_students(self, item):
-        """Listeden bir ders seçildiğinde o dersi alan öğrencileri getirir."""
+        """Listeden bir ders seçildiğinde o dersi alan öğrencileri arka planda getirir."""
         code = item.data(QtCore.Qt.UserRole)
-        try:
-            # ✅ Admin tüm öğrencileri görür, Koordinatör sadece kendi bölümünü
-            role = self.user.get("role", "").strip().upper()
-            if role == "ADMIN":
-                students = self.service.get_by_course_code(code)
-            else:
-                dept_id = self.user.get("department_id")
-                students = self.service.get_by_course_code(code, dept_id)
-
-            self.table.setRowCount(len(students))
-
-            if not students:
-                self.status_label.setText(f"⚠️ {code} kodlu dersi alan öğrenci bulunamadı.")
-                self.status_label.setStyleSheet("color: orange; font-weight: bold;")
-                return
-
-            for i, s in enumerate(students):
-                self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(s["Öğrenci No"]))
-                self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(s["Ad Soyad"]))
-
-            self.status_label.setText(f"📖 {code} kodlu dersi alan {len(students)} öğrenci listelendi.")
-            self.status_label.setStyleSheet("color: #2c3e50; font-weight: bold;")
-
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", f"Öğrenciler getirilemedi:\n{e}")
-            print("🟥 Öğrenci sorgu hatası:", e)
+        # ✅ Admin tüm öğrencileri görür, Koordinatör sadece kendi bölümünü
+        role = self.user.get("role", "").strip().upper()
+        dept_id = None if role == "ADMIN" else self.user.get("department_id")
+
+        if self._students_task:
+            self._students_task.cancel()
+        self.status_label.setText(f"⏳ {code} öğrencileri getiriliyor...")
+        self.status_label.setStyleSheet("color: #2c3e50; font-weight: bold;")
+        self._students_task = run_task(
+            self.service.get_by_course_code, code, dept_id, owner=self,
+            on_result=lambda students: self._fill_students(code, students),
+            on_error=self._on_students_failed,
+        )
+
+    def _fill_students(self, code, students):
+        self._students_task = None
+        self.model.set_rows(students)
+
+        if not students:
+            self.status_label.setText(f"⚠️ {code} kodlu dersi alan öğrenci bulunamadı.")
+            self.status_label.setStyleSheet("color: orange; font-weight: bold;")
+            return
+
+        self.status_label.setText(f"📖 {code} kodlu dersi alan {len(students)} öğrenci listelendi.")
+        self.status_label.setStyleSheet("color: #2c3e50; font-weight: bold;")
+
+    def _on_students_failed(self, error):
+        self._students_task = None
+        QtWidgets.QMessageBox.critical(self, "Hata", f"Öğrenciler getirilemedi:\n{error}")
+        print("🟥 Öğrenci sorgu hatası:", error)
@@ -1,6 +1,8 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
-import pandas as pd
 from app.services.course_service import CourseService
+from app.services.excel_reader import iter_course_records, records_to_frame, COURSE_COLUMNS
+from app.ui.task_runner import run_task
+from app.ui.table_model import DataFrameModel, bind_view
 from app.repositories.departments import list_all as list_departments
 
 
@@ -52,7 +54,7 @@ class CourseUploadPage(QtWidgets.QWidget):
 
         # === Butonlar ===
         hbtn = QtWidgets.QHBoxLayout()
-        self.btn_select = QtWidgets.QPushButton("📄 Excel Dosyası Seç (.xlsx)")
+        self.btn_select = QtWidgets.QPushButton("📄 Excel Dosyası Seç (.xlsx / .xls)")
         self.btn_upload = QtWidgets.QPushButton("💾 Veritabanına Kaydet")
         self.btn_back = QtWidgets.QPushButton("↩️ Geri Dön")
 
@@ -80,7 +82,14 @@ class CourseUploadPage(QtWidgets.QWidget):
         layout.addWidget(self.status_label)
 
         # === Tablo ===
-        self.table = QtWidgets.QTableWidget()
+        self.filter_input = QtWidgets.QLineEdit()
+        self.filter_input.setPlaceholderText("🔍 Önizlemede ara...")
+        layout.addWidget(self.filter_input)
+
+        self.table = QtWidgets.QTableView()
+        self.model = DataFrameModel()
+        self.proxy = bind_view(self.table, self.model)
+        self.filter_input.textChanged.connect(self.proxy.set_filter_text)
         layout.addWidget(self.table)
 
         # === Bağlantılar ===
@@ -93,7 +102,12 @@ class CourseUploadPage(QtWidgets.QWidget):
         self.selected_department_id = self.dept_combo.currentData()
 
     # --------------------------------------------------------
-    # Excel yükleme + satır/sayfa hata kontrolü
+    def _set_busy(self, busy):
+        self.btn_select.setEnabled(not busy)
+        self.btn_upload.setEnabled(not busy)
+
+    # --------------------------------------------------------
+    # Excel yükleme + satır/sayfa hata kontrolü (arka planda)
     # --------------------------------------------------------
     def load_excel(self):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
@@ -102,74 +116,34 @@ class CourseUploadPage(QtWidgets.QWidget):
         if not path:
             return
 
-        try:
-            excel = pd.ExcelFile(path)
-            final_rows = []
-            current_class = None
-            current_type = "Zorunlu"
-
-            for sheet in excel.sheet_names:
-                df = pd.read_excel(excel, sheet_name=sheet, header=None)
-
-                for idx, row in df.iterrows():
-                    try:
-                        col_values = [str(x).strip() if not pd.isna(x) else "" for x in row.tolist()]
-                        if not any(col_values):
-                            continue
-
-                        first_col = col_values[0].upper()
-
-                        # 🔹 Sınıf tespiti
-                        if any(f"{n}. SINIF" in first_col for n in ["1", "2", "3", "4"]):
-                            current_class = col_values[0].strip()
-                            current_type = "Zorunlu"
-                            continue
-
-                        # 🔹 Seçmeli tespiti
-                        if "SEÇMEL" in first_col or "SEÇİML" in first_col:
-                            current_type = "Seçmeli"
-                            continue
-
-                        # 🔹 "DERS KODU" başlık satırlarını atla
-                        if "DERS KODU" in first_col:
-                            continue
-
-                        # 🔹 Gerçek ders satırlarını tespit et
-                        if len(col_values) >= 3 and col_values[0] and col_values[1]:
-                            final_rows.append({
-                                "DERS KODU": col_values[0],
-                                "DERSİN ADI": col_values[1],
-                                "DERSİ VEREN ÖĞR. ELEMANI": col_values[2],
-                                "SINIF": current_class if current_class else "Belirtilmemiş",
-                                "DERS TÜRÜ": current_type
-                            })
-
-                    except Exception as row_err:
-                        raise ValueError(f"{sheet} sayfasındaki {idx + 1}. satırda hata: {row_err}")
-
-            df_final = pd.DataFrame(final_rows)
-            if df_final.empty:
-                self.status_label.setText("❌ Dosyada geçerli ders bilgisi yok.")
-                self.status_label.setStyleSheet("color: red; font-weight: bold;")
-                return
-
-            self.df = df_final
-            self.display_table(df_final)
-            self.status_label.setText("✅ Dosya başarıyla yüklendi (sınıf ve tür dahil).")
-            self.status_label.setStyleSheet("color: green; font-weight: bold;")
+        self._set_busy(True)
+        self.status_label.setText("⏳ Dosya okunuyor...")
+        self.status_label.setStyleSheet("color: #357ABD; font-weight: bold;")
+        run_task(
+            _read_course_sheet, path, owner=self,
+            on_result=self._on_excel_loaded,
+            on_error=self._on_excel_failed,
+            on_finished=lambda: self._set_busy(False),
+        )
 
-        except Exception as e:
-            self.status_label.setText(f"❌ Okuma hatası: {e}")
+    def _on_excel_loaded(self, df):
+        if df.empty:
+            self.status_label.setText("❌ Dosyada geçerli ders bilgisi yok.")
             self.status_label.setStyleSheet("color: red; font-weight: bold;")
+            return
+
+        self.df = df
+        self.display_table(df)
+        self.status_label.setText("✅ Dosya başarıyla yüklendi (sınıf ve tür dahil).")
+        self.status_label.setStyleSheet("color: green; font-weight: bold;")
+
+    def _on_excel_failed(self, error):
+        self.status_label.setText(f"❌ Okuma hatası: {error}")
+        self.status_label.setStyleSheet("color: red; font-weight: bold;")
 
     # --------------------------------------------------------
     def display_table(self, df):
-        self.table.setRowCount(len(df))
-        self.table.setColumnCount(len(df.columns))
-        self.table.setHorizontalHeaderLabels(df.columns)
-        for i in range(len(df)):
-            for j in range(len(df.columns)):
-                self.table.setItem(i, j, QtWidgets.QTableWidgetItem(str(df.iat[i, j])))
+        self.model.set_frame(df)
         self.table.resizeColumnsToContents()
 
     # --------------------------------------------------------
@@ -179,21 +153,44 @@ class CourseUploadPage(QtWidgets.QWidget):
             self.status_label.setStyleSheet("color: red; font-weight: bold;")
             return
 
-        try:
-            dept_id = self.user.get("department_id")
-            if self.user["role"].upper() == "ADMIN":
-                dept_id = self.selected_department_id
-                if not dept_id:
-                    self.status_label.setText("⚠️ Lütfen bir bölüm seçiniz.")
-                    self.status_label.setStyleSheet("color: orange; font-weight: bold;")
-                    return
-
-            self.df.columns = [str(c).strip().upper() for c in self.df.columns]
-            count = self.service.bulk_insert_from_excel(int(dept_id), self.df)
-            self.status_label.setText(f"✅ {count} ders başarıyla veritabanına kaydedildi.")
-            self.status_label.setStyleSheet("color: green; font-weight: bold;")
-            self.courses_uploaded.emit()
-
-        except Exception as e:
-            self.status_label.setText(f"❌ Kayıt başarısız: {e}")
-            self.status_label.setStyleSheet("color: red; font-weight: bold;")
+        dept_id = self.user.get("department_id")
+        if self.user["role"].upper() == "ADMIN":
+            dept_id = self.selected_department_id
+            if not dept_id:
+                self.status_label.setText("⚠️ Lütfen bir bölüm seçiniz.")
+                self.status_label.setStyleSheet("color: orange; font-weight: bold;")
+                return
+
+        self.df.columns = [str(c).strip().upper() for c in self.df.columns]
+        self._set_busy(True)
+        self.status_label.setText("⏳ Dersler kaydediliyor...")
+        self.status_label.setStyleSheet("color: #357ABD; font-weight: bold;")
+        run_task(
+            self.service.bulk_insert_from_excel, int(dept_id), self.df, owner=self,
+            on_result=self._on_saved,
+            on_error=self._on_save_failed,
+            on_finished=lambda: self._set_busy(False),
+        )
+
+    def _on_saved(self, result):
+        message = (f"✅ {result.processed} ders başarıyla veritabanına kaydedildi "
+                   f"({result.inserted} yeni, {result.updated} güncellendi).")
+        if result.rejected:
+            details = "\n".join(
+                f"{row_no}. satır ({code or '-'}): {reason}"
+                for row_no, code, reason in result.rejections[:10]
+            )
+            more = f"\n… ve {result.rejected - 10} satır daha" if result.rejected > 10 else ""
+            message += f"\n⚠️ {result.rejected} satır reddedildi:\n{details}{more}"
+        self.status_label.setText(message)
+        self.status_label.setStyleSheet("color: green; font-weight: bold;")
+        self.courses_uploaded.emit()
+
+    def _on_save_failed(self, error):
+        self.status_label.setText(f"❌ Kayıt başarısız: {error}")
+        self.status_label.setStyleSheet("color: red; font-weight: bold;")
+
+
+def _read_course_sheet(path):
+    """Sınıf / seçmeli / başlık satırları okuma sırasında tek geçişte ayrıştırılır."""
+    return records_to_frame(iter_course_records(path), COURSE_COLUMNS)
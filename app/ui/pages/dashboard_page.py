@@ -1,7 +1,7 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
-from app.db import fetchone, fetchall
 from app.repositories.departments import list_all as list_departments
 from app.repositories.users_admin import create_coord, email_exists
+from app.services.department_readiness_service import DepartmentReadinessService, MIN_CLASSROOMS
 import bcrypt
 
 
@@ -170,6 +170,13 @@ class DashboardPage(QtWidgets.QWidget):
         for b in self.other_buttons:
             self.layout.addWidget(b)
 
+        # === Bölüm sayıları (hazırlık özeti) ===
+        self.counts_label = QtWidgets.QLabel("")
+        self.counts_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.counts_label.setFont(QtGui.QFont("Segoe UI", 10))
+        self.counts_label.setStyleSheet("color: #555;")
+        self.layout.addWidget(self.counts_label)
+
         # === Uyarı etiketi ===
         self.warning_label = QtWidgets.QLabel("")
         self.warning_label.setAlignment(QtCore.Qt.AlignCenter)
@@ -226,29 +233,39 @@ class DashboardPage(QtWidgets.QWidget):
     # --------------------------------------------------------
     # ERİŞİM KONTROLÜ
     # --------------------------------------------------------
+    def _readiness(self):
+        """Bölüm özeti (tek sorgu, önbellekli). Admin için tüm bölümlerin toplamı."""
+        is_admin = self.user and self.user["role"].strip().upper() == "ADMIN"
+        return DepartmentReadinessService.snapshot(None if is_admin else self.user["department_id"])
+
     def has_enough_classrooms(self):
         if not self.user or self.user["role"].strip().upper() == "ADMIN":
             return True
-        row = fetchone("SELECT COUNT(*) AS cnt FROM classrooms WHERE department_id = %s",
-                       (self.user["department_id"],))
-        return row and row["cnt"] >= 5
+        return self._readiness().enough_classrooms
 
     def has_courses_loaded(self):
-        row = fetchone("SELECT COUNT(*) AS cnt FROM courses WHERE department_id = %s",
-                       (self.user["department_id"],))
-        return row and row["cnt"] > 0
+        return self._readiness().courses_loaded
 
     def has_students_loaded(self):
-        row = fetchone("SELECT COUNT(*) AS cnt FROM student_course_summary WHERE department_id = %s",
-                       (self.user["department_id"],))
-        return row and row["cnt"] > 0
+        return self._readiness().students_loaded
+
+    def invalidate_readiness(self):
+        """Derslik / ders / öğrenci / sınav programı değişince çağrılır: önbelleği boşaltır ve paneli yeniler."""
+        DepartmentReadinessService.invalidate()
+        self._update_accessibility()
 
     def _update_accessibility(self):
+        snap = self._readiness()
         enough_cls = self.has_enough_classrooms()
-        courses_loaded = self.has_courses_loaded()
-        students_loaded = self.has_students_loaded()
+        courses_loaded = snap.courses_loaded
+        students_loaded = snap.students_loaded
         is_admin = self.user and self.user["role"].strip().upper() == "ADMIN"
 
+        self.counts_label.setText(
+            f"🏫 {snap.classrooms} derslik  •  📚 {snap.courses} ders  •  "
+            f"👨‍🎓 {snap.summary_rows} öğrenci-ders kaydı  •  📅 {snap.exams} sınav"
+        )
+
         if is_admin:
             for b in [self.btn_ders, self.btn_ogr, self.btn_ogr_list,
                       self.btn_ders_list, self.btn_exam, self.btn_seating]:
@@ -261,7 +278,7 @@ class DashboardPage(QtWidgets.QWidget):
             for b in [self.btn_ders, self.btn_ogr, self.btn_ogr_list,
                       self.btn_ders_list, self.btn_exam, self.btn_seating]:
                 b.setEnabled(False)
-            self.warning_label.setText("⚠️ En az 5 derslik girişi tamamlanmadan işlem yapılamaz.")
+            self.warning_label.setText(f"⚠️ En az {MIN_CLASSROOMS} derslik girişi tamamlanmadan işlem yapılamaz.")
             self.warning_label.setStyleSheet("color: orange;")
             return
 
@@ -283,7 +300,7 @@ class DashboardPage(QtWidgets.QWidget):
 
     def try_open(self, page_name):
         if not self.has_enough_classrooms() and self.user["role"].strip().upper() != "ADMIN":
-            self.show_message("⚠️ En az 5 derslik girişi tamamlanmadan geçilemez.", "orange")
+            self.show_message(f"⚠️ En az {MIN_CLASSROOMS} derslik girişi tamamlanmadan geçilemez.", "orange")
             return
         self.on_navigate(page_name)
 
@@ -1,10 +1,14 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 from app.services.exam_scheduler_service import ExamSchedulerService
-from app.db import fetchall
+from app.services.course_service import CourseService
+from app.repositories.departments import list_all as list_departments
+from app.ui.task_runner import run_task
 import tempfile, os
 
 
 class ExamSchedulerPage(QtWidgets.QWidget):
+    schedule_generated = QtCore.pyqtSignal()  # ✅ Program veritabanına kaydedildi sinyali
+
     def __init__(self, user, go_back):
         super().__init__()
         self.user = user
@@ -12,6 +16,7 @@ class ExamSchedulerPage(QtWidgets.QWidget):
         self.service = ExamSchedulerService()
         self.generated_plan = []
         self.selected_department_id = user.get("department_id")
+        self._courses_task = None
 
         # Ana kaydırılabilir yapı
         self.scroll = QtWidgets.QScrollArea()
@@ -65,8 +70,7 @@ class ExamSchedulerPage(QtWidgets.QWidget):
             self.dept_combo.setFixedWidth(350)
             self.dept_combo.addItem("— Bölüm Seçiniz —", None)
             try:
-                depts = fetchall("SELECT id, name FROM departments ORDER BY name")
-                for d in depts:
+                for d in list_departments():
                     self.dept_combo.addItem(d["name"], d["id"])
             except Exception as e:
                 print(f"[HATA] Bölümler yüklenemedi: {e}")
@@ -217,6 +221,46 @@ class ExamSchedulerPage(QtWidgets.QWidget):
         self.chk_no_overlap.setChecked(True)
         vbox.addWidget(self.chk_no_overlap)
 
+        # --------------------------------------------------------
+        # 6️⃣ Planlama Yöntemi
+        # --------------------------------------------------------
+        lbl7 = QtWidgets.QLabel("6️⃣ Planlama Yöntemi")
+        lbl7.setFont(QtGui.QFont("Segoe UI", 11, QtGui.QFont.Bold))
+        vbox.addWidget(lbl7)
+        self.strategy_combo = QtWidgets.QComboBox()
+        self.strategy_combo.addItem("Rastgele gün ataması (klasik)", "random")
+        self.strategy_combo.addItem("Graf boyama — DSatur (deterministik)", "dsatur")
+        self.strategy_combo.setFixedWidth(320)
+        vbox.addWidget(self.strategy_combo)
+
+        opt_layout = QtWidgets.QHBoxLayout()
+        opt_layout.addWidget(QtWidgets.QLabel("🔧 Plan iyileştirme süresi (sn, 0 = kapalı):"))
+        self.spin_optimize = QtWidgets.QSpinBox()
+        self.spin_optimize.setRange(0, 60)
+        self.spin_optimize.setValue(2)
+        self.spin_optimize.setToolTip("Süre hamle bütçesine çevrilir; aynı tohum ve ayarlar aynı planı verir.")
+        opt_layout.addWidget(self.spin_optimize)
+
+        opt_layout.addWidget(QtWidgets.QLabel("🎲 Deneme sayısı:"))
+        self.spin_attempts = QtWidgets.QSpinBox()
+        self.spin_attempts.setRange(1, max(1, (os.cpu_count() or 1) * 4))
+        self.spin_attempts.setValue(1)
+        self.spin_attempts.setToolTip("1'den büyükse farklı tohumlarla paralel denenir, en iyi plan seçilir.")
+        opt_layout.addWidget(self.spin_attempts)
+
+        opt_layout.addWidget(QtWidgets.QLabel("🌱 Tohum:"))
+        self.seed_input = QtWidgets.QLineEdit()
+        self.seed_input.setPlaceholderText("Rastgele")
+        self.seed_input.setValidator(QtGui.QIntValidator(0, 2 ** 31 - 1, self.seed_input))
+        self.seed_input.setFixedWidth(120)
+        self.seed_input.setToolTip(
+            "Boş bırakılırsa rastgele seçilir. Önceki bir programı tekrar üretmek için\n"
+            "sonuç mesajındaki tohumu deneme sayısı 1 iken girin."
+        )
+        opt_layout.addWidget(self.seed_input)
+        opt_layout.addStretch(1)
+        vbox.addLayout(opt_layout)
+
         # --------------------------------------------------------
         # Butonlar
         # --------------------------------------------------------
@@ -285,32 +329,34 @@ class ExamSchedulerPage(QtWidgets.QWidget):
 
     # ------------------------------------------------------------
     def _load_courses(self):
-        try:
-            if self.user["role"].strip().upper() == "ADMIN":
-                if not self.selected_department_id:
-                    self.course_list.clear()
-                    self.custom_duration_table.setRowCount(0)
-                    return
-                dept_id = self.selected_department_id
-            else:
-                dept_id = self.user["department_id"]
-
-            rows = fetchall("""
-                SELECT code, name FROM courses
-                WHERE department_id = %s
-                ORDER BY code
-            """, (dept_id,))
-            self.course_list.clear()
-            self.custom_duration_table.setRowCount(len(rows))
-            for idx, r in enumerate(rows):
-                self.course_list.addItem(f"{r['code']} — {r['name']}")
-                self.custom_duration_table.setItem(idx, 0, QtWidgets.QTableWidgetItem(r['code']))
-                spin = QtWidgets.QSpinBox()
-                spin.setRange(30, 240)
-                spin.setValue(75)
-                self.custom_duration_table.setCellWidget(idx, 1, spin)
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", f"Ders listesi yüklenemedi:\n{e}")
+        if self.user["role"].strip().upper() == "ADMIN":
+            if not self.selected_department_id:
+                self.course_list.clear()
+                self.custom_duration_table.setRowCount(0)
+                return
+            dept_id = self.selected_department_id
+        else:
+            dept_id = self.user["department_id"]
+
+        if self._courses_task:
+            self._courses_task.cancel()
+        self._courses_task = run_task(
+            CourseService.list_by_department, dept_id, owner=self,
+            on_result=self._fill_courses,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", f"Ders listesi yüklenemedi:\n{e}"),
+        )
+
+    def _fill_courses(self, rows):
+        self._courses_task = None
+        self.course_list.clear()
+        self.custom_duration_table.setRowCount(len(rows))
+        for idx, r in enumerate(rows):
+            self.course_list.addItem(f"{r['code']} — {r['name']}")
+            self.custom_duration_table.setItem(idx, 0, QtWidgets.QTableWidgetItem(r['code']))
+            spin = QtWidgets.QSpinBox()
+            spin.setRange(30, 240)
+            spin.setValue(75)
+            self.custom_duration_table.setCellWidget(idx, 1, spin)
 
     # ------------------------------------------------------------
     def _on_generate_clicked(self):
@@ -347,7 +393,12 @@ class ExamSchedulerPage(QtWidgets.QWidget):
             if val != default_duration:
                 custom_durations[code] = val
 
-        plan = self.service.generate_schedule(
+        self._set_busy(True)
+        run_task(
+            self.service.generate_schedule, owner=self,
+            on_result=self._on_plan_ready,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", f"Program oluşturulamadı:\n{e}"),
+            on_finished=lambda: self._set_busy(False),
             department_id=dept_id,
             included_courses=included_courses,
             start_date=start_date,
@@ -357,9 +408,21 @@ class ExamSchedulerPage(QtWidgets.QWidget):
             default_duration=default_duration,
             gap_duration=gap_duration,
             no_overlap=no_overlap,
-            custom_durations=custom_durations
+            custom_durations=custom_durations,
+            strategy=self.strategy_combo.currentData(),
+            optimize_seconds=self.spin_optimize.value(),
+            attempts=self.spin_attempts.value(),
+            seed=int(self.seed_input.text()) if self.seed_input.text().strip() else None
         )
 
+    # ------------------------------------------------------------
+    def _set_busy(self, busy):
+        self.btn_generate.setEnabled(not busy)
+        self.btn_export.setEnabled(not busy)
+        self.btn_generate.setText("⏳ Program oluşturuluyor..." if busy else "📅 Programı Oluştur")
+
+    # ------------------------------------------------------------
+    def _on_plan_ready(self, plan):
         if self.service.errors:
             # 🔹 Geliştirilmiş hata görünümü (HTML formatlı)
             formatted_errors = "<ul style='margin-left:15px; color:#c0392b;'>"
@@ -374,12 +437,18 @@ class ExamSchedulerPage(QtWidgets.QWidget):
             return
 
         self.generated_plan = plan
+        self.schedule_generated.emit()
         self.output_box.clear()
         for row in plan:
             line = f"{row['Tarih']} | {row['Saat']} | {row['Ders']} | {row['Derslikler']} | {row['Tür']} | {row['Süre (dk)']} dk"
             self.output_box.append(line)
 
-        QtWidgets.QMessageBox.information(self, "Başarılı", "Sınav programı başarıyla oluşturuldu!")
+        usage = self.service.seat_utilization
+        usage_line = f"\nKoltuk doluluğu: %{usage * 100:.0f}" if usage is not None else ""
+        QtWidgets.QMessageBox.information(
+            self, "Başarılı",
+            f"Sınav programı başarıyla oluşturuldu!{usage_line}\n(Tekrar üretmek için tohum: {self.service.last_seed})"
+        )
 
     # ------------------------------------------------------------
     def _on_export_clicked(self):
@@ -395,8 +464,11 @@ class ExamSchedulerPage(QtWidgets.QWidget):
         if not filename:
             return
 
-        try:
-            self.service.export_to_excel(self.generated_plan, filename)
-            QtWidgets.QMessageBox.information(self, "Başarılı", f"Excel dosyası kaydedildi:\n{filename}")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", f"Excel kaydedilemedi:\n{e}")
+        self._set_busy(True)
+        run_task(
+            self.service.export_to_excel, self.generated_plan, filename, owner=self,
+            on_result=lambda _: QtWidgets.QMessageBox.information(
+                self, "Başarılı", f"Excel dosyası kaydedildi:\n{filename}"),
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", f"Excel kaydedilemedi:\n{e}"),
+            on_finished=lambda: self._set_busy(False),
+        )
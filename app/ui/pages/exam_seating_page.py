@@ -1,7 +1,9 @@
 # app/ui/pages/exam_seating_page.py
 from PyQt5 import QtWidgets, QtGui, QtCore
 from app.services.exam_seating_service import ExamSeatingService
-from app.db import fetchall
+from app.repositories.departments import list_all as list_departments
+from app.ui.task_runner import run_task
+from app.ui.table_model import RowTableModel, bind_view
 import os, tempfile
 
 
@@ -12,8 +14,12 @@ class ExamSeatingPage(QtWidgets.QWidget):
         self.go_back = go_back
         self.svc = ExamSeatingService()
         self.seating = []
+        self.term_seatings = {}   # "Tümünü oluştur" sonucu: exam_id → yerleşimler
+        self.term_warnings = {}   # exam_id → uyarılar
         self.current_exam_id = None
         self.selected_department_id = None  # ✅ Admin için eklendi
+        self._exams_task = None
+        self._stored_task = None
         self._init_ui()
         self._load_departments_if_admin()
         self._load_exams()
@@ -63,15 +69,33 @@ class ExamSeatingPage(QtWidgets.QWidget):
         self.btn_generate.clicked.connect(self._on_generate)
         self.btn_pdf = QtWidgets.QPushButton("📄 PDF İndir")
         self.btn_pdf.clicked.connect(self._on_pdf)
+        self.btn_generate_all = QtWidgets.QPushButton("🗂 Tüm Sınavlar İçin Oluştur")
+        self.btn_generate_all.clicked.connect(self._on_generate_all)
+        self.btn_booklet = QtWidgets.QPushButton("📚 Dönem Kitapçığı (PDF)")
+        self.btn_booklet.clicked.connect(self._on_booklet)
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setVisible(False)
         right.addWidget(self.btn_generate)
         right.addWidget(self.btn_pdf)
+        right.addWidget(self.btn_generate_all)
+        right.addWidget(self.btn_booklet)
+        right.addWidget(self.progress)
         right.addStretch(1)
         hb.addLayout(right, 1)
         layout.addWidget(box)
 
         # === Tablo ===
-        self.table = QtWidgets.QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Öğrenci No", "Ad Soyad", "Derslik", "Sıra", "Sütun"])
+        self.filter_input = QtWidgets.QLineEdit()
+        self.filter_input.setPlaceholderText("🔍 Öğrenci no, ad veya derslik ara...")
+        layout.addWidget(self.filter_input)
+
+        self.table = QtWidgets.QTableView()
+        self.model = RowTableModel(
+            ["Öğrenci No", "Ad Soyad", "Derslik", "Sıra", "Sütun", "Koltuk"],
+            keys=["student_number", "student_name", "room_code", "row_no", "col_no", "seat_no"],
+        )
+        self.proxy = bind_view(self.table, self.model)
+        self.filter_input.textChanged.connect(self.proxy.set_filter_text)
         self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         layout.addWidget(self.table, 3)
 
@@ -86,14 +110,19 @@ class ExamSeatingPage(QtWidgets.QWidget):
         """Admin için bölüm listesi doldurur."""
         if self.user["role"].strip().upper() != "ADMIN":
             return
-        try:
-            rows = fetchall("SELECT id, name FROM departments ORDER BY name")
-            self.dept_combo.clear()
-            self.dept_combo.addItem("— Bölüm Seçiniz —", None)
-            for r in rows:
-                self.dept_combo.addItem(r["name"], r["id"])
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", f"Bölümler yüklenemedi:\n{e}")
+        run_task(
+            list_departments, owner=self,
+            on_result=self._fill_departments,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", f"Bölümler yüklenemedi:\n{e}"),
+        )
+
+    def _fill_departments(self, rows):
+        self.dept_combo.blockSignals(True)
+        self.dept_combo.clear()
+        self.dept_combo.addItem("— Bölüm Seçiniz —", None)
+        for r in rows:
+            self.dept_combo.addItem(r["name"], r["id"])
+        self.dept_combo.blockSignals(False)
 
     # ------------------------------------------------------------
     def _on_department_changed(self):
@@ -115,7 +144,20 @@ class ExamSeatingPage(QtWidgets.QWidget):
         else:
             dept_id = self.user["department_id"]
 
-        rows = self.svc.list_latest_exams(dept_id)
+        # Liste yenilenirken derslik düzenleri de tazelenir (ör. düzen başka ekranda değiştiyse)
+        self.svc.clear_cache()
+        self.term_seatings, self.term_warnings = {}, {}
+        if self._exams_task:
+            self._exams_task.cancel()
+        self._exams_task = run_task(
+            self.svc.list_latest_exams, dept_id, owner=self,
+            on_result=self._fill_exams,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", f"Sınavlar yüklenemedi:\n{e}"),
+        )
+
+    def _fill_exams(self, rows):
+        self._exams_task = None
+        self.exam_list.clear()
         if not rows:
             self.exam_list.addItem("⚠️ Bu bölüm için kayıtlı sınav bulunamadı.")
             return
@@ -132,9 +174,34 @@ class ExamSeatingPage(QtWidgets.QWidget):
         if not it:
             return
         self.current_exam_id = it.data(QtCore.Qt.UserRole)
-        self.table.setRowCount(0)
-        self.seating = []
+        # Toplu üretilmiş plan varsa doğrudan gösterilir
+        self.seating = self.term_seatings.get(self.current_exam_id, [])
+        self.model.set_rows(self.seating)
+        if self.current_exam_id in self.term_seatings:
+            warns = self.term_warnings.get(self.current_exam_id, [])
+            self.info.setText(f"Toplam {len(self.seating)} öğrenci yerleştirildi."
+                              + (f"  ⚠️ {len(warns)} uyarı: {warns[0]}" if warns else ""))
+            return
+
+        # Girdileri değişmemiş kayıtlı plan varsa yeniden üretmeden gösterilir
         self.info.setText("")
+        if self._stored_task:
+            self._stored_task.cancel()
+        self._stored_task = run_task(
+            self.svc.load_current_seating, self.current_exam_id, owner=self,
+            on_result=self._on_stored_seating,
+            on_error=lambda e: print(f"⚠️ Kayıtlı oturma planı okunamadı: {e}"),
+        )
+
+    def _on_stored_seating(self, result):
+        self._stored_task = None
+        if result["exam_id"] != self.current_exam_id or not result["seating"]:
+            return
+        self.seating = result["seating"]
+        self.model.set_rows(self.seating)
+        warns = result["warnings"]
+        self.info.setText(f"Kayıtlı plan: {len(self.seating)} öğrenci yerleştirilmiş."
+                          + (f"  ⚠️ {len(warns)} uyarı: {warns[0]}" if warns else ""))
 
     # ------------------------------------------------------------
     def _on_generate(self):
@@ -142,25 +209,118 @@ class ExamSeatingPage(QtWidgets.QWidget):
         if not self.current_exam_id:
             QtWidgets.QMessageBox.warning(self, "Uyarı", "Önce bir sınav seçin.")
             return
-        try:
-            self.seating = self.svc.generate_seating(self.current_exam_id)
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", str(e))
+        self._set_busy(True)
+        if self._stored_task:
+            self._stored_task.cancel()
+        run_task(
+            self.svc.ensure_seating, self.current_exam_id, owner=self,
+            on_result=self._on_seating_ready,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", e),
+            on_finished=lambda: self._set_busy(False),
+        )
+
+    # ------------------------------------------------------------
+    def _current_department(self):
+        """Admin için seçili bölüm, koordinatör için kendi bölümü (seçim yoksa uyarır, None döner)."""
+        if self.user["role"].strip().upper() != "ADMIN":
+            return self.user["department_id"]
+        if not self.selected_department_id:
+            QtWidgets.QMessageBox.warning(self, "Uyarı", "Önce bir bölüm seçin.")
+        return self.selected_department_id
+
+    def _run_with_progress(self, fn, *args, on_result, error_text):
+        self._set_busy(True)
+        self.progress.setRange(0, 0)
+        self.progress.setVisible(True)
+        run_task(
+            fn, *args, owner=self,
+            progress_kwarg="progress_cb",
+            on_progress=self._on_term_progress,
+            on_result=on_result,
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", f"{error_text}:\n{e}"),
+            on_finished=lambda: (self._set_busy(False), self.progress.setVisible(False)),
+        )
+
+    def _on_generate_all(self):
+        """Listelenen dönemdeki tüm sınavların oturma planını tek seferde oluşturur."""
+        dept_id = self._current_department()
+        if not dept_id:
+            return
+        self._run_with_progress(
+            self.svc.generate_term_seating, None, dept_id,
+            on_result=self._on_term_seating_ready, error_text="Oturma planları oluşturulamadı",
+        )
+
+    def _on_booklet(self):
+        """Dönemdeki tüm sınavların oturma planlarını tek PDF kitapçıkta toplar."""
+        dept_id = self._current_department()
+        if not dept_id:
             return
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Dönem kitapçığını kaydet",
+            os.path.join(tempfile.gettempdir(), "oturma_plani_donem.pdf"),
+            "PDF (*.pdf)"
+        )
+        if not fn:
+            return
+        self._run_with_progress(
+            self.svc.export_term_booklet, fn, None, dept_id,
+            on_result=lambda st: QtWidgets.QMessageBox.information(
+                self, "Tamam",
+                f"Kitapçık kaydedildi ({st['exams']} sınav, {_pdf_stats_text(st)}):\n{fn}"
+                + (f"\n\n⚠️ Planı oluşmayan {st['skipped']} sınav eklenmedi." if st["skipped"] else "")
+            ),
+            error_text="Kitapçık oluşturulamadı",
+        )
 
-        self.table.setRowCount(len(self.seating))
-        for i, p in enumerate(self.seating):
-            self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(p["student_number"]))
-            self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(p["student_name"]))
-            self.table.setItem(i, 2, QtWidgets.QTableWidgetItem(p["room_code"]))
-            self.table.setItem(i, 3, QtWidgets.QTableWidgetItem(str(p["row_no"])))
-            self.table.setItem(i, 4, QtWidgets.QTableWidgetItem(str(p["col_no"])))
+    def _on_term_progress(self, phase, done, total):
+        self.progress.setRange(0, total)
+        self.progress.setValue(done)
+        self.progress.setFormat(f"{phase}: %v / %m")
+
+    def _on_term_seating_ready(self, result):
+        self.term_seatings = result["seatings"]
+        self.term_warnings = result["warnings"]
+        placed = sum(len(p) for p in self.term_seatings.values())
+        self.info.setText(f"{len(self.term_seatings)} sınav için toplam {placed} öğrenci yerleştirildi.")
+        if self.current_exam_id:
+            self._on_exam_selected()
+
+        if not self.term_warnings:
+            QtWidgets.QMessageBox.information(self, "Başarılı", "Tüm sınavların oturma planı oluşturuldu.")
+            return
+        labels = {}
+        for i in range(self.exam_list.count()):
+            item = self.exam_list.item(i)
+            labels[item.data(QtCore.Qt.UserRole)] = item.text()
+        lines = [f"• {labels.get(e, f'Sınav #{e}')}: {w[0]}" + (f" (+{len(w) - 1})" if len(w) > 1 else "")
+                 for e, w in self.term_warnings.items()]
+        QtWidgets.QMessageBox.warning(
+            self, "Uyarılar",
+            f"{len(self.term_warnings)} sınavda uyarı var:\n\n" + "\n".join(lines[:20])
+            + (f"\n… ve {len(lines) - 20} sınav daha" if len(lines) > 20 else ""),
+        )
+
+    # ------------------------------------------------------------
+    def _set_busy(self, busy):
+        self.btn_generate.setEnabled(not busy)
+        self.btn_generate_all.setEnabled(not busy)
+        self.btn_booklet.setEnabled(not busy)
+        self.btn_pdf.setEnabled(not busy)
+        self.exam_list.setEnabled(not busy)
+
+    # ------------------------------------------------------------
+    def _on_seating_ready(self, result):
+        if result["exam_id"] != self.current_exam_id:
+            return
+        self.seating = result["seating"]
+        self.model.set_rows(self.seating)
 
         self.info.setText(f"Toplam {len(self.seating)} öğrenci yerleştirildi.")
 
-        # ✅ Yeni eklendi: uyarıları kullanıcıya göster
-        if self.svc.warnings:
-            warning_text = "\n".join(self.svc.warnings)
+        # ✅ Yeni eklendi: uyarıları kullanıcıya göster (bu sonuca ait uyarılar)
+        if result["warnings"]:
+            warning_text = "\n".join(result["warnings"])
             QtWidgets.QMessageBox.warning(
                 self,
                 "Uyarılar",
@@ -182,11 +342,14 @@ class ExamSeatingPage(QtWidgets.QWidget):
         )
         if not fn:
             return
-        try:
-            self.svc.export_pdf(self.current_exam_id, self.seating, fn)
-            QtWidgets.QMessageBox.information(self, "Tamam", f"PDF kaydedildi:\n{fn}")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", f"PDF oluşturulamadı:\n{e}")
+        self._set_busy(True)
+        run_task(
+            self.svc.export_pdf, self.current_exam_id, self.seating, fn, owner=self,
+            on_result=lambda st: QtWidgets.QMessageBox.information(
+                self, "Tamam", f"PDF kaydedildi ({_pdf_stats_text(st)}):\n{fn}"),
+            on_error=lambda e: QtWidgets.QMessageBox.critical(self, "Hata", f"PDF oluşturulamadı:\n{e}"),
+            on_finished=lambda: self._set_busy(False),
+        )
 
     # ------------------------------------------------------------
     def showEvent(self, event):
@@ -197,3 +360,7 @@ class ExamSeatingPage(QtWidgets.QWidget):
                 self._load_exams()
         else:
             self._load_exams()
+
+
+def _pdf_stats_text(stats) -> str:
+    return f"{stats['pages']} sayfa, {stats['seconds']} sn, {stats['pages_per_sec']} sayfa/sn"
@@ -195,10 +195,10 @@ class LoginPage(QtWidgets.QWidget):
 
             # 🔹 Departman adını çek (gerekirse)
             if not user.get("department_name") and user.get("department_id"):
-                from app.db import fetchone
-                row = fetchone("SELECT name FROM departments WHERE id=%s", (user["department_id"],))
-                if row:
-                    user["department_name"] = row["name"]
+                from app.repositories.departments import get_name
+                name = get_name(user["department_id"])
+                if name:
+                    user["department_name"] = name
 
             self.on_success(user)
 
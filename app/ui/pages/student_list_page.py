@@ -1,5 +1,7 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 from app.services.student_course_summary_service import StudentCourseSummaryService
+from app.ui.task_runner import run_task
+from app.ui.table_model import RowTableModel, bind_view
 
 
 class StudentListPage(QtWidgets.QWidget):
@@ -8,6 +10,7 @@ class StudentListPage(QtWidgets.QWidget):
         self.user = user  # ✅ Kullanıcı bilgisi eklendi (admin/koord ayrımı için)
         self.go_back = go_back
         self.service = StudentCourseSummaryService()
+        self._search_task = None
         self.init_ui()
 
     # --------------------------------------------------------
@@ -78,13 +81,13 @@ class StudentListPage(QtWidgets.QWidget):
         layout.addWidget(self.result_label)
 
         # Tablo
-        self.table = QtWidgets.QTableWidget()
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["Dersin Kodu", "Aldığı Ders"])
+        self.table = QtWidgets.QTableView()
+        self.model = RowTableModel(["Dersin Kodu", "Aldığı Ders"], keys=["Dersin Kodu", "Aldığı Ders"])
+        self.proxy = bind_view(self.table, self.model)
         self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         self.table.setAlternatingRowColors(True)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #ffffff;
                 alternate-background-color: #f4f7fb;
                 border: 1px solid #d0d7de;
@@ -108,32 +111,39 @@ class StudentListPage(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "Uyarı", "Lütfen öğrenci numarası girin.")
             return
 
-        try:
-            # ✅ Admin tüm bölümleri görebilir, koordinatör sadece kendi bölümünü
-            role = self.user.get("role", "").strip().upper()
-            if role == "ADMIN":
-                results = self.service.get_by_student_number(number)
-            else:
-                dept_id = self.user.get("department_id")
-                results = self.service.get_by_student_number(number, dept_id)
-
-            # Sonuç yoksa
-            if not results:
-                self.result_label.setText(f"❌ {number} numaralı öğrenci bulunamadı veya erişim yetkiniz yok.")
-                self.result_label.setStyleSheet("color: red; font-weight:bold;")
-                self.table.setRowCount(0)
-                return
-
-            # Sonuç varsa tabloyu doldur
-            name = results[0]["Ad Soyad"]
-            self.result_label.setText(f"👤 Öğrenci: <b>{name}</b>  |  🎓 Aldığı Dersler:")
-            self.result_label.setStyleSheet("color: #2c3e50; font-weight:bold;")
-
-            self.table.setRowCount(len(results))
-            for i, r in enumerate(results):
-                self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(r["Dersin Kodu"]))
-                self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(r["Aldığı Ders"]))
-
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Hata", f"Arama başarısız:\n{e}")
-            print("🟥 Öğrenci sorgu hatası:", e)
+        # ✅ Admin tüm bölümleri görebilir, koordinatör sadece kendi bölümünü
+        role = self.user.get("role", "").strip().upper()
+        dept_id = None if role == "ADMIN" else self.user.get("department_id")
+
+        if self._search_task:
+            self._search_task.cancel()
+        self.result_label.setText(f"⏳ {number} aranıyor...")
+        self.result_label.setStyleSheet("color: #2c3e50; font-weight:bold;")
+        self._search_task = run_task(
+            self.service.get_by_student_number, number, dept_id, owner=self,
+            on_result=lambda results: self._show_results(number, results),
+            on_error=self._on_search_failed,
+        )
+
+    def _show_results(self, number, results):
+        self._search_task = None
+
+        # Sonuç yoksa
+        if not results:
+            self.result_label.setText(f"❌ {number} numaralı öğrenci bulunamadı veya erişim yetkiniz yok.")
+            self.result_label.setStyleSheet("color: red; font-weight:bold;")
+            self.model.clear()
+            return
+
+        # Sonuç varsa tabloyu doldur
+        name = results[0]["Ad Soyad"]
+        self.result_label.setText(f"👤 Öğrenci: <b>{name}</b>  |  🎓 Aldığı Dersler:")
+        self.result_label.setStyleSheet("color: #2c3e50; font-weight:bold;")
+
+        self.model.set_rows(results)
+
+    def _on_search_failed(self, error):
+        self._search_task = None
+        self.result_label.setText("")
+        QtWidgets.QMessageBox.critical(self, "Hata", f"Arama başarısız:\n{error}")
+        print("🟥 Öğrenci sorgu hatası:", error)
@@ -1,6 +1,8 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
-import pandas as pd
 from app.services.student_service import StudentService
+from app.services.excel_reader import iter_student_records, records_to_frame, STUDENT_COLUMNS
+from app.ui.task_runner import run_task
+from app.ui.table_model import DataFrameModel, bind_view
 from app.repositories.departments import list_all as list_departments
 
 
@@ -13,6 +15,7 @@ class StudentUploadPage(QtWidgets.QWidget):
         self.go_back = go_back
         self.service = StudentService()
         self.df = None
+        self._task = None
         self.selected_department_id = None  # ✅ Admin için seçilen bölüm
         self.init_ui()
 
@@ -51,11 +54,12 @@ class StudentUploadPage(QtWidgets.QWidget):
 
         # === Butonlar ===
         btns = QtWidgets.QHBoxLayout()
-        self.btn_select = QtWidgets.QPushButton("📄 Excel Dosyası Seç (.xlsx)")
+        self.btn_select = QtWidgets.QPushButton("📄 Excel Dosyası Seç (.xlsx / .xls)")
         self.btn_upload = QtWidgets.QPushButton("💾 Veritabanına Kaydet")
+        self.btn_cancel = QtWidgets.QPushButton("⏹ İptal")
         self.btn_back = QtWidgets.QPushButton("↩️ Geri Dön")
 
-        for b in [self.btn_select, self.btn_upload, self.btn_back]:
+        for b in [self.btn_select, self.btn_upload, self.btn_cancel, self.btn_back]:
             b.setFixedHeight(40)
             b.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
             b.setStyleSheet("""
@@ -70,7 +74,9 @@ class StudentUploadPage(QtWidgets.QWidget):
 
         btns.addWidget(self.btn_select)
         btns.addWidget(self.btn_upload)
+        btns.addWidget(self.btn_cancel)
         btns.addWidget(self.btn_back)
+        self.btn_cancel.hide()
         layout.addLayout(btns)
 
         # === Durum etiketi ===
@@ -79,12 +85,20 @@ class StudentUploadPage(QtWidgets.QWidget):
         layout.addWidget(self.status_label)
 
         # === Tablo ===
-        self.table = QtWidgets.QTableWidget()
+        self.filter_input = QtWidgets.QLineEdit()
+        self.filter_input.setPlaceholderText("🔍 Önizlemede ara...")
+        layout.addWidget(self.filter_input)
+
+        self.table = QtWidgets.QTableView()
+        self.model = DataFrameModel()
+        self.proxy = bind_view(self.table, self.model)
+        self.filter_input.textChanged.connect(self.proxy.set_filter_text)
         layout.addWidget(self.table)
 
         # === Bağlantılar ===
         self.btn_select.clicked.connect(self.load_excel)
         self.btn_upload.clicked.connect(self.save_to_db)
+        self.btn_cancel.clicked.connect(self._cancel_task)
         self.btn_back.clicked.connect(self.go_back)
 
     # --------------------------------------------------------
@@ -92,7 +106,24 @@ class StudentUploadPage(QtWidgets.QWidget):
         self.selected_department_id = self.dept_combo.currentData()
 
     # --------------------------------------------------------
-    # Excel yükleme + sayfa/satır bazlı hata kontrolü
+    def _set_busy(self, busy, cancellable=False):
+        self.btn_select.setEnabled(not busy)
+        self.btn_upload.setEnabled(not busy)
+        self.btn_cancel.setVisible(busy and cancellable)
+        self.btn_cancel.setEnabled(True)
+
+    def _cancel_task(self):
+        if self._task:
+            self._task.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.status_label.setText("⏹ İptal ediliyor...")
+
+    def _finish_task(self):
+        self._task = None
+        self._set_busy(False)
+
+    # --------------------------------------------------------
+    # Excel yükleme + sayfa/satır bazlı hata kontrolü (arka planda)
     # --------------------------------------------------------
     def load_excel(self):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
@@ -101,57 +132,40 @@ class StudentUploadPage(QtWidgets.QWidget):
         if not path:
             return
 
-        try:
-            excel = pd.ExcelFile(path)
-            all_data = []
-
-            for sheet in excel.sheet_names:
-                try:
-                    df = pd.read_excel(excel, sheet_name=sheet)
-                    df.columns = [str(c).strip() for c in df.columns]
-
-                    expected = ["Öğrenci No", "Ad Soyad", "Sınıf", "Ders"]
-                    missing = [col for col in expected if col not in df.columns]
-                    if missing:
-                        raise ValueError(f"{sheet} sayfasında eksik sütun(lar): {', '.join(missing)}")
-
-                    # Satır satır kontrol
-                    for idx, row in df.iterrows():
-                        try:
-                            if any(pd.isna(row[c]) for c in expected):
-                                raise ValueError(f"{sheet} sayfasındaki {idx + 1}. satırda boş hücre var.")
-                        except Exception as inner_err:
-                            raise ValueError(f"{sheet} sayfasındaki {idx + 1}. satır hatalı: {inner_err}")
-
-                    all_data.append(df)
-
-                except Exception as sheet_err:
-                    raise ValueError(f"{sheet} sayfası okunamadı veya hatalı: {sheet_err}")
-
-            # Tüm sayfaları birleştir
-            if all_data:
-                self.df = pd.concat(all_data, ignore_index=True)
-                self.display_table(self.df)
-                self.status_label.setText("✅ Dosya başarıyla yüklendi.")
-                self.status_label.setStyleSheet("color: green; font-weight: bold;")
-            else:
-                self.status_label.setText("❌ Excel boş veya uygun veri içermiyor.")
-                self.status_label.setStyleSheet("color: red; font-weight: bold;")
-
-        except Exception as e:
-            self.status_label.setText(f"❌ Okuma hatası: {e}")
+        self._set_busy(True)
+        self.status_label.setText("⏳ Dosya okunuyor...")
+        self.status_label.setStyleSheet("color: #357ABD; font-weight: bold;")
+        self._task = run_task(
+            _read_student_sheet, path, owner=self,
+            on_result=self._on_excel_loaded,
+            on_error=self._on_excel_failed,
+            on_finished=self._finish_task,
+        )
+
+    def _on_excel_loaded(self, df):
+        if df.empty:
+            self.status_label.setText("❌ Excel boş veya uygun veri içermiyor.")
             self.status_label.setStyleSheet("color: red; font-weight: bold;")
+            return
+        self.df = df
+        self.display_table(self.df)
+        self.status_label.setText("✅ Dosya başarıyla yüklendi.")
+        self.status_label.setStyleSheet("color: green; font-weight: bold;")
+
+    def _on_excel_failed(self, error):
+        self.status_label.setText(f"❌ Okuma hatası: {error}")
+        self.status_label.setStyleSheet("color: red; font-weight: bold;")
 
     # --------------------------------------------------------
     def display_table(self, df):
-        self.table.setRowCount(len(df))
-        self.table.setColumnCount(len(df.columns))
-        self.table.setHorizontalHeaderLabels(df.columns)
-        for i in range(len(df)):
-            for j in range(len(df.columns)):
-                self.table.setItem(i, j, QtWidgets.QTableWidgetItem(str(df.iat[i, j])))
+        self.model.set_frame(df)
         self.table.resizeColumnsToContents()
 
+    # --------------------------------------------------------
+    def _on_progress(self, phase, done, total):
+        self.status_label.setText(f"⏳ {phase}: {done}/{total}")
+        self.status_label.setStyleSheet("color: #357ABD; font-weight: bold;")
+
     # --------------------------------------------------------
     def save_to_db(self):
         if self.df is None or self.df.empty:
@@ -159,19 +173,45 @@ class StudentUploadPage(QtWidgets.QWidget):
             self.status_label.setStyleSheet("color: red; font-weight: bold;")
             return
 
-        try:
-            dept_id = self.user.get("department_id")
-            if self.user["role"].upper() == "ADMIN":
-                dept_id = self.selected_department_id
-                if not dept_id:
-                    self.status_label.setText("⚠️ Lütfen bir bölüm seçiniz.")
-                    self.status_label.setStyleSheet("color: orange; font-weight: bold;")
-                    return
-
-            students, enrollments = self.service.bulk_insert_from_excel(int(dept_id), self.df)
-            self.status_label.setText(f"✅ {students} öğrenci, {enrollments} ders kaydı işlendi.")
-            self.status_label.setStyleSheet("color: green; font-weight: bold;")
-            self.students_uploaded.emit()
-        except Exception as e:
-            self.status_label.setText(f"❌ Kayıt başarısız: {e}")
-            self.status_label.setStyleSheet("color: red; font-weight: bold;")
+        dept_id = self.user.get("department_id")
+        if self.user["role"].upper() == "ADMIN":
+            dept_id = self.selected_department_id
+            if not dept_id:
+                self.status_label.setText("⚠️ Lütfen bir bölüm seçiniz.")
+                self.status_label.setStyleSheet("color: orange; font-weight: bold;")
+                return
+
+        # İptal edilirse servis içindeki transaction geri alınır, yarım yükleme kalmaz
+        self._set_busy(True, cancellable=True)
+        self._task = run_task(
+            self.service.bulk_insert_from_excel, int(dept_id), self.df, owner=self,
+            progress_kwarg="progress_cb",
+            on_progress=self._on_progress,
+            on_result=self._on_saved,
+            on_error=self._on_save_failed,
+            on_cancelled=self._on_save_cancelled,
+            on_finished=self._finish_task,
+        )
+
+    def _on_saved(self, result):
+        message = f"✅ {result.students} öğrenci, {result.enrollments} ders kaydı işlendi."
+        if result.skipped_rows:
+            message += f" ({result.skipped_rows} eksik satır atlandı)"
+        if result.unknown_courses:
+            message += f"\n⚠️ Bölümde bulunmayan ders kodları: {', '.join(result.unknown_courses)}"
+        self.status_label.setText(message)
+        self.status_label.setStyleSheet("color: green; font-weight: bold;")
+        self.students_uploaded.emit()
+
+    def _on_save_failed(self, error):
+        self.status_label.setText(f"❌ Kayıt başarısız: {error}")
+        self.status_label.setStyleSheet("color: red; font-weight: bold;")
+
+    def _on_save_cancelled(self):
+        self.status_label.setText("⏹ Yükleme iptal edildi, hiçbir kayıt değiştirilmedi.")
+        self.status_label.setStyleSheet("color: orange; font-weight: bold;")
+
+
+def _read_student_sheet(path):
+    """Satırlar read_only modda akış halinde okunur ve doğrulanır."""
+    return records_to_frame(iter_student_records(path), STUDENT_COLUMNS)
@@ -0,0 +1,234 @@
+# app/ui/table_model.py
+"""
+Büyük sonuç tabloları için model/view katmanı.
+
+QTableWidget her hücre için bir QTableWidgetItem üretir; 30 bin satırlık bir önizleme
+yüz binlerce nesne demektir. Buradaki modeller veriyi olduğu gibi (satır listesi veya
+DataFrame) tutar, hücre metnini yalnızca görünüm `data()` ile istediğinde üretir.
+
+    self.model = RowTableModel(["Kod", "Ad"], keys=["code", "name"])
+    self.proxy = bind_view(self.table, self.model)      # self.table: QTableView
+    self.model.set_rows(rows)
+    self.proxy.set_filter_text("bil")
+"""
+import math
+import numbers
+from PyQt5 import QtCore
+
+
+def _cell_text(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value)
+
+
+def _sort_key(value):
+    """Sayılar sayısal, diğer her şey büyük/küçük harf duyarsız metin olarak sıralanır."""
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        if math.isnan(value):
+            return (2, 0, "")
+        return (0, value, "")
+    text = _cell_text(value)
+    return (1, 0, text.casefold()) if text else (2, 0, "")
+
+
+# --------------------------------------------------------
+# TEMEL MODEL
+# --------------------------------------------------------
+class _TableModelBase(QtCore.QAbstractTableModel):
+    """
+    Alt sınıflar `_raw(kaynak_satır, sütun)` ve `_source_count()` sağlar.
+    Sıralama veriyi kopyalamaz; yalnızca satır sırası (`_order`) değişir.
+    """
+
+    def __init__(self, headers=(), parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._order = None  # None → kaynak sırası
+        self._sort_column = -1
+        self._sort_order = QtCore.Qt.AscendingOrder
+
+    # -------------------- alt sınıflar --------------------
+    def _raw(self, src_row, column):
+        raise NotImplementedError
+
+    def _source_count(self) -> int:
+        raise NotImplementedError
+
+    # -------------------- yardımcılar --------------------
+    def _src(self, row) -> int:
+        return self._order[row] if self._order is not None else row
+
+    def value(self, row, column):
+        """Görünüm satırındaki ham değer (sıralama uygulanmış haliyle)."""
+        return self._raw(self._src(row), column)
+
+    def row_text(self, row) -> str:
+        """Filtreleme için satırdaki tüm hücrelerin küçük harfli birleşimi."""
+        src = self._src(row)
+        return "\t".join(_cell_text(self._raw(src, c)) for c in range(len(self._headers))).casefold()
+
+    def _apply_sort(self):
+        """Son seçilen sıralamayı (varsa) kaynak verisine yeniden uygular."""
+        column = self._sort_column
+        if column < 0 or column >= len(self._headers):
+            self._order = None
+            return
+        keys = [_sort_key(self._raw(r, column)) for r in range(self._source_count())]
+        self._order = sorted(range(len(keys)), key=keys.__getitem__,
+                             reverse=(self._sort_order == QtCore.Qt.DescendingOrder))
+
+    def _reset(self):
+        self.beginResetModel()
+        self._apply_sort()
+        self.endResetModel()
+
+    # -------------------- Qt arayüzü --------------------
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._source_count()
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return _cell_text(self.value(index.row(), index.column()))
+        if role == QtCore.Qt.UserRole:
+            return self.value(index.row(), index.column())
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return str(section + 1)
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        old_sources = [self._src(i.row()) for i in old_persistent]
+
+        self._sort_column, self._sort_order = column, order
+        self._apply_sort()
+
+        position = {src: row for row, src in enumerate(self._order or range(self._source_count()))}
+        self.changePersistentIndexList(
+            old_persistent,
+            [self.index(position[src], i.column()) for src, i in zip(old_sources, old_persistent)],
+        )
+        self.layoutChanged.emit()
+
+
+# --------------------------------------------------------
+# SATIR LİSTESİ MODELİ (dict veya tuple satırlar)
+# --------------------------------------------------------
+class RowTableModel(_TableModelBase):
+    """
+    Servislerden gelen satır listesini gösterir. `keys` verilirse satırlar dict kabul
+    edilir ve her sütun ilgili anahtardan okunur; verilmezse sütun indeksi kullanılır.
+    """
+
+    def __init__(self, headers, rows=None, keys=None, parent=None):
+        super().__init__(headers, parent)
+        self._keys = list(keys) if keys is not None else list(range(len(self._headers)))
+        self._rows = list(rows) if rows is not None else []
+
+    def set_rows(self, rows):
+        self._rows = list(rows)
+        self._reset()
+
+    def clear(self):
+        self.set_rows([])
+
+    def row_data(self, row):
+        """Görünüm satırına karşılık gelen orijinal satır nesnesi."""
+        return self._rows[self._src(row)]
+
+    def _raw(self, src_row, column):
+        return self._rows[src_row][self._keys[column]]
+
+    def _source_count(self):
+        return len(self._rows)
+
+
+# --------------------------------------------------------
+# DataFrame MODELİ
+# --------------------------------------------------------
+class DataFrameModel(_TableModelBase):
+    """DataFrame sütunlarını numpy dizileri olarak tutar; hücreler kopyalanmaz."""
+
+    def __init__(self, df=None, parent=None):
+        super().__init__((), parent)
+        self._df = None
+        self._columns = []
+        if df is not None:
+            self.set_frame(df)
+
+    def set_frame(self, df):
+        self.beginResetModel()
+        self._df = df
+        self._headers = [str(c) for c in df.columns] if df is not None else []
+        self._columns = [df[c].to_numpy() for c in df.columns] if df is not None else []
+        self._apply_sort()
+        self.endResetModel()
+
+    def frame(self):
+        return self._df
+
+    def _raw(self, src_row, column):
+        return self._columns[column][src_row]
+
+    def _source_count(self):
+        return len(self._df) if self._df is not None else 0
+
+
+# --------------------------------------------------------
+# FİLTRE PROXY
+# --------------------------------------------------------
+class TableFilterProxy(QtCore.QSortFilterProxyModel):
+    """
+    Satırın herhangi bir hücresinde geçen metne göre (büyük/küçük harf duyarsız) süzer.
+    Sıralama kaynağa devredilir; böylece her karşılaştırma için Python'a dönülmez.
+    """
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self.setSourceModel(source)
+
+    def set_filter_text(self, text):
+        self._needle = (text or "").strip().casefold()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        return self._needle in self.sourceModel().row_text(source_row)
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Vertical and role == QtCore.Qt.DisplayRole:
+            return str(section + 1)
+        return super().headerData(section, orientation, role)
+
+    def source_row(self, row) -> int:
+        return self.mapToSource(self.index(row, 0)).row()
+
+    def row_data(self, row):
+        """Proxy satırının kaynak modeldeki orijinal satırı (RowTableModel için)."""
+        return self.sourceModel().row_data(self.source_row(row))
+
+
+def bind_view(view, model) -> TableFilterProxy:
+    """Modeli filtre proxy'si üzerinden görünüme bağlar ve başlığa tıklayarak sıralamayı açar."""
+    proxy = TableFilterProxy(model, parent=view)
+    view.setModel(proxy)
+    # Sıralama açılırken mevcut sıra bozulmasın: başlangıçta sıralama sütunu yok
+    view.horizontalHeader().setSortIndicator(-1, QtCore.Qt.AscendingOrder)
+    view.setSortingEnabled(True)
+    return proxy
@@ -0,0 +1,114 @@
+# app/ui/task_runner.py
+"""
+Uzun süren veritabanı / dosya işlerini GUI thread'i dışında çalıştırmak için ortak altyapı.
+
+    task = run_task(self.service.load, dept_id, owner=self,
+                    on_result=self._on_loaded, on_error=self._on_failed)
+    task.cancel()   # isteğe bağlı
+
+İşlev QThreadPool.globalInstance() üzerinde çalışır; sonuç, hata, ilerleme ve iptal
+sinyalleri GUI thread'ine kuyruklanarak iletilir. `progress_kwarg` verilirse işleve
+`progress_cb(aşama, yapılan, toplam)` geçirilir; bu geri çağırma iptal istenmişse
+TaskCancelled fırlatarak işi (ve varsa açık transaction'ı) durdurur.
+"""
+import threading
+import traceback
+from PyQt5 import QtCore
+
+
+class TaskCancelled(Exception):
+    """İş, kullanıcı isteğiyle yarıda bırakıldı."""
+
+
+class TaskSignals(QtCore.QObject):
+    progress = QtCore.pyqtSignal(str, int, int)
+    result = QtCore.pyqtSignal(object)
+    error = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+    finished = QtCore.pyqtSignal()
+
+
+class Task(QtCore.QRunnable):
+    def __init__(self, fn, *args, progress_kwarg=None, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.progress_kwarg = progress_kwarg
+        self.signals = TaskSignals()
+        self._cancel = threading.Event()
+
+    # -------------------- iptal --------------------
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _report(self, phase, done, total):
+        if self._cancel.is_set():
+            raise TaskCancelled()
+        self.signals.progress.emit(str(phase), int(done), int(total))
+
+    # -------------------- çalıştırma --------------------
+    def run(self):
+        try:
+            if self.progress_kwarg:
+                self.kwargs[self.progress_kwarg] = self._report
+            result = self.fn(*self.args, **self.kwargs)
+            if self._cancel.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.result.emit(result)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+    def detach(self):
+        """Sahibi kapanan işin sinyallerini keser; sonuç silinmiş widget'a ulaşmaz."""
+        self.cancel()
+        try:
+            signals = (self.signals.progress, self.signals.result, self.signals.error,
+                       self.signals.cancelled, self.signals.finished)
+        except RuntimeError:
+            return  # iş çoktan bitti ve sinyal nesnesi silindi (ör. uygulama kapanışı)
+        for sig in signals:
+            try:
+                sig.disconnect()
+            except TypeError:
+                pass
+        self.signals.finished.connect(lambda: _active.discard(self))
+
+
+# Çalışan işler (Python nesneleri erken toplanmasın diye)
+_active = set()
+
+
+def run_task(fn, *args, owner=None, on_result=None, on_error=None, on_progress=None,
+             on_cancelled=None, on_finished=None, progress_kwarg=None, **kwargs) -> Task:
+    """`fn(*args, **kwargs)` işini ortak thread havuzunda başlatır ve Task döner."""
+    task = Task(fn, *args, progress_kwarg=progress_kwarg, **kwargs)
+    sig = task.signals
+    if on_result:
+        sig.result.connect(on_result)
+    if on_error:
+        sig.error.connect(on_error)
+    if on_progress:
+        sig.progress.connect(on_progress)
+    if on_cancelled:
+        sig.cancelled.connect(on_cancelled)
+    if on_finished:
+        sig.finished.connect(on_finished)
+
+    if owner is not None:
+        owner.destroyed.connect(task.detach)
+
+    _active.add(task)
+    sig.finished.connect(lambda: _active.discard(task))
+    QtCore.QThreadPool.globalInstance().start(task)
+    return task
@@ -0,0 +1,40 @@
+/* ============================================================
+   001 — enrollments (student_id, course_id) tekilliği
+   ------------------------------------------------------------
+   Eski kurulumlarda uq_enrollment yoktu; öğrenci yüklemesi her
+   seferinde tüm tabloyu tarayan bir DELETE ile kopyaları siliyordu.
+   Bu betik kopyaları bir kez temizler ve benzersiz anahtarı ekler.
+   Tekrar çalıştırılabilir: anahtar zaten varsa hiçbir şey yapmaz.
+
+   Kullanım:  mysql -u root -p exam_scheduler < migrations/001_enrollments_unique.sql
+   ============================================================ */
+
+START TRANSACTION;
+
+/* Kopyalardan en küçük id'li olan kalır */
+DELETE e1
+FROM enrollments e1
+JOIN enrollments e2
+  ON e1.student_id = e2.student_id
+ AND e1.course_id  = e2.course_id
+ AND e1.id > e2.id;
+
+COMMIT;
+
+SET @has_key := (
+  SELECT COUNT(*)
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE()
+    AND table_name   = 'enrollments'
+    AND index_name   = 'uq_enrollment'
+);
+
+SET @ddl := IF(
+  @has_key = 0,
+  'ALTER TABLE enrollments ADD UNIQUE KEY uq_enrollment (student_id, course_id)',
+  'DO 0'
+);
+
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
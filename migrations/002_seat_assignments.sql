@@ -0,0 +1,37 @@
+/* ============================================================
+   002 — Kalıcı oturma planı (seat_assignments + seating_hashes)
+   ------------------------------------------------------------
+   Oturma planı yalnızca sayfa belleğinde tutuluyordu; sayfa her
+   açıldığında / PDF alınırken yeniden üretiliyordu. Plan artık
+   sınav başına bir kez yazılır. seating_hashes, planın üretildiği
+   girdilerin (öğrenci listesi + derslik düzenleri) özetini tutar;
+   özet değişmediyse plan yeniden üretilmez, tablodan okunur.
+   Tekrar çalıştırılabilir: tablolar zaten varsa hiçbir şey yapmaz.
+
+   Kullanım:  mysql -u root -p exam_scheduler < migrations/002_seat_assignments.sql
+   ============================================================ */
+
+CREATE TABLE IF NOT EXISTS seat_assignments (
+  id           INT AUTO_INCREMENT PRIMARY KEY,
+  exam_id      INT NOT NULL,
+  student_id   INT NOT NULL,
+  classroom_id INT NOT NULL,
+  row_no       SMALLINT UNSIGNED NOT NULL,
+  col_no       SMALLINT UNSIGNED NOT NULL,
+  seat_no      SMALLINT UNSIGNED NOT NULL,
+  /* exam_id ile başlayan anahtar: sınavın planı tek indeks aralığından, yerleşim sırasıyla (id) okunur */
+  UNIQUE KEY uq_sa_exam_student (exam_id, student_id),
+  UNIQUE KEY uq_sa_seat (exam_id, classroom_id, row_no, col_no, seat_no),
+  KEY idx_sa_classroom (classroom_id),
+  KEY idx_sa_student (student_id),
+  CONSTRAINT fk_sa_exam    FOREIGN KEY (exam_id)      REFERENCES exams(id)      ON DELETE CASCADE,
+  CONSTRAINT fk_sa_student FOREIGN KEY (student_id)   REFERENCES students(id)   ON DELETE CASCADE,
+  CONSTRAINT fk_sa_room    FOREIGN KEY (classroom_id) REFERENCES classrooms(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS seating_hashes (
+  exam_id      INT PRIMARY KEY,
+  content_hash CHAR(64) NOT NULL,
+  generated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT fk_sh_exam FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
+) ENGINE=InnoDB;